@@ -0,0 +1,182 @@
+"""Player analytics across full history, read from incrementally maintained aggregates.
+
+Every saved round adds one AggRound row (its KPIs) and folds the same numbers into
+that player's AggPlayerSeason row, inside the save transaction. Dashboards then read
+one season row, or the last N round rows, instead of scanning FactShots.
+"""
+from datetime import date
+import db
+from db import DB_PATH
+from kpis import (SHOT_FIELDS, iter_round_summaries, score_vs_par, shots_to_columns,
+                  summarize_round, summarize_rounds)
+from scoring import CATEGORIES
+
+# Category -> aggregate column
+SG_COLUMNS = {"Driving": "SGDriving", "Approach": "SGApproach",
+              "Short Game": "SGShortGame", "Putting": "SGPutting"}
+SUM_COLUMNS = ("Holes", "Strokes", "Par", "FairwaysHit", "FairwaysEligible", "GreensHit",
+               "SGTotal", *SG_COLUMNS.values())
+
+CREATE_AGG_ROUND = f"""
+CREATE TABLE IF NOT EXISTS AggRound (
+    RoundID INTEGER PRIMARY KEY,
+    PlayerID INTEGER NOT NULL,
+    RoundDate TEXT,
+    Season TEXT,
+    {", ".join(f"{col} {'REAL' if col.startswith('SG') else 'INTEGER'} DEFAULT 0" for col in SUM_COLUMNS)},
+    FOREIGN KEY (RoundID) REFERENCES DimRound(RoundID)
+)
+"""
+CREATE_AGG_SEASON = f"""
+CREATE TABLE IF NOT EXISTS AggPlayerSeason (
+    PlayerID INTEGER NOT NULL,
+    Season TEXT NOT NULL,
+    Rounds INTEGER DEFAULT 0,
+    {", ".join(f"{col} {'REAL' if col.startswith('SG') else 'INTEGER'} DEFAULT 0" for col in SUM_COLUMNS)},
+    PRIMARY KEY (PlayerID, Season)
+)
+"""
+
+INSERT_AGG_ROUND = f"""
+    INSERT OR REPLACE INTO AggRound (RoundID, PlayerID, RoundDate, Season, {", ".join(SUM_COLUMNS)})
+    VALUES ({", ".join("?" * (len(SUM_COLUMNS) + 4))})
+"""
+UPSERT_SEASON = f"""
+    INSERT INTO AggPlayerSeason (PlayerID, Season, Rounds, {", ".join(SUM_COLUMNS)})
+    VALUES ({", ".join("?" * (len(SUM_COLUMNS) + 3))})
+    ON CONFLICT (PlayerID, Season) DO UPDATE SET
+        Rounds = Rounds + excluded.Rounds,
+        {", ".join(f"{col} = {col} + excluded.{col}" for col in SUM_COLUMNS)}
+"""
+
+FILL_SEASONS = f"""
+    INSERT INTO AggPlayerSeason (PlayerID, Season, Rounds, {", ".join(SUM_COLUMNS)})
+    SELECT PlayerID, Season, COUNT(*), {", ".join(f"SUM({col})" for col in SUM_COLUMNS)}
+    FROM AggRound{{}} GROUP BY PlayerID, Season
+"""
+# Restricts a rebuild to the players loaded into temp.RebuildPlayers
+PLAYER_FILTER = " WHERE PlayerID IN (SELECT PlayerID FROM temp.RebuildPlayers)"
+
+
+def create_tables(conn):
+    conn.execute(CREATE_AGG_ROUND)
+    conn.execute(CREATE_AGG_SEASON)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_AggRound_PlayerID_RoundDate "
+                 "ON AggRound(PlayerID, RoundDate, RoundID)")
+
+
+def season_of(round_date):
+    return (round_date or str(date.today()))[:4]
+
+
+def _sums(kpis):
+    return (kpis["holes"], kpis["strokes"], kpis["par"], kpis["fairways_hit"],
+            kpis["fairways_eligible"], kpis["greens_hit"], kpis["sg_total"],
+            *(kpis["sg_by_category"][cat] for cat in SG_COLUMNS))
+
+
+# --- Maintenance (runs inside the caller's transaction) ---
+def record_round(conn, round_id, player_id, round_date, shots):
+    """Add one saved round to AggRound and its player's season totals."""
+    sums = _sums(summarize_round(shots))
+    season = season_of(round_date)
+    conn.execute(INSERT_AGG_ROUND, (round_id, player_id, round_date, season, *sums))
+    conn.execute(UPSERT_SEASON, (player_id, season, 1, *sums))
+
+
+def _player_filter(conn, player_ids):
+    if player_ids is None:
+        return ""
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS RebuildPlayers (PlayerID INTEGER PRIMARY KEY)")
+    conn.execute("DELETE FROM temp.RebuildPlayers")
+    conn.executemany("INSERT OR IGNORE INTO temp.RebuildPlayers VALUES (?)", ((int(p),) for p in player_ids))
+    return PLAYER_FILTER
+
+
+def rebuild(conn, player_ids=None):
+    """Recompute aggregates from FactShots/DimRound (backfill, repair, or after a rescore).
+
+    With `player_ids`, only those players' rows are replaced.
+    """
+    where = _player_filter(conn, player_ids)
+    rounds = {rid: (pid, rdate) for rid, pid, rdate in
+              conn.execute(f"SELECT RoundID, PlayerID, RoundDate FROM DimRound{where}")}
+    shots = conn.execute(f"SELECT {', '.join(SHOT_FIELDS)} FROM FactShots{where} "
+                         "ORDER BY RoundID, ShotID").fetchall()
+    _replace(conn, agg_round_rows(summarize_rounds(shots_to_columns(shots)), rounds), where)
+
+
+def agg_round_rows(summaries, rounds):
+    """AggRound rows for summarize_rounds output; `rounds` maps RoundID -> (PlayerID, RoundDate)."""
+    agg_rows = []
+    for round_id, kpis in iter_round_summaries(summaries):
+        if round_id not in rounds:
+            continue  # shots whose DimRound row is gone
+        player_id, round_date = rounds[round_id]
+        agg_rows.append((round_id, player_id, round_date, season_of(round_date), *_sums(kpis)))
+    return agg_rows
+
+
+def replace_all(conn, agg_rows):
+    """Replace both aggregate tables with `agg_rows`; season totals are summed from them."""
+    _replace(conn, agg_rows, "")
+
+
+def _replace(conn, agg_rows, where):
+    conn.execute(f"DELETE FROM AggRound{where}")
+    conn.execute(f"DELETE FROM AggPlayerSeason{where}")
+    conn.executemany(INSERT_AGG_ROUND, agg_rows)
+    conn.execute(FILL_SEASONS.format(where))
+
+
+# --- Reads ---
+def kpis_from_sums(rounds, sums):
+    holes, strokes, par, fir, fir_eligible, gir, sg_total, *sg_cats = sums
+    return {
+        "rounds": rounds,
+        "holes": holes,
+        "strokes": strokes,
+        "par": par,
+        "score_vs_par": score_vs_par(strokes, par),
+        "fairways_hit": fir,
+        "fairways_eligible": fir_eligible,
+        "fir_pct": fir / fir_eligible * 100 if fir_eligible else 0,
+        "greens_hit": gir,
+        "gir_pct": gir / holes * 100 if holes else 0,
+        "sg_total": sg_total,
+        "sg_per_round": sg_total / rounds if rounds else 0,
+        "sg_by_category": dict(zip(CATEGORIES, sg_cats)),
+    }
+
+
+def season_to_date(player_id, season=None, db_path=DB_PATH):
+    """KPIs over a player's season (default: this year) from one aggregate row."""
+    season = season or str(date.today().year)
+    with db.connection("analytics_season", db_path) as conn:
+        row = conn.execute(
+            f"SELECT Rounds, {', '.join(SUM_COLUMNS)} FROM AggPlayerSeason WHERE PlayerID=? AND Season=?",
+            (player_id, season),
+        ).fetchone()
+    return kpis_from_sums(row[0], row[1:]) if row else kpis_from_sums(0, (0,) * len(SUM_COLUMNS))
+
+
+def rolling(player_id, n=5, db_path=DB_PATH):
+    """KPIs over a player's last `n` rounds by date: an n-row index range read."""
+    with db.connection("analytics_rolling", db_path) as conn:
+        rows = conn.execute(
+            f"SELECT {', '.join(SUM_COLUMNS)} FROM AggRound WHERE PlayerID=? "
+            "ORDER BY RoundDate DESC, RoundID DESC LIMIT ?",
+            (player_id, n),
+        ).fetchall()
+    return kpis_from_sums(len(rows), [sum(col) for col in zip(*rows)] if rows else (0,) * len(SUM_COLUMNS))
+
+
+def round_history(player_id, limit=20, db_path=DB_PATH):
+    """Most recent rounds first, each with its own KPIs."""
+    with db.connection("analytics_history", db_path) as conn:
+        rows = conn.execute(
+            f"SELECT RoundID, RoundDate, {', '.join(SUM_COLUMNS)} FROM AggRound WHERE PlayerID=? "
+            "ORDER BY RoundDate DESC, RoundID DESC LIMIT ?",
+            (player_id, limit),
+        ).fetchall()
+    return [dict(kpis_from_sums(1, row[2:]), round_id=row[0], round_date=row[1]) for row in rows]
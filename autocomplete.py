@@ -0,0 +1,79 @@
+"""As-you-type suggestion dropdown for a Tk Entry, fed by a name_index search."""
+import tkinter as tk
+
+# --- Azure Dark Palette (consistent with login.py) ---
+TEXT_COLOR   = "#F3F2F1"
+ACCENT       = "#0078D4"
+FIELD_BG     = "#2A3448"
+FIELD_BORDER = "#2D3E55"
+
+NAV_KEYS = {"Up", "Down", "Return", "KP_Enter", "Escape", "Tab", "Shift_L", "Shift_R"}
+
+
+def attach(entry, search, on_pick=None, label=None, rows=6):
+    """Show search(entry text) results under `entry` while the user types.
+
+    `search(text)` returns (name, value) pairs; `label(name, value)` formats a row
+    (default: the name). Down moves into the list; Return or a click fills the
+    entry with the name and calls on_pick(name, value).
+    """
+    label = label or (lambda name, value: name)
+    listbox = tk.Listbox(entry.winfo_toplevel(), height=rows, font=("Segoe UI", 10),
+                         bg=FIELD_BG, fg=TEXT_COLOR, selectbackground=ACCENT,
+                         relief="flat", highlightthickness=1, highlightbackground=FIELD_BORDER,
+                         activestyle="none", exportselection=False)
+    matches = []
+
+    def hide(_event=None):
+        listbox.place_forget()
+
+    def refresh(event):
+        if event.keysym in NAV_KEYS:
+            return
+        matches[:] = search(entry.get())
+        if not matches:
+            hide()
+            return
+        listbox.delete(0, "end")
+        for name, value in matches:
+            listbox.insert("end", label(name, value))
+        listbox.configure(height=min(rows, len(matches)))
+        listbox.place(in_=entry, x=0, rely=1.0, relwidth=1.0)
+        listbox.lift()
+
+    def pick(_event=None):
+        selected = listbox.curselection()
+        if not selected:
+            return
+        name, value = matches[selected[0]]
+        entry.delete(0, "end")
+        entry.insert(0, name)
+        hide()
+        entry.focus_set()
+        entry.icursor("end")
+        if on_pick:
+            on_pick(name, value)
+        return "break"
+
+    def enter_list(_event):
+        if not listbox.winfo_ismapped():
+            return
+        listbox.focus_set()
+        listbox.selection_clear(0, "end")
+        listbox.selection_set(0)
+        listbox.activate(0)
+        return "break"
+
+    def focus_out(_event):
+        # a click on the list moves focus there first; only hide when focus left both
+        entry.after(150, lambda: entry.focus_get() not in (entry, listbox) and hide())
+
+    entry.bind("<KeyRelease>", refresh, add="+")
+    entry.bind("<Down>", enter_list, add="+")
+    entry.bind("<Escape>", hide, add="+")
+    entry.bind("<FocusOut>", focus_out, add="+")
+    listbox.bind("<Return>", pick)
+    listbox.bind("<ButtonRelease-1>", pick)
+    listbox.bind("<Escape>", lambda e: (hide(), entry.focus_set()))
+    listbox.bind("<FocusOut>", focus_out)
+    return listbox
@@ -0,0 +1,420 @@
+import argparse
+import csv
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import struct
+import threading
+import numpy as np
+import db
+import metrics
+import surfaces
+from db import DB_PATH
+
+# --- CONFIG ---
+CSV_PATH = "dimaverages.csv"
+
+# Surface names, aliases ("Bunker" -> "Sand") and entry units come from surfaces.SURFACES.
+# Putts are entered in feet. The Green rows are labelled "Yds" in both DimAvg and the CSV,
+# but they are the tour putting curve by feet (1.0 strokes at 1 ft), so they are read as feet too.
+YARDS_PER_FOOT = 1 / 3
+
+# Nothing is holed in fewer than one stroke, whatever the extrapolation says
+MIN_EXPECTED = 1.0
+
+# Curve position given to the "Hole" end surface in the vectorized path (expected strokes 0)
+HOLE_CODE = -2
+
+# Compiled baselines: baselines/<name>.sgb, one per expectation curve set (tour, scratch, ...)
+BASELINE_DIR = os.environ.get("SG_BASELINE_DIR", "baselines")
+DEFAULT_BASELINE = "tour"
+FILE_EXT = ".sgb"
+FILE_MAGIC = b"SGBL"
+FILE_FORMAT = 1
+# magic, format, header length; the JSON header follows, then the float64 curve data
+FILE_PREAMBLE = struct.Struct("<4sII")
+
+# One row per change applied to DimAvg (see baseline_sync.py); the newest is the live version
+CREATE_BASELINE_VERSION = """
+CREATE TABLE IF NOT EXISTS BaselineVersion (
+    Version TEXT NOT NULL,
+    Source TEXT,
+    SourceHash TEXT,
+    RowsInserted INTEGER DEFAULT 0,
+    RowsDeleted INTEGER DEFAULT 0,
+    AppliedDate DATETIME DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+def default_unit(surface):
+    return surfaces.unit(surface)
+
+
+def to_yards(distance, unit):
+    return distance * YARDS_PER_FOOT if unit == "Ft" else distance
+
+
+class Baseline:
+    """Tour-average expected strokes as a piecewise-linear curve per surface.
+
+    Each curve is resampled onto an evenly spaced yardage grid, so evaluating it is
+    index arithmetic rather than a search. Fractional distances interpolate between
+    grid points and distances off either end extrapolate along the end segment.
+    Surfaces are given by name, alias or surfaces code; rows for a surface the
+    registry does not know raise ValueError.
+    """
+
+    def __init__(self, rows):
+        grid = {}
+        for row in rows:
+            surface, distance, avg = row[:3]
+            unit = row[3] if len(row) > 3 else None
+            name = surfaces.canonical(surface)
+            if name is None or name == "Hole":
+                raise ValueError(f"Unknown baseline surface {surface!r} (see surfaces.SURFACES)")
+            surface = name
+            if unit != "Ft":
+                unit = default_unit(surface)
+            grid.setdefault(surface, {})[to_yards(float(distance), unit)] = float(avg)
+
+        # surface -> (first distance in yards, grid step in yards, expected strokes per step)
+        self.curves = {}
+        for surface, points in grid.items():
+            xs = np.array(sorted(points))
+            ys = np.array([points[x] for x in xs])
+            if len(xs) == 1:
+                xs, ys = np.append(xs, xs[0] + 1), np.append(ys, ys[0])
+            step = np.diff(xs).min()
+            uniform = np.arange(xs[0], xs[-1] + step / 2, step)
+            self.curves[surface] = (float(xs[0]), float(step), np.interp(uniform, xs, ys))
+        self.units = {surface: default_unit(surface) for surface in self.curves}
+        self._index_curves()
+
+        # Content hash of the grid, so stored SG can be tied to the baseline that produced it
+        digest = hashlib.sha1()
+        for surface in sorted(grid):
+            for x, y in sorted(grid[surface].items()):
+                digest.update(f"{surface},{x!r},{y!r};".encode())
+        self.version = digest.hexdigest()[:12]
+        self.name = None
+
+    def _index_curves(self, flat=None):
+        """Flattened copy of the curves for the vectorized path, addressed by surface code."""
+        names = list(self.curves)
+        position = {name: i for i, name in enumerate(names)}
+        # surface code -> curve position; -1 where there is no curve
+        self._by_code = np.full(max(surfaces.BY_CODE) + 1, -1, dtype=np.intp)
+        # any surface name, alias or code -> (curve, unit) for the scalar path
+        self._scalar = {}
+        for key, code in surfaces.CODES.items():
+            curve = surfaces.curve_name(key)
+            if curve in position:
+                self._by_code[code] = position[curve]
+                self._scalar[key] = (*self.curves[curve], self.units[curve])
+        self._by_code[surfaces.HOLE] = HOLE_CODE
+        self._x0 = np.array([self.curves[n][0] for n in names] or [0.0])
+        self._step = np.array([self.curves[n][1] for n in names] or [1.0])
+        self._size = np.array([len(self.curves[n][2]) for n in names] or [2])
+        self._offset = np.concatenate(([0], np.cumsum(self._size)[:-1]))
+        if flat is None:
+            flat = np.concatenate([self.curves[n][2] for n in names] or [np.zeros(2)])
+        self._flat = flat
+        self._feet = np.array([self.units[n] == "Ft" for n in names] or [False])
+
+    @metrics.timed("baseline_lookup")
+    def lookup(self, surface, distance, unit=None):
+        """Expected strokes for one ball position, or None if the surface has no curve."""
+        curve = self._scalar.get(surface)
+        if curve is None:
+            return 0.0 if surface == "Hole" or surface == surfaces.HOLE else None
+        x0, step, ys, curve_unit = curve
+        pos = (to_yards(distance, unit or curve_unit) - x0) / step
+        i = min(max(math.floor(pos), 0), len(ys) - 2)
+        val = ys[i] + (pos - i) * (ys[i + 1] - ys[i])
+        return max(float(val), MIN_EXPECTED)
+
+    @metrics.timed("baseline_expected_strokes")
+    def expected_strokes(self, surface_values, distances, units=None):
+        """Vectorized lookup over parallel arrays of surfaces and distances.
+
+        Surfaces may be names or surfaces codes; an integer code array is used as
+        is, with no per-shot dictionary probe. Units default to feet on the green
+        and yards elsewhere. Unknown surfaces and missing distances come back as
+        NaN; "Hole" is always 0.
+        """
+        codes = self._by_code[surfaces.encode(surface_values)]
+        distances = np.asarray(distances, dtype=float)
+        known = codes >= 0
+        c = np.where(known, codes, 0)
+
+        if units is None:
+            feet = self._feet[c]
+        else:
+            feet = np.asarray(units, dtype=object) == "Ft"
+        yards = np.where(feet, distances * YARDS_PER_FOOT, distances)
+
+        # All curves live end to end in one flat array; evaluate every shot in one pass
+        pos = (yards - self._x0[c]) / self._step[c]
+        i = np.clip(np.floor(np.nan_to_num(pos)), 0, self._size[c] - 2).astype(np.intp)
+        at = self._offset[c] + i
+        val = np.maximum(self._flat[at] + (pos - i) * (self._flat[at + 1] - self._flat[at]),
+                         MIN_EXPECTED)
+
+        out = np.where(known, val, np.nan)
+        out[codes == HOLE_CODE] = 0.0
+        return out
+
+    def strokes_gained(self, start_surfaces, start_distances, end_surfaces, end_distances,
+                       penalties=0):
+        """Vectorized SG: expected(start) - (1 + expected(end)) - penalty strokes."""
+        start = self.expected_strokes(start_surfaces, start_distances)
+        end = self.expected_strokes(end_surfaces, end_distances)
+        return start - (1 + end) - np.asarray(penalties, dtype=float)
+
+
+@metrics.timed("baseline_load_db")
+def load_from_db(db_path=DB_PATH):
+    """Read the whole DimAvg table in one query."""
+    with db.connection("baseline_load", db_path) as conn:
+        rows = conn.execute(
+            "SELECT Surface, Distance, TourAvg, Unit_of_Measurement FROM DimAvg"
+        ).fetchall()
+    return Baseline(rows)
+
+
+@metrics.timed("baseline_load_csv")
+def load_from_csv(csv_path=CSV_PATH):
+    """Read dimaverages.csv (Surface, Distance, SG Avg, Unit of Measurement)."""
+    # utf-8-sig strips the BOM from the header row
+    with open(csv_path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        rows = [(r["Surface"], r["Distance"], r["SG Avg"], r["Unit of Measurement"])
+                for r in reader]
+    return Baseline(rows)
+
+
+# --- Compiled baseline files ---
+def save_to_file(baseline, path, name=None):
+    """Write `baseline` as a compiled .sgb file: preamble, JSON header, float64 curves.
+
+    The header carries the baseline version, and per surface its unit, grid and
+    distance range, so a reader maps the curve data without parsing anything else.
+    """
+    entries = []
+    for surface, (x0, step, ys) in baseline.curves.items():
+        unit = baseline.units[surface]
+        per_unit = 1 / YARDS_PER_FOOT if unit == "Ft" else 1
+        entries.append({
+            "surface": surface, "unit": unit, "x0": x0, "step": step, "size": len(ys),
+            "min_distance": round(x0 * per_unit, 6),
+            "max_distance": round((x0 + step * (len(ys) - 1)) * per_unit, 6),
+        })
+    header = json.dumps({"name": name or baseline.name, "version": baseline.version,
+                         "surfaces": entries}).encode()
+    header += b" " * (-(FILE_PREAMBLE.size + len(header)) % 8)  # keep the curve data 8-byte aligned
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(FILE_PREAMBLE.pack(FILE_MAGIC, FILE_FORMAT, len(header)))
+        f.write(header)
+        for _, _, ys in baseline.curves.values():
+            f.write(np.ascontiguousarray(ys, dtype="<f8").tobytes())
+    os.replace(tmp, path)  # readers never map a half-written file
+
+
+def read_file_header(path):
+    """(header dict, byte offset of the curve data) for a compiled baseline file."""
+    with open(path, "rb") as f:
+        magic, fmt, header_len = FILE_PREAMBLE.unpack(f.read(FILE_PREAMBLE.size))
+        if magic != FILE_MAGIC:
+            raise ValueError(f"{path} is not a compiled baseline file")
+        if fmt != FILE_FORMAT:
+            raise ValueError(f"{path} is baseline format {fmt}, this build reads format {FILE_FORMAT}")
+        header = json.loads(f.read(header_len))
+    return header, FILE_PREAMBLE.size + header_len
+
+
+@metrics.timed("baseline_load_file")
+def load_from_file(path):
+    """Map a compiled baseline read-only. The curve data stays in the shared page cache."""
+    header, data_offset = read_file_header(path)
+    size = sum(s["size"] for s in header["surfaces"])
+    if os.path.getsize(path) != data_offset + size * 8:
+        raise ValueError(f"{path} is truncated or corrupt")
+    flat = np.memmap(path, dtype="<f8", mode="r", offset=data_offset, shape=(size,))
+
+    baseline = Baseline.__new__(Baseline)
+    baseline.curves, baseline.units = {}, {}
+    offset = 0
+    for s in header["surfaces"]:
+        baseline.curves[s["surface"]] = (s["x0"], s["step"], flat[offset:offset + s["size"]])
+        baseline.units[s["surface"]] = s["unit"]
+        offset += s["size"]
+    baseline._index_curves(flat)
+    baseline.version = header["version"]
+    baseline.name = header["name"]
+    return baseline
+
+
+def baseline_path(name, baseline_dir=None):
+    return os.path.join(baseline_dir or BASELINE_DIR, name + FILE_EXT)
+
+
+def load_baseline(source):
+    """Load a baseline from a .sgb or .csv file, or from the DimAvg table of a SQLite database."""
+    if source.lower().endswith(FILE_EXT):
+        return load_from_file(source)
+    if source.lower().endswith(".csv"):
+        return load_from_csv(source)
+    return load_from_db(source)
+
+
+# --- Shared instances, loaded once per process ---
+_baselines = {}
+_baseline_lock = threading.Lock()  # startup warm-up and the UI may both ask first
+
+
+def get_baseline(name=None):
+    """Return the process-wide baseline called `name` (default: the tour baseline).
+
+    Named baselines come from baselines/<name>.sgb. The tour baseline uses its
+    compiled file when there is one, else DimAvg, else the CSV.
+    """
+    name = name or DEFAULT_BASELINE
+    with _baseline_lock:
+        if name not in _baselines:
+            path = baseline_path(name)
+            if os.path.exists(path):
+                baseline = load_from_file(path)
+            elif name != DEFAULT_BASELINE:
+                raise ValueError(f"No compiled baseline {name!r} (expected {path})")
+            else:
+                baseline = None
+                try:
+                    baseline = load_from_db()
+                except sqlite3.Error:
+                    pass
+                if baseline is None or not baseline.curves:
+                    baseline = load_from_csv()
+                baseline.name = name
+            _baselines[name] = baseline
+        return _baselines[name]
+
+
+def invalidate(name=None):
+    """Forget the loaded baseline `name` (default: all), so the next get_baseline reloads it."""
+    with _baseline_lock:
+        if name is None:
+            _baselines.clear()
+        else:
+            _baselines.pop(name, None)
+
+
+def create_tables(conn):
+    conn.execute(CREATE_BASELINE_VERSION)
+
+
+def db_version(db_path=DB_PATH):
+    """The version last stamped on DimAvg, or None if it was never synced."""
+    with db.connection("baseline_version", db_path) as conn:
+        row = conn.execute("SELECT Version FROM BaselineVersion ORDER BY rowid DESC LIMIT 1").fetchone()
+    return row[0] if row else None
+
+
+def player_baseline_name(player_id, db_path=DB_PATH):
+    """The baseline a player is scored against (DimPlayer.Baseline, default tour)."""
+    with db.connection("baseline_player", db_path) as conn:
+        row = conn.execute("SELECT Baseline FROM DimPlayer WHERE PlayerID=?", (player_id,)).fetchone()
+    return (row and row[0]) or DEFAULT_BASELINE
+
+
+def get_player_baseline(player_id, db_path=DB_PATH):
+    return get_baseline(player_baseline_name(player_id, db_path))
+
+
+# --- Batch scoring: every player against their own baseline ---
+def player_baseline_names(db_path=DB_PATH):
+    """{PlayerID: baseline name} for every player not on the default baseline."""
+    with db.connection("baseline_player", db_path) as conn:
+        return dict(conn.execute("SELECT PlayerID, Baseline FROM DimPlayer "
+                                 "WHERE Baseline IS NOT NULL AND Baseline != ?", (DEFAULT_BASELINE,)))
+
+
+def load_named(names):
+    """({name: Baseline}, {name: error}) for baseline names; a missing file is reported, not raised."""
+    loaded, missing = {}, {}
+    for name in sorted(set(names)):
+        try:
+            loaded[name] = get_baseline(name)
+        except ValueError as e:
+            missing[name] = str(e)
+    return loaded, missing
+
+
+def player_baselines(db_path=DB_PATH):
+    """({PlayerID: Baseline}, {name: error}) for players not on the default baseline.
+
+    Players whose named baseline is missing are left out, so batch tools score
+    them against their default baseline and report the names.
+    """
+    names = player_baseline_names(db_path)
+    loaded, missing = load_named(names.values())
+    return {pid: loaded[name] for pid, name in names.items() if name in loaded}, missing
+
+
+def group_by_baseline(player_ids, default, overrides):
+    """Yield (baseline, row indexes) covering every row of `player_ids`, one pair per baseline in use.
+
+    `overrides` maps PlayerID -> Baseline; everyone else gets `default`.
+    """
+    player_ids = np.asarray(player_ids, dtype=np.int64)
+    rest = np.ones(len(player_ids), dtype=bool)
+    by_baseline = {}
+    for player_id, baseline in overrides.items():
+        by_baseline.setdefault(id(baseline), (baseline, []))[1].append(player_id)
+    for baseline, ids in by_baseline.values():
+        rows = np.isin(player_ids, ids)
+        if rows.any():
+            rest &= ~rows
+            yield baseline, np.flatnonzero(rows)
+    if rest.any():
+        yield default, np.flatnonzero(rest)
+
+
+def strokes_gained_by_player(default, overrides, player_ids, start_surfaces, start_distances,
+                             end_surfaces, end_distances, penalties):
+    """Baseline.strokes_gained over many players' shots, each against their own baseline."""
+    columns = [np.asarray(c) for c in (start_surfaces, start_distances, end_surfaces, end_distances,
+                                       penalties)]
+    sg = np.full(len(player_ids), np.nan)
+    for baseline, rows in group_by_baseline(player_ids, default, overrides):
+        sg[rows] = baseline.strokes_gained(*(c[rows] for c in columns))
+    return sg
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile a baseline into a memory-mapped .sgb file.")
+    parser.add_argument("source", help="baseline .csv, database (DimAvg) or .sgb to inspect")
+    parser.add_argument("--name", default=DEFAULT_BASELINE, help="baseline name, e.g. tour, scratch, 10hcp")
+    parser.add_argument("--out", help=f"output file (default: {BASELINE_DIR}/<name>{FILE_EXT})")
+    args = parser.parse_args()
+
+    if args.source.lower().endswith(FILE_EXT):
+        header, _ = read_file_header(args.source)
+    else:
+        out = args.out or baseline_path(args.name)
+        os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+        save_to_file(load_baseline(args.source), out, args.name)
+        header, _ = read_file_header(out)
+        print(f"✅ Wrote {out}")
+    print(f"{header['name']} (version {header['version']})")
+    for s in header["surfaces"]:
+        print(f"  {s['surface']:<10}{s['min_distance']:>8g}-{s['max_distance']:g} {s['unit']:<4}"
+              f"{s['size']:>6} points")
+
+
+if __name__ == "__main__":
+    main()
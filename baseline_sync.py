@@ -0,0 +1,119 @@
+"""Incremental sync of dimaverages.csv into the DimAvg table.
+
+Rows on both sides are reduced to canonical content (surface name from the
+surfaces registry, distance, average, unit) and diffed as multisets, so only the
+rows that actually differ are touched: stale or duplicate DimAvg rows are deleted
+by rowid and missing ones inserted, all in one transaction together with a
+BaselineVersion stamp. Afterwards the in-process baseline cache is dropped and a
+compiled tour baseline file, if there is one, is rebuilt:
+
+    python baseline_sync.py                      # dimaverages.csv -> shots_gained.db
+    python baseline_sync.py new_curves.csv --dry-run
+"""
+import argparse
+import csv
+import hashlib
+import os
+import time
+from collections import Counter
+import baseline
+import db
+import surfaces
+from db import DB_PATH
+from migrations import migrate
+
+
+def _row_key(surface, distance, avg, unit):
+    """Canonical content of one baseline row; equal keys mean identical rows."""
+    name = surfaces.canonical(surface)
+    if name is None or name == "Hole":
+        raise ValueError(f"Unknown baseline surface {surface!r} (see surfaces.SURFACES)")
+    return name, int(float(distance)), float(avg), unit or None
+
+
+def read_csv_rows(csv_path):
+    """(canonical rows, sha1 of the file bytes) for a dimaverages.csv-style file."""
+    with open(csv_path, "rb") as f:
+        source_hash = hashlib.sha1(f.read()).hexdigest()
+    with open(csv_path, newline="", encoding="utf-8-sig") as f:
+        rows = [_row_key(r["Surface"], r["Distance"], r["SG Avg"], r["Unit of Measurement"])
+                for r in csv.DictReader(f)]
+    return rows, source_hash
+
+
+def diff(conn, rows):
+    """(rowids to delete, rows to insert) that turn DimAvg into exactly `rows`."""
+    wanted = Counter(rows)
+    by_key = {}
+    for rowid, *row in conn.execute(
+            "SELECT rowid, Surface, Distance, TourAvg, Unit_of_Measurement FROM DimAvg"):
+        by_key.setdefault(_row_key(*row), []).append(rowid)
+
+    deletes = []
+    for key, rowids in by_key.items():
+        extra = len(rowids) - wanted.get(key, 0)
+        if extra > 0:
+            deletes.extend(rowids[:extra])
+    inserts = []
+    for key, n in wanted.items():
+        inserts.extend([key] * (n - len(by_key.get(key, ()))))
+    return deletes, inserts
+
+
+def sync(csv_path=baseline.CSV_PATH, db_path=DB_PATH, dry_run=False):
+    """Bring DimAvg in line with `csv_path`. Returns a stats dict.
+
+    The version stamped is the Baseline content hash of the synced rows, the same
+    one load_from_db() reports afterwards and rescore stores in its stats.
+    """
+    started = time.perf_counter()
+    rows, source_hash = read_csv_rows(csv_path)
+    version = baseline.Baseline(rows).version
+    with db.connection("baseline_sync", db_path) as conn:
+        with conn:
+            deletes, inserts = diff(conn, rows)
+            changed = bool(deletes or inserts)
+            if changed and not dry_run:
+                conn.executemany("DELETE FROM DimAvg WHERE rowid=?", [(r,) for r in deletes])
+                conn.executemany("INSERT INTO DimAvg (Surface, Distance, TourAvg, Unit_of_Measurement) "
+                                 "VALUES (?, ?, ?, ?)", inserts)
+                conn.execute("INSERT INTO BaselineVersion (Version, Source, SourceHash, RowsInserted, "
+                             "RowsDeleted) VALUES (?, ?, ?, ?, ?)",
+                             (version, os.path.basename(csv_path), source_hash, len(inserts), len(deletes)))
+    stats = {"version": version, "rows": len(rows), "inserted": len(inserts), "deleted": len(deletes),
+             "changed": changed, "compiled": None}
+
+    if changed and not dry_run:
+        baseline.invalidate()
+        path = baseline.baseline_path(baseline.DEFAULT_BASELINE)
+        if os.path.exists(path):
+            # get_baseline() prefers the compiled file, so it must not keep the old curves
+            baseline.save_to_file(baseline.load_from_db(db_path), path, baseline.DEFAULT_BASELINE)
+            stats["compiled"] = path
+    stats["seconds"] = time.perf_counter() - started
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply changes in a baseline CSV to DimAvg.")
+    parser.add_argument("csv", nargs="?", default=baseline.CSV_PATH, help="default: %(default)s")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--dry-run", action="store_true", help="report the diff, write nothing")
+    args = parser.parse_args()
+
+    migrate(args.db)
+    stats = sync(args.csv, args.db, args.dry_run)
+    if not stats["changed"]:
+        print(f"✅ DimAvg already matches {args.csv} (baseline {stats['version']})")
+        return
+    print(f"✅ {stats['inserted']:,} rows inserted, {stats['deleted']:,} deleted in "
+          f"{stats['seconds'] * 1000:.1f} ms; baseline version {stats['version']}"
+          + (" (dry run)" if args.dry_run else ""))
+    if stats["compiled"]:
+        print(f"↪ Recompiled {stats['compiled']}")
+    if not args.dry_run:
+        print("↪ Stored SG still reflects the old baseline; run rescore.py to update it")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Autocomplete lookups against a large roster and course list.
+
+Builds name_index.NameIndex instances of --players synthetic member names and
+--courses course names, then replays typing: every prefix of sampled names, one
+keystroke at a time, plus misspelled queries that fall through to trigrams
+("found" counts those whose intended name was suggested). Each keystroke must
+come back in under a millisecond:
+
+    python -m benchmarks.bench_autocomplete
+    python -m benchmarks.bench_autocomplete --players 100000 --json autocomplete.json
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from name_index import NameIndex
+
+FIRST = ["James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "William",
+         "Elizabeth", "David", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah",
+         "Charles", "Karen", "Daniel", "Nancy", "Matthew", "Lisa", "Anthony", "Betty", "Mark", "Sandra"]
+SYLLABLES = ["bab", "bit", "mor", "ton", "ley", "ash", "ford", "wick", "ham", "son", "ring", "dale",
+             "carr", "well", "ste", "van", "ber", "kin", "lock", "mere", "ott", "par", "quin", "rid"]
+COURSE_WORDS = ["Pines", "Oaks", "Links", "Dunes", "Creek", "Valley", "Ridge", "Harbor", "Meadows",
+                "Highlands", "Lakes", "Hills", "Springs", "Woods", "Bay", "Point"]
+COURSE_KINDS = ["Golf Club", "Country Club", "Golf Links", "GC", "Golf Course", "Resort"]
+SLOW_MS = 1.0
+
+
+def player_names(n, rng):
+    return [f"{rng.choice(FIRST)} {''.join(rng.sample(SYLLABLES, rng.randint(2, 3))).title()}"
+            for _ in range(n)]
+
+
+def course_names(n, rng):
+    return [f"{''.join(rng.sample(SYLLABLES, 2)).title()} {rng.choice(COURSE_WORDS)} "
+            f"{rng.choice(COURSE_KINDS)}" for _ in range(n)]
+
+
+def misspell(name, rng):
+    chars = list(name.lower())
+    i = rng.randrange(1, len(chars) - 1)
+    chars[i], chars[i + 1] = chars[i + 1], chars[i]
+    return "".join(chars)
+
+
+def percentile(values, pct):
+    return sorted(values)[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def time_queries(index, queries, expected=None):
+    """Microseconds per search, and how many searches suggested their expected name."""
+    times, found = [], 0
+    for n, q in enumerate(queries):
+        started = time.perf_counter()
+        results = index.search(q)
+        times.append((time.perf_counter() - started) * 1e6)
+        if expected:
+            found += any(name == expected[n] for name, _ in results)
+    return times, found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=50_000)
+    parser.add_argument("--courses", type=int, default=5_000)
+    parser.add_argument("--samples", type=int, default=500, help="names typed out per index")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    report = {}
+    ok = True
+    for label, names in (("players", player_names(args.players, rng)),
+                         ("courses", course_names(args.courses, rng))):
+        index = NameIndex()
+        started = time.perf_counter()
+        index.add_many((name, None, rng.randint(0, 20)) for name in names)
+        build = time.perf_counter() - started
+
+        sample = rng.sample(names, min(args.samples, len(names)))
+        typed, _ = time_queries(index, [name[:n] for name in sample for n in range(1, len(name) + 1)])
+        fuzzy, found = time_queries(index, [misspell(name, rng) for name in sample], sample)
+        for kind, times in (("typed", typed), ("fuzzy", fuzzy)):
+            p99 = percentile(times, 99)
+            ok = ok and p99 < SLOW_MS * 1000
+            report[f"{label}_{kind}"] = {"queries": len(times), "p50_us": round(statistics.median(times), 1),
+                                         "p99_us": round(p99, 1), "max_us": round(max(times), 1)}
+        report[f"{label}_fuzzy"]["found"] = found
+        report[f"{label}_build"] = {"names": len(index), "seconds": round(build, 2)}
+
+    for key, row in report.items():
+        print(f"  {key:<16}" + "  ".join(f"{k} {v:>9,}" for k, v in row.items()))
+    print(f"✅ p99 under {SLOW_MS:g} ms per keystroke" if ok else f"❌ p99 over {SLOW_MS:g} ms per keystroke")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Wrote {args.json}")
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Full and incremental Parquet export of a synthetic club database.
+
+Builds --shots synthetic shots, exports them all, saves a night's worth of new
+rounds (--new-shots) through round_store and runs the incremental export. The
+export is then read back as one dataset and must hold every FactShots row exactly
+once:
+
+    python -m benchmarks.bench_export
+    python -m benchmarks.bench_export --shots 2000000 --new-shots 5000 --json export.json
+"""
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import export
+from benchmarks.synthetic import build_database, generate_rounds
+from round_store import save_rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shots", type=int, default=500_000)
+    parser.add_argument("--new-shots", type=int, default=2_000, help="shots saved between the two exports")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args()
+    import pyarrow.dataset as ds
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path, out = os.path.join(tmp, "bench.db"), os.path.join(tmp, "export")
+        started = time.perf_counter()
+        build_database(db_path, args.shots, args.seed)
+        print(f"↪ Built {args.shots:,} shots in {time.perf_counter() - started:.1f}s")
+
+        full = export.export(out, db_path, full=True)
+        save_rounds(list(generate_rounds(args.new_shots, args.seed + 1)), db_path)
+        new = export.export(out, db_path)
+
+        table = ds.dataset(out, format="parquet", partitioning="hive").to_table(columns=["ShotID"])
+        ids = table.column("ShotID").to_pylist()
+        stored = sqlite3.connect(db_path).execute("SELECT COUNT(*) FROM FactShots").fetchone()[0]
+        size = sum(os.path.getsize(os.path.join(d, f)) for d, _, fs in os.walk(out) for f in fs)
+        report = {
+            "full_shots": full["shots"], "full_files": full["files"], "full_seconds": round(full["seconds"], 2),
+            "full_shots_per_sec": round(full["shots"] / full["seconds"]),
+            "new_shots": new["shots"], "new_files": new["files"], "new_seconds": round(new["seconds"], 3),
+            "exported_rows": len(ids), "stored_rows": stored, "bytes_per_shot": round(size / len(ids), 1),
+        }
+
+    for key, value in report.items():
+        print(f"  {key:<20}{value:>12,}")
+    ok = len(ids) == len(set(ids)) == stored
+    print("✅ Every shot exported once" if ok else "❌ Export does not match FactShots")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Wrote {args.json}")
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
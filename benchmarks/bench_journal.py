@@ -0,0 +1,76 @@
+"""Per-shot cost of the write-ahead shot journal, and replay time.
+
+Appends synthetic shots the way shot_entry does (add_shot, with a save_hole
+every few shots) and reports append latency percentiles. For comparison it
+also times the same appends with an fsync on every event:
+
+    python -m benchmarks.bench_journal
+    python -m benchmarks.bench_journal --shots 20000 --json journal.json
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from journal import ShotJournal, replay
+from shot import Shot
+
+ROUND_INFO = {"RoundID": None, "PlayerID": 1, "PlayerName": "Bench", "CoursePlayed": "Bench National",
+              "RoundDate": "2025-06-01", "HolesPlayed": "18", "TeePreference": "Tips"}
+
+
+def percentile(values, pct):
+    return sorted(values)[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def run(path, shots, fsync_every_event):
+    journal = ShotJournal(path)
+    journal.start_round(ROUND_INFO)
+    adds = []
+    for n in range(shots):
+        shot = Shot(PlayerID=1, Hole=n // 4 % 18 + 1, Par=4, Category="Approach", SurfaceStart="Fairway",
+                    DistanceStart=150.0, SurfaceEnd="Green", DistanceEnd=12.0, ClubUsed="8i",
+                    ShotShape="Draw", Penalty=0, StrokesGained=0.12)
+        started = time.perf_counter()
+        journal.add_shot(shot)
+        if fsync_every_event:
+            journal.sync()
+        adds.append(time.perf_counter() - started)
+        if n % 4 == 3:
+            journal.save_hole(n // 4 % 18 + 1, "Par")
+    journal.close()
+    return adds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shots", type=int, default=5000)
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'mode':<22}{'p50 (us)':>10}{'p99 (us)':>10}{'max (us)':>10}")
+        for mode, fsync_each in (("batched fsync", False), ("fsync every event", True)):
+            path = os.path.join(tmp, f"{mode.replace(' ', '_')}.jsonl")
+            adds = [s * 1e6 for s in run(path, args.shots, fsync_each)]
+            results[mode] = {"p50_us": round(statistics.median(adds), 1),
+                             "p99_us": round(percentile(adds, 99), 1), "max_us": round(max(adds), 1)}
+            print(f"{mode:<22}{results[mode]['p50_us']:>10.1f}{results[mode]['p99_us']:>10.1f}"
+                  f"{results[mode]['max_us']:>10.1f}")
+
+        started = time.perf_counter()
+        state = replay(path)
+        results["replay_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        print(f"\nReplay of {len(state['saved']) + len(state['current']):,} shots: "
+              f"{results['replay_ms']:.1f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"shots": args.shots, "results": results}, f, indent=2)
+        print(f"✅ Wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Before/after timings for the indexes and pragmas added by migrations.py.
+
+Builds a synthetic database with the repo schema, times the hot queries, runs
+the migrations and times them again:
+
+    python -m benchmarks.bench_schema --players 500 --rounds 40
+"""
+import argparse
+import csv
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+import migrations
+import tableload
+from baseline import CSV_PATH
+
+SURFACES = ["Tee", "Fairway", "Rough", "Sand", "Green"]
+CATEGORIES = ["Driving", "Approach", "Short Game", "Putting"]
+
+# name -> (sql, what the parameters are drawn from)
+QUERIES = {
+    "DimAvg lookup": ("SELECT TourAvg FROM DimAvg WHERE Surface=? AND Distance=?", "baseline"),
+    "Player history": ("""SELECT r.RoundID, r.RoundDate, COUNT(*), SUM(f.StrokesGained)
+                          FROM DimRound r JOIN FactShots f ON f.RoundID = r.RoundID
+                          WHERE r.PlayerID=? GROUP BY r.RoundID ORDER BY r.RoundDate DESC""", "player"),
+    "Shots by round": ("SELECT * FROM FactShots WHERE RoundID=? ORDER BY Hole", "round"),
+}
+
+
+def build_database(path, players, rounds_per_player, seed=7):
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    tableload.create_tables(conn)
+    with open(CSV_PATH, newline="", encoding="utf-8-sig") as f:
+        conn.executemany("INSERT INTO DimAvg VALUES (?, ?, ?, ?)",
+                         [(r["Surface"], int(r["Distance"]), float(r["SG Avg"]), r["Unit of Measurement"])
+                          for r in csv.DictReader(f)])
+    conn.executemany("INSERT INTO DimPlayer (PlayerName) VALUES (?)",
+                     [(f"Player {i}",) for i in range(players)])
+
+    # Rounds interleaved across players, the way they arrive in a shared database
+    round_id = 0
+    shots = []
+    rounds = []
+    for n in range(rounds_per_player):
+        for player_id in range(1, players + 1):
+            round_id += 1
+            rounds.append((round_id, player_id, f"Course {rng.randint(1, 50)}",
+                           f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}", 18, "Tips"))
+            for hole in range(1, 19):
+                for _ in range(rng.randint(3, 5)):
+                    shots.append((player_id, round_id, hole, 4, "Par", rng.choice(CATEGORIES),
+                                  rng.choice(SURFACES), rng.uniform(1, 450), rng.choice(SURFACES),
+                                  rng.uniform(1, 200), "", "", 0, rng.uniform(-1, 1)))
+    conn.executemany("INSERT INTO DimRound (RoundID, PlayerID, CoursePlayed, RoundDate, HolesPlayed, "
+                     "TeePreference) VALUES (?, ?, ?, ?, ?, ?)", rounds)
+    conn.executemany("""INSERT INTO FactShots
+        (PlayerID, RoundID, Hole, Par, HoleResult, Category, SurfaceStart, DistanceStart,
+         SurfaceEnd, DistanceEnd, ClubUsed, ShotShape, Penalty, StrokesGained)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", shots)
+    conn.commit()
+    conn.close()
+    return round_id, len(shots)
+
+
+def time_queries(path, players, rounds, samples, seed=11):
+    conn = sqlite3.connect(path)
+    results = {}
+    for name, (sql, kind) in QUERIES.items():
+        rng = random.Random(seed)
+        if kind == "baseline":
+            params = [(rng.choice(SURFACES), rng.randint(20, 100)) for _ in range(samples)]
+        else:
+            upper = players if kind == "player" else rounds
+            params = [(rng.randint(1, upper),) for _ in range(samples)]
+        started = time.perf_counter()
+        for p in params:
+            conn.execute(sql, p).fetchall()
+        results[name] = (time.perf_counter() - started) / samples * 1e6
+    conn.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=20, help="rounds per player")
+    parser.add_argument("--samples", type=int, default=200, help="queries timed per kind")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        rounds, shots = build_database(path, args.players, args.rounds)
+        print(f"Synthetic database: {args.players:,} players, {rounds:,} rounds, {shots:,} shots")
+
+        before = time_queries(path, args.players, rounds, args.samples)
+        started = time.perf_counter()
+        version = migrations.migrate(path)
+        print(f"Migrated to schema version {version} in {time.perf_counter() - started:.2f}s")
+        after = time_queries(path, args.players, rounds, args.samples)
+
+    print(f"{'query':<16}{'before (us)':>14}{'after (us)':>14}{'speedup':>10}")
+    for name in QUERIES:
+        print(f"{name:<16}{before[name]:>14,.1f}{after[name]:>14,.1f}{before[name] / after[name]:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Scaling of the end-of-season pipeline with worker processes.
+
+Builds a synthetic club database and runs season_pipeline.run_season as a dry run
+at 1, 2, 4, ... workers (up to the core count), reporting speedup over 1 worker:
+
+    python -m benchmarks.bench_season --players 400 --rounds 25
+    python -m benchmarks.bench_season --reports --json season.json
+"""
+import argparse
+import json
+import os
+import tempfile
+
+import migrations
+from baseline import CSV_PATH
+from benchmarks.bench_schema import build_database
+from season_pipeline import run_season
+
+
+def worker_counts(max_workers):
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=400)
+    parser.add_argument("--rounds", type=int, default=25, help="rounds per player")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--reports", action="store_true", help="also render every player's PNG report")
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        rounds, shots = build_database(path, args.players, args.rounds)
+        migrations.migrate(path)
+        print(f"{args.players:,} players, {rounds:,} rounds, {shots:,} shots, "
+              f"{os.cpu_count()} cores\n")
+
+        results = {}
+        print(f"{'workers':>8}{'seconds':>10}{'shots/s':>12}{'speedup':>9}{'efficiency':>12}")
+        for workers in worker_counts(args.max_workers):
+            report_dir = os.path.join(tmp, f"reports_{workers}") if args.reports else None
+            stats, _ = run_season(path, CSV_PATH, workers=workers, report_dir=report_dir, dry_run=True)
+            base = results[1]["seconds"] if results else stats["seconds"]
+            speedup = base / stats["seconds"]
+            results[workers] = {"seconds": round(stats["seconds"], 3),
+                                "shots_per_sec": round(stats["shots_per_sec"]),
+                                "speedup": round(speedup, 2)}
+            print(f"{workers:>8}{stats['seconds']:>10.2f}{stats['shots_per_sec']:>12,.0f}"
+                  f"{speedup:>8.2f}x{speedup / workers:>11.0%}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"players": args.players, "rounds": rounds, "shots": shots,
+                       "cores": os.cpu_count(), "results": results}, f, indent=2)
+        print(f"✅ Wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Memory per shot for the three in-memory shot representations.
+
+Builds the same N synthetic shots as plain dicts (the old add_shot record), as
+Shot objects and as one ShotTable, and reports tracemalloc's bytes per shot:
+
+    python -m benchmarks.bench_shot_memory
+    python -m benchmarks.bench_shot_memory --shots 1000000 --json memory.json
+"""
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+from scoring import CATEGORIES, END_SURFACES, START_SURFACES
+from shot import FIELDS, Shot, ShotTable
+
+CLUBS = ["Driver", "3W", "5i", "7i", "9i", "PW", "SW", "Putter"]
+
+
+def synthetic_values(n, seed=7):
+    rng = random.Random(seed)
+    for i in range(n):
+        yield (1, i // 60 + 1, i % 18 + 1, rng.choice((3, 4, 5)), rng.choice(CATEGORIES),
+               rng.choice(START_SURFACES), rng.uniform(1, 450), rng.choice(END_SURFACES),
+               rng.uniform(1, 200), rng.choice(CLUBS), "", rng.random() < 0.03,
+               rng.uniform(-1, 1), "Par")
+
+
+def measure(build, n):
+    """(bytes per shot, build seconds) for the structure `build` makes from n shots."""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    held = build(synthetic_values(n))
+    seconds = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return current / n, seconds
+
+
+BUILDERS = {
+    "dict": lambda values: [dict(zip(FIELDS, v)) for v in values],
+    "Shot": lambda values: [Shot(*v) for v in values],
+    "ShotTable": lambda values: ShotTable(Shot(*v) for v in values),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shots", type=int, default=200_000)
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'representation':<16}{'bytes/shot':>12}{'build (s)':>12}")
+    for name, build in BUILDERS.items():
+        per_shot, seconds = measure(build, args.shots)
+        results[name] = {"bytes_per_shot": round(per_shot, 1), "build_seconds": round(seconds, 3)}
+        print(f"{name:<16}{per_shot:>12.1f}{seconds:>12.2f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"shots": args.shots, "results": results}, f, indent=2)
+        print(f"✅ Wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Cold-import cost of each app module, measured with `python -X importtime`.
+
+Every module is imported in a fresh interpreter so nothing is shared between
+measurements. Heavy libraries that should stay lazy are flagged if an import
+drags them in:
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --json startup.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What the login screen needs first, then each later screen
+MODULES = ["main", "login", "round_setup", "shot_entry", "round_summary", "baseline", "ingest"]
+
+# Must only be imported when first used (the summary chart), never at startup
+LAZY = ["matplotlib"]
+
+
+def measure(module, runs):
+    """Best-of-`runs` cumulative import time in ms, plus the lazy packages it pulled in."""
+    best = None
+    pulled = set()
+    for _ in range(runs):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                              cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+        total = 0
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+            if not cumulative.isdigit():
+                continue  # header row
+            if name == module:
+                total = int(cumulative)
+            pulled.update(lazy for lazy in LAZY if name == lazy)
+        best = total if best is None else min(best, total)
+    return best / 1000, sorted(pulled)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per module")
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'module':<16}{'import (ms)':>12}  eager heavy imports")
+    for module in MODULES:
+        ms, pulled = measure(module, args.runs)
+        results[module] = {"import_ms": round(ms, 2), "eager": pulled}
+        print(f"{module:<16}{ms:>12.1f}  {', '.join(pulled) or '-'}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if any(r["eager"] for r in results.values()):
+        sys.exit("❌ A lazy dependency is imported at startup.")
+
+
+if __name__ == "__main__":
+    main()
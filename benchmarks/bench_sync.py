@@ -0,0 +1,118 @@
+"""Many devices uploading to one sync server over localhost.
+
+Starts the server on a free port with a fresh central database, then fires
+--uploads concurrent POSTs of synthetic rounds from a thread pool. Every batch
+is sent twice, as if two laptops had the same rounds, so half the rounds must
+come back as duplicates:
+
+    python -m benchmarks.bench_sync
+    python -m benchmarks.bench_sync --uploads 500 --rounds-per-upload 4 --json sync.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from baseline import CSV_PATH, load_baseline
+from benchmarks.synthetic import generate_rounds
+from migrations import migrate
+from sync_server import SyncServer, post_rounds
+
+
+def percentile(values, pct):
+    return sorted(values)[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def start_server(db_path, baseline):
+    """Run a SyncServer on its own event-loop thread; returns (server, url)."""
+    server = SyncServer(db_path, baseline)
+    ready = threading.Event()
+    port = []
+
+    def run():
+        asyncio.run(server.serve("127.0.0.1", 0, ready=lambda p: (port.append(p), ready.set())))
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    return server, f"http://127.0.0.1:{port[0]}"
+
+
+def add_roster(db_path, player_ids):
+    """The server only stores rounds for players it knows."""
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.executemany("INSERT INTO DimPlayer (PlayerID, PlayerName) VALUES (?, ?)",
+                         [(i, f"Synthetic Player {i}") for i in sorted(player_ids)])
+    conn.close()
+
+
+def batches(uploads, per_upload, seed):
+    """uploads // 2 distinct batches of round records, each listed twice."""
+    needed = uploads // 2 * per_upload
+    records = []
+    for info, shots in generate_rounds(needed * 100, seed):  # ~75 shots a round, so enough rounds
+        records.append({"PlayerID": info["PlayerID"], "CoursePlayed": info["CoursePlayed"],
+                        "RoundDate": info["RoundDate"], "TeePreference": "Tips",
+                        "Shots": [s.to_dict() for s in shots]})
+    distinct = [records[i:i + per_upload] for i in range(0, needed, per_upload)]
+    return [b for b in distinct for _ in range(2)], sum(len(b) for b in distinct)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--uploads", type=int, default=200)
+    parser.add_argument("--rounds-per-upload", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=200, help="uploads in flight at once")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "central.db")
+        migrate(db_path)
+        baseline = load_baseline(CSV_PATH)
+        uploads, distinct = batches(args.uploads, args.rounds_per_upload, args.seed)
+        add_roster(db_path, {r["PlayerID"] for batch in uploads for r in batch})
+        server, url = start_server(db_path, baseline)
+
+        def send(batch):
+            started = time.perf_counter()
+            results = post_rounds(url, batch)
+            return time.perf_counter() - started, results
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(args.concurrency) as pool:
+            outcomes = list(pool.map(send, uploads))
+        elapsed = time.perf_counter() - started
+
+        latencies = [t * 1000 for t, _ in outcomes]
+        results = [r for _, rs in outcomes for r in rs]
+        stored = sqlite3.connect(db_path).execute("SELECT COUNT(*) FROM DimRound").fetchone()[0]
+        report = {
+            "uploads": len(uploads), "rounds": len(results), "distinct_rounds": distinct,
+            "stored_rounds": stored, "created": sum(r.get("created", False) for r in results),
+            "errors": sum("error" in r for r in results), "transactions": server.stats["transactions"],
+            "uploads_per_sec": round(len(uploads) / elapsed, 1),
+            "rounds_per_sec": round(len(results) / elapsed, 1),
+            "p50_ms": round(statistics.median(latencies), 1), "p99_ms": round(percentile(latencies, 99), 1),
+        }
+
+    for key, value in report.items():
+        print(f"  {key:<18}{value:>12,}")
+    ok = report["stored_rounds"] == report["created"] == distinct and not report["errors"]
+    print("✅ Every distinct round stored once" if ok else "❌ Stored rounds do not match the uploads")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Wrote {args.json}")
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
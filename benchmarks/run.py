@@ -0,0 +1,256 @@
+"""Benchmark suite for the strokes-gained hot paths at 1k, 100k and 10M shots.
+
+For each size a synthetic club database is built (see benchmarks/synthetic.py)
+and these are measured:
+
+    baseline lookup    scalar Baseline.lookup and vectorized expected_strokes
+    SG per shot        the shot-entry path, and a dry-run rescore of every shot
+    round save         save_round one at a time (UI) and save_rounds in one batch
+    summary KPIs       summarize_round per round, summarize_rounds over all shots
+    analytics          season_to_date, rolling and round_history per player
+
+Results are written as JSON so runs can be compared over time:
+
+    python -m benchmarks.run --sizes 1k,100k --json results.json
+    python -m benchmarks.run --json new.json --compare results.json
+    python -m benchmarks.run --sizes 10M --keep /var/tmp/sg-bench   # reuse built DBs
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+
+import analytics
+import db
+from baseline import CSV_PATH, load_baseline
+from benchmarks.synthetic import build_database, generate_rounds
+from kpis import SHOT_FIELDS, shots_to_columns, summarize_round, summarize_rounds
+from rescore import rescore_all
+from round_store import save_round, save_rounds
+
+# --- CONFIG ---
+SIZES = {"1k": 1_000, "100k": 100_000, "10M": 10_000_000}
+SEED = 7
+SAMPLE = 100_000  # positions for lookup timings
+SAVE_ROUNDS = 200  # rounds saved in the batch-save timing
+UI_SAVES = 20  # rounds saved one by one
+KPI_SHOTS = 1_000_000  # cap for the vectorized KPI timing (memory, not time)
+QUERY_SAMPLES = 200
+REPEAT = 3  # each metric keeps its best run
+REGRESSION = 0.15  # --compare flags changes worse than this (run-to-run noise is ~10%)
+
+# metric -> (unit, "lower"/"higher" is better)
+METRICS = {
+    "lookup_scalar_ns": ("ns/call", "lower"),
+    "lookup_vector_ns": ("ns/position", "lower"),
+    "sg_entry_us": ("us/shot", "lower"),
+    "rescore_shots_per_sec": ("shots/s", "higher"),
+    "save_ui_ms": ("ms/round", "lower"),
+    "save_batch_rounds_per_sec": ("rounds/s", "higher"),
+    "kpi_round_us": ("us/round", "lower"),
+    "kpi_vector_shots_per_sec": ("shots/s", "higher"),
+    "season_to_date_ms": ("ms p50", "lower"),
+    "rolling_ms": ("ms p50", "lower"),
+    "round_history_ms": ("ms p50", "lower"),
+}
+
+
+def parse_size(text):
+    return SIZES.get(text) or int(float(text.lower().replace("k", "e3").replace("m", "e6")))
+
+
+def _fill(rows):
+    """Repeat a small sample up to SAMPLE rows, so tiny databases still time enough calls."""
+    return (rows * (SAMPLE // max(len(rows), 1) + 1))[:SAMPLE]
+
+
+def _median_ms(fn, args_list):
+    times = []
+    for args in args_list:
+        started = time.perf_counter()
+        fn(*args)
+        times.append((time.perf_counter() - started) * 1000)
+    return float(np.median(times))
+
+
+# --- Measurements ---
+def bench_lookups(conn, baseline, results):
+    positions = _fill(conn.execute("SELECT SurfaceStart, DistanceStart FROM FactShots "
+                                   "ORDER BY random() LIMIT ?", (SAMPLE,)).fetchall())
+    surfaces, distances = zip(*positions)
+    lookup = baseline.lookup
+    started = time.perf_counter()
+    for surface, distance in positions:
+        lookup(surface, distance)
+    results["lookup_scalar_ns"] = (time.perf_counter() - started) / len(positions) * 1e9
+    started = time.perf_counter()
+    baseline.expected_strokes(surfaces, distances)
+    results["lookup_vector_ns"] = (time.perf_counter() - started) / len(positions) * 1e9
+
+
+def bench_sg(path, conn, baseline, results):
+    shots = _fill(conn.execute("SELECT SurfaceStart, DistanceStart, SurfaceEnd, DistanceEnd, Penalty "
+                               "FROM FactShots LIMIT ?", (SAMPLE,)).fetchall())
+    lookup = baseline.lookup
+    started = time.perf_counter()
+    for start, start_d, end, end_d, penalty in shots:  # what shot entry does per shot
+        end_val = 0 if end == "Hole" else lookup(end, end_d)
+        lookup(start, start_d) - (1 + end_val) - penalty
+    results["sg_entry_us"] = (time.perf_counter() - started) / len(shots) * 1e6
+    results["rescore_shots_per_sec"] = rescore_all(path, baseline, dry_run=True)["shots_per_sec"]
+
+
+def bench_saves(path, conn, baseline, results, seed):
+    fresh = list(generate_rounds(SAVE_ROUNDS * 80, seed + 1, baseline))
+    ui_rounds, batch_rounds = fresh[:UI_SAVES], fresh[UI_SAVES:]
+    before = conn.execute("SELECT COALESCE(MAX(RoundID), 0) FROM DimRound").fetchone()[0]
+
+    results["save_ui_ms"] = _median_ms(lambda info, shots: save_round(info, shots, path), ui_rounds)
+    started = time.perf_counter()
+    save_rounds(batch_rounds, path)
+    results["save_batch_rounds_per_sec"] = len(batch_rounds) / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for _, shots in fresh:
+        summarize_round(shots)
+    results["kpi_round_us"] = (time.perf_counter() - started) / len(fresh) * 1e6
+
+    # Put the database back, so later timings (and --keep reruns) see the same data
+    db.close_all()
+    with conn:
+        for table in ("FactShots", "AggRound", "DimRound"):
+            conn.execute(f"DELETE FROM {table} WHERE RoundID > ?", (before,))
+        conn.execute("DELETE FROM AggPlayerSeason")
+        conn.execute(analytics.FILL_SEASONS.format(""))
+
+
+def bench_kpis(conn, results):
+    rows = conn.execute(f"SELECT {', '.join(SHOT_FIELDS)} FROM FactShots "
+                        "ORDER BY RoundID, ShotID LIMIT ?", (KPI_SHOTS,)).fetchall()
+    columns = shots_to_columns(rows)
+    started = time.perf_counter()
+    summarize_rounds(columns)
+    results["kpi_vector_shots_per_sec"] = len(rows) / (time.perf_counter() - started)
+
+
+def bench_analytics(path, players, results, seed):
+    rng = random.Random(seed)
+    sample = [(rng.randint(1, players),) for _ in range(QUERY_SAMPLES)]
+    results["season_to_date_ms"] = _median_ms(
+        lambda pid: analytics.season_to_date(pid, "2025", path), sample)
+    results["rolling_ms"] = _median_ms(lambda pid: analytics.rolling(pid, 5, path), sample)
+    results["round_history_ms"] = _median_ms(lambda pid: analytics.round_history(pid, 20, path), sample)
+
+
+def run_size(label, shots, workdir, seed, repeat=REPEAT):
+    path = os.path.join(workdir, f"synthetic_{label}_{seed}.db")
+    started = time.perf_counter()
+    if os.path.exists(path):
+        conn = sqlite3.connect(path)
+        players = conn.execute("SELECT COUNT(*) FROM DimPlayer").fetchone()[0]
+        rounds, shots = conn.execute("SELECT COUNT(DISTINCT RoundID), COUNT(*) FROM FactShots").fetchone()
+        conn.close()
+        built = None
+    else:
+        players, rounds, shots = build_database(path, shots, seed)
+        built = time.perf_counter() - started
+
+    baseline = load_baseline(CSV_PATH)
+    metrics = {}
+    conn = sqlite3.connect(path)
+    try:
+        for _ in range(repeat):
+            run = {}
+            bench_lookups(conn, baseline, run)
+            bench_sg(path, conn, baseline, run)
+            bench_saves(path, conn, baseline, run, seed)
+            bench_kpis(conn, run)
+            bench_analytics(path, players, run, seed)
+            for name, value in run.items():
+                best = min if METRICS[name][1] == "lower" else max
+                metrics[name] = best(metrics.get(name, value), value)
+    finally:
+        conn.close()
+        db.close_all()
+    return {"players": players, "rounds": rounds, "shots": shots, "build_seconds": built,
+            "metrics": {k: round(v, 3) for k, v in metrics.items()}}
+
+
+# --- Reporting ---
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"commit": commit, "python": platform.python_version(), "numpy": np.__version__,
+            "sqlite": sqlite3.sqlite_version, "platform": platform.platform(),
+            "cpus": os.cpu_count(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def print_size(label, result, previous=None, threshold=REGRESSION):
+    print(f"\n{label}: {result['players']:,} players, {result['rounds']:,} rounds, "
+          f"{result['shots']:,} shots"
+          + (f" (built in {result['build_seconds']:.1f}s)" if result["build_seconds"] else ""))
+    regressions = []
+    for name, value in result["metrics"].items():
+        unit, better = METRICS[name]
+        line = f"  {name:<28}{value:>14,.2f} {unit:<12}"
+        old = (previous or {}).get("metrics", {}).get(name)
+        if old:
+            change = (value - old) / old
+            worse = change > threshold if better == "lower" else change < -threshold
+            line += f"{change:>+8.0%}" + ("  ❌ regression" if worse else "")
+            if worse:
+                regressions.append(name)
+        print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(SIZES), help="comma-separated, e.g. 1k,100k,10M")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="runs per size; the best is kept")
+    parser.add_argument("--keep", help="directory to build databases in and reuse on later runs")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="earlier results JSON to flag regressions against")
+    parser.add_argument("--threshold", type=float, default=REGRESSION,
+                        help="relative change that counts as a regression (default %(default)s)")
+    args = parser.parse_args()
+
+    previous = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)["sizes"]
+
+    report = {"environment": environment(), "seed": args.seed, "repeat": args.repeat, "sizes": {}}
+    regressions = []
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = args.keep or tmp
+        os.makedirs(workdir, exist_ok=True)
+        for label in args.sizes.split(","):
+            label = label.strip()
+            result = run_size(label, parse_size(label), workdir, args.seed, args.repeat)
+            report["sizes"][label] = result
+            worse = print_size(label, result, previous.get(label), args.threshold)
+            regressions += [f"{label} {name}" for name in worse]
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Wrote {args.json}")
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
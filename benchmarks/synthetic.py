@@ -0,0 +1,167 @@
+"""Synthetic players, rounds and shots on the real DimAvg surface and distance grid.
+
+Holes are played out shot by shot: tee shots on the par 4s and 5s, approaches,
+short game and putts, with each ball position drawn inside the distance range
+that the baseline covers for its surface. Everything comes from one seed, so a
+given (size, seed) always produces the same rounds:
+
+    from benchmarks.synthetic import build_database, generate_rounds
+"""
+import csv
+import random
+import sqlite3
+
+import analytics
+import migrations
+from baseline import CSV_PATH, load_baseline
+from kpis import shots_to_columns, summarize_rounds
+from round_store import INSERT_ROUND, INSERT_SHOT, SHOT_COLUMNS, insert_row, round_hash
+from scoring import assign_hole_results, score_shots
+from shot import Shot
+
+# --- CONFIG ---
+SHOTS_PER_PLAYER = 5000  # sizes scale the club, not one player's history
+BATCH_ROUNDS = 1000  # rounds per insert transaction while building
+HOLE_YARDS = {3: (120, 230), 4: (330, 470), 5: (480, 600)}
+COURSES = [f"Synthetic Links {i}" for i in range(1, 41)]
+CLUBS = {"Driving": ["Driver", "3W"], "Approach": ["4i", "6i", "7i", "8i", "9i", "PW"],
+         "Short Game": ["GW", "SW", "LW"], "Putting": ["Putter"]}
+
+
+def surface_ranges(baseline):
+    """surface -> (min, max) distance in the surface's own unit, from the baseline grid."""
+    ranges = {}
+    for surface, (x0, step, ys) in baseline.curves.items():
+        per_unit = 3 if baseline.units[surface] == "Ft" else 1
+        ranges[surface] = (x0 * per_unit, (x0 + step * (len(ys) - 1)) * per_unit)
+    return ranges
+
+
+def _clamp(value, surface, ranges):
+    lo, hi = ranges[surface]
+    return round(min(max(value, lo), hi), 1)
+
+
+def play_hole(rng, par, ranges):
+    """One hole as [(Category, SurfaceStart, DistanceStart, SurfaceEnd, DistanceEnd, Penalty)]."""
+    shots = []
+    surface, distance = "Tee", float(rng.randint(*HOLE_YARDS[par]))
+    distance = _clamp(distance, "Tee", ranges)
+    while surface != "Hole" and len(shots) < 10:
+        penalty = 0
+        if surface == "Green":
+            category = "Putting"
+            holed = rng.random() < max(0.04, 1 - distance / 25)
+            end, end_d = ("Hole", None) if holed else ("Green", max(1.0, distance * rng.uniform(0.05, 0.3)))
+        elif surface == "Tee" and par >= 4:
+            category = "Driving"
+            end = rng.choices(["Fairway", "Rough", "Sand", "Recovery"], [60, 30, 6, 4])[0]
+            penalty = int(rng.random() < 0.03)
+            end_d = distance - rng.uniform(220, 300)
+            if end_d < 20:
+                end, end_d = "Green", rng.uniform(10, 60)
+        elif distance <= 50:
+            category = "Short Game"
+            end, end_d = ("Hole", None) if rng.random() < 0.05 else ("Green", rng.uniform(2, 25))
+        else:
+            category = "Approach"
+            if rng.random() < 0.55 - distance / 1000:
+                end, end_d = "Green", rng.uniform(4, 70)
+            else:
+                end = rng.choices(["Fairway", "Rough", "Sand"], [25, 55, 20])[0]
+                end_d = max(2.0, distance * rng.uniform(0.05, 0.45))
+        if end_d is not None:
+            end_d = _clamp(end_d, end, ranges)
+        shots.append((category, surface, distance, end, end_d, penalty))
+        surface, distance = end, end_d
+    if surface != "Hole":  # ten-shot cap: the last putt drops
+        category, start, start_d, _, _, penalty = shots[-1]
+        shots[-1] = (category, start, start_d, "Hole", None, penalty)
+    return shots
+
+
+def generate_rounds(total_shots, seed=7, baseline=None):
+    """Yield (round_info, [Shot, ...]) until about `total_shots` shots have been produced.
+
+    Shots are scored against `baseline` (default: the CSV) and carry HoleResult,
+    exactly as shot entry or ingest would leave them.
+    """
+    baseline = baseline or load_baseline(CSV_PATH)
+    ranges = surface_ranges(baseline)
+    rng = random.Random(seed)
+    players = max(1, total_shots // SHOTS_PER_PLAYER)
+    produced = 0
+    n = 0
+    while produced < total_shots:
+        n += 1
+        player_id = (n - 1) % players + 1
+        round_info = {
+            "RoundID": None, "PlayerID": player_id, "CoursePlayed": rng.choice(COURSES),
+            "RoundDate": f"{rng.choice((2024, 2025))}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "HolesPlayed": 18, "TeePreference": "Tips",
+        }
+        shots = []
+        for hole in range(1, 19):
+            par = rng.choice((3, 4, 4, 4, 5))
+            for category, start, start_d, end, end_d, penalty in play_hole(rng, par, ranges):
+                shots.append(Shot(PlayerID=player_id, Hole=hole, Par=par, Category=category,
+                                  SurfaceStart=start, DistanceStart=start_d, SurfaceEnd=end,
+                                  DistanceEnd=end_d, ClubUsed=rng.choice(CLUBS[category]),
+                                  ShotShape="", Penalty=penalty))
+        score_shots(baseline, shots)
+        assign_hole_results(shots)
+        produced += len(shots)
+        yield round_info, shots
+
+
+def build_database(path, total_shots, seed=7, baseline=None):
+    """Create a migrated database at `path` holding about `total_shots` synthetic shots.
+
+    Rows are bulk-inserted in batches (with their aggregates) rather than going
+    through save_rounds, so even 10M shots build in minutes. Returns (players,
+    rounds, shots).
+    """
+    migrations.migrate(path)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA synchronous=OFF")  # a throwaway database
+    players = max(1, total_shots // SHOTS_PER_PLAYER)
+    conn.executemany("INSERT INTO DimPlayer (PlayerID, PlayerName, Handicap) VALUES (?, ?, ?)",
+                     [(i, f"Synthetic Player {i}", round(i % 30 * 0.9, 1)) for i in range(1, players + 1)])
+    with open(CSV_PATH, newline="", encoding="utf-8-sig") as f:
+        conn.executemany("INSERT INTO DimAvg VALUES (?, ?, ?, ?)",
+                         [(r["Surface"], int(r["Distance"]), float(r["SG Avg"]), r["Unit of Measurement"])
+                          for r in csv.DictReader(f)])
+
+    rounds = shots = 0
+    batch = []
+
+    def flush():
+        with conn:
+            shot_rows, agg_rounds = [], {}
+            for round_info, round_shots in batch:
+                round_id = conn.execute(INSERT_ROUND, (
+                    round_info["PlayerID"], round_info["CoursePlayed"], round_info["RoundDate"],
+                    18, "Tips", round_hash(round_info, round_shots))).lastrowid
+                agg_rounds[round_id] = (round_info["PlayerID"], round_info["RoundDate"])
+                shot_rows.extend(insert_row(round_id, tuple(map(s.get, SHOT_COLUMNS))) for s in round_shots)
+            conn.executemany(INSERT_SHOT, shot_rows)
+            # kpis.SHOT_FIELDS picked out of the FactShots insert rows
+            columns = shots_to_columns([(r[0], r[2], r[3], r[5], r[8], r[12], r[13]) for r in shot_rows])
+            conn.executemany(analytics.INSERT_AGG_ROUND,
+                             analytics.agg_round_rows(summarize_rounds(columns), agg_rounds))
+        batch.clear()
+
+    for round_info, round_shots in generate_rounds(total_shots, seed, baseline):
+        batch.append((round_info, round_shots))
+        rounds += 1
+        shots += len(round_shots)
+        if len(batch) >= BATCH_ROUNDS:
+            flush()
+    if batch:
+        flush()
+    with conn:
+        conn.execute(analytics.FILL_SEASONS.format(""))
+        conn.execute("ANALYZE")
+    conn.close()
+    return players, rounds, shots
+
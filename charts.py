@@ -0,0 +1,172 @@
+"""Summary charts rendered without pyplot, with an LRU cache of the PNGs.
+
+One Figure on the Agg canvas is cleared and redrawn for every chart, so figures
+never pile up in pyplot's global manager. Rendered PNGs are cached by round
+content hash, so showing the same round again skips matplotlib entirely, and
+prerender() fills the cache on a background thread before a screen asks:
+
+    charts.prerender(round_hash(round_info, shots), kpis["sg_by_category"])
+    png = charts.round_chart(round_hash(round_info, shots), kpis["sg_by_category"])
+
+Only PNG bytes are cached. A Tk PhotoImage belongs to the Tk interpreter that
+created it, and every screen here is its own tk.Tk(), so photo_image() makes a
+fresh one per window; decoding a cached PNG takes about a millisecond.
+"""
+import base64
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import metrics
+
+# --- CONFIG ---
+CACHE_SIZE = 64  # rendered charts kept, roughly 20-30 KB each
+FIGSIZE = (7, 4)
+DPI = 100
+
+# --- COLORS ---
+BG_COLOR = "#121a24"
+TEXT_COLOR = "#e5e5e5"
+GREEN_TEXT = "#00B050"
+RED_TEXT = "#FF5C5C"
+
+_cache = OrderedDict()  # key -> PNG bytes, least recently used first
+_pending = {}  # key -> Future of a pre-render still in flight
+_cache_lock = threading.Lock()
+_render_lock = threading.Lock()  # the shared Figure is drawn by one thread at a time
+_figure = None
+_executor = None
+
+
+# --- Drawing ---
+def _shared_figure():
+    global _figure
+    if _figure is None:
+        # matplotlib is only imported when the first chart is drawn; it dominates cold start
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        _figure = Figure(figsize=FIGSIZE, dpi=DPI, facecolor=BG_COLOR)
+        FigureCanvasAgg(_figure)
+    return _figure
+
+
+def draw_sg_by_category(fig, sg_by_category):
+    """Horizontal SG bars per category, labelled with their values."""
+    categories = list(sg_by_category)
+    values = list(sg_by_category.values())
+    ax = fig.add_subplot()
+    bars = ax.barh(categories, values,
+                   color=[GREEN_TEXT if v > 0 else RED_TEXT if v < 0 else TEXT_COLOR for v in values])
+    ax.set_facecolor(BG_COLOR)
+    ax.tick_params(colors=TEXT_COLOR)
+    ax.spines[:].set_color(TEXT_COLOR)
+    ax.set_xlabel("Strokes Gained", color=TEXT_COLOR, fontsize=11)
+    ax.margins(x=0.15)  # adds space left/right so labels don’t get clipped
+    fig.subplots_adjust(left=0.25, right=0.95, top=0.92, bottom=0.15)  # fine-tuned padding
+
+    ax.axvline(0, color=TEXT_COLOR, linestyle="--", linewidth=1, alpha=0.6)
+
+    # --- White numeric labels on bars ---
+    for bar, val in zip(bars, values):
+        xpos = bar.get_width()
+        ax.text(
+            xpos + (0.05 if xpos >= 0 else -0.05),
+            bar.get_y() + bar.get_height() / 2,
+            f"{val:+.2f}",
+            va="center",
+            ha="left" if xpos >= 0 else "right",
+            color="white",
+            fontsize=10,
+            fontweight="bold"
+        )
+
+
+def render_png(draw, *args):
+    """Draw onto the shared Figure with draw(fig, *args) and return the PNG bytes."""
+    with _render_lock, metrics.timer("chart_render"):
+        fig = _shared_figure()
+        fig.clear()
+        draw(fig, *args)
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png", facecolor=BG_COLOR)
+        fig.clear()  # drop the artists until the next chart
+        return buf.getvalue()
+
+
+# --- Cache ---
+def _remember(key, png):
+    with _cache_lock:
+        _cache[key] = png
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def cached(key):
+    """PNG bytes for `key`, or None. A hit makes the entry most recently used."""
+    with _cache_lock:
+        png = _cache.get(key)
+        if png is not None:
+            _cache.move_to_end(key)
+        return png
+
+
+def round_chart(key, sg_by_category):
+    """PNG of a round's SG-by-category chart, rendered once per round content hash."""
+    with _cache_lock:
+        png = _cache.get(key)
+        future = _pending.get(key)
+        if png is not None:
+            _cache.move_to_end(key)
+    if png is not None:
+        metrics.count("chart_cache_hit")
+        return png
+    if future is not None:
+        try:
+            png = future.result()  # finish the pre-render rather than drawing it twice
+        except Exception:
+            # A failed pre-render must not break the summary screen: draw it here instead
+            metrics.count("chart_prerender_failed")
+            with _cache_lock:
+                if _pending.get(key) is future:
+                    del _pending[key]
+        else:
+            metrics.count("chart_cache_prerendered")
+            return png
+    metrics.count("chart_cache_miss")
+    png = render_png(draw_sg_by_category, sg_by_category)
+    _remember(key, png)
+    return png
+
+
+def prerender(key, sg_by_category):
+    """Render a round chart on the background thread unless it is cached or on its way."""
+    global _executor
+    with _cache_lock:
+        if key in _cache or key in _pending:
+            return
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="charts")
+
+        def job():
+            try:
+                png = render_png(draw_sg_by_category, sg_by_category)
+                _remember(key, png)
+                return png
+            finally:
+                with _cache_lock:
+                    _pending.pop(key, None)
+
+        _pending[key] = _executor.submit(job)
+
+
+def clear():
+    with _cache_lock:
+        _cache.clear()
+
+
+# --- Tk ---
+def photo_image(master, png):
+    """A Tk image of the PNG for widgets in `master`'s window (Tk 8.6 reads PNG natively)."""
+    import tkinter as tk
+    return tk.PhotoImage(master=master, data=base64.b64encode(png))
@@ -0,0 +1,167 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+import metrics
+
+# --- CONFIG ---
+# The one place the database location is decided; SG_DB_PATH points every screen and tool elsewhere
+DB_PATH = os.environ.get("SG_DB_PATH", "shots_gained.db")
+POOL_SIZE = 4
+POOL_TIMEOUT = 10.0  # seconds to wait for a free connection
+STATEMENT_CACHE_SIZE = 256  # prepared statements kept per connection, keyed by SQL text
+
+# Per-connection settings. WAL lets the UI read while a save is writing, and
+# synchronous=NORMAL is durable in WAL mode without an fsync on every commit.
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",  # ~16 MB page cache
+    "PRAGMA busy_timeout=5000",
+)
+
+
+def apply_pragmas(conn):
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+
+
+class ConnectionPool:
+    """A bounded set of open connections to one database file, shared across threads.
+
+    Connections are opened lazily up to `size` and handed out most-recently-used first,
+    so their prepared-statement caches stay warm.
+    """
+
+    def __init__(self, db_path, size=POOL_SIZE, timeout=POOL_TIMEOUT):
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._opened = 0  # open connections, idle or borrowed
+        self._borrowed = set()
+        self._retired = set()  # borrowed when close() ran; closed as they come back
+
+    def _open(self):
+        with metrics.timer("db_connect"):
+            conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                   cached_statements=STATEMENT_CACHE_SIZE)
+            apply_pragmas(conn)
+        return conn
+
+    def acquire(self):
+        conn = self._take()
+        with self._lock:
+            self._borrowed.add(conn)
+        return conn
+
+    def _take(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._opened < self.size:
+                conn = self._open()
+                self._opened += 1
+                return conn
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No free connection to {self.db_path} after {self.timeout}s") from None
+
+    def release(self, conn):
+        with self._lock:
+            self._borrowed.discard(conn)
+            retired = conn in self._retired
+            if retired:
+                self._retired.discard(conn)
+                self._opened -= 1
+        if retired:
+            conn.close()  # the pool was closed while this one was out
+            return
+        if conn.in_transaction:
+            conn.rollback()  # never hand the next caller someone else's open transaction
+        self._idle.put(conn)
+
+    def close(self):
+        """Close idle connections now and borrowed ones when they are released."""
+        with self._lock:
+            while True:
+                try:
+                    self._idle.get_nowait().close()
+                except queue.Empty:
+                    break
+            self._retired |= self._borrowed
+            self._opened = len(self._borrowed)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path=None):
+    db_path = db_path or DB_PATH
+    with _pools_lock:
+        pool = _pools.get(db_path)
+        if pool is None:
+            pool = _pools[db_path] = ConnectionPool(db_path)
+        return pool
+
+
+def close_all():
+    """Close every pooled connection (end of session, or before replacing the file)."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+
+# --- Timing counters ---
+# Always on (a dict update per operation); metrics.py adds histograms when SG_METRICS is set
+_timings = {}  # operation -> [count, total seconds, max seconds]
+_timings_lock = threading.Lock()
+
+
+def record_timing(op, seconds):
+    with _timings_lock:
+        entry = _timings.setdefault(op, [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] = max(entry[2], seconds)
+
+
+def timings():
+    """Snapshot of {operation: {"count", "total_ms", "avg_ms", "max_ms"}}."""
+    with _timings_lock:
+        return {op: {"count": n, "total_ms": total * 1000, "avg_ms": total / n * 1000,
+                     "max_ms": worst * 1000}
+                for op, (n, total, worst) in _timings.items()}
+
+
+def reset_timings():
+    with _timings_lock:
+        _timings.clear()
+
+
+@contextmanager
+def connection(op="query", db_path=None):
+    """Borrow a pooled connection for one operation and time it under `op`
+    (db.timings(), and metric "db_<op>" when metrics are on).
+
+        with db.connection("login") as conn:
+            conn.execute(...)
+    """
+    pool = get_pool(db_path)
+    started = time.perf_counter()
+    conn = pool.acquire()
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+        elapsed = time.perf_counter() - started
+        record_timing(op, elapsed)
+        metrics.observe(f"db_{op}", elapsed)
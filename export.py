@@ -0,0 +1,283 @@
+"""Columnar export of FactShots, joined with DimRound and DimPlayer, for analytics tools.
+
+Shots stream out of SQLite CHUNK_ROWS at a time as Arrow record batches. Round
+and player columns are read once per round and joined onto the shots in Arrow.
+The batches are written to Parquet files partitioned by player and season. The hive layout lets
+pyarrow.dataset, pandas, DuckDB and Spark read the folder directly:
+
+    exports/player=3/season=2025/part-000000000000-0.parquet
+
+Surfaces, categories, hole results, clubs, shot shapes, courses, tees and
+player names are dictionary-encoded. Surfaces are built from the FactShots
+surface codes against the surfaces registry, so every file has the same
+surface dictionary.
+
+Exports are incremental. _export_state.json in the output folder records the
+last exported ShotID (the watermark) and the newest CreatedDate. The next run
+reads only shots above the watermark and adds part files next to the existing
+ones. A round's shots are saved in one transaction and ShotID only grows, so a
+nightly run reads only that day's rounds. Rescoring changes shots that were
+already exported, so run --full after rescore.py:
+
+    python export.py exports/            # shots added since the last export
+    python export.py exports/ --full     # rewrite the whole export
+
+pyarrow is optional and is only imported when an export runs.
+"""
+import argparse
+import glob
+import json
+import os
+import shutil
+import time
+from collections import OrderedDict
+import numpy as np
+import db
+import surfaces
+from analytics import season_of
+from db import DB_PATH
+from migrations import migrate
+
+# --- CONFIG ---
+CHUNK_ROWS = 100_000  # shots per Arrow batch read from SQLite
+MAX_OPEN_WRITERS = 64  # partition files kept open; a closed partition continues in a new part file
+COMPRESSION = "zstd"
+STATE_FILE = "_export_state.json"  # leading underscore: dataset readers skip it
+
+# (column, SQL expression, Arrow type name); "dict" columns are dictionary-encoded strings
+SHOT_COLUMNS = [
+    ("ShotID", "ShotID", "int64"),
+    ("RoundID", "RoundID", "int64"),
+    ("PlayerID", "PlayerID", "int64"),
+    ("Hole", "Hole", "int16"),
+    ("Par", "Par", "int8"),
+    ("HoleResult", "HoleResult", "dict"),
+    ("Category", "Category", "dict"),
+    ("SurfaceStart", "SurfaceStartCode", "surface"),
+    ("DistanceStart", "DistanceStart", "float64"),
+    ("SurfaceEnd", "SurfaceEndCode", "surface"),
+    ("DistanceEnd", "DistanceEnd", "float64"),
+    ("ClubUsed", "ClubUsed", "dict"),
+    ("ShotShape", "ShotShape", "dict"),
+    ("Penalty", "Penalty", "int8"),
+    ("StrokesGained", "StrokesGained", "float64"),
+    ("CreatedDate", "CreatedDate", "string"),
+]
+# Read once per round and joined onto its shots in Arrow, not repeated in every SQLite row
+ROUND_COLUMNS = [
+    ("RoundID", "r.RoundID", "int64"),
+    ("PlayerID", "r.PlayerID", "int64"),
+    ("PlayerName", "p.PlayerName", "dict"),
+    ("CoursePlayed", "r.CoursePlayed", "dict"),
+    ("TeePreference", "r.TeePreference", "dict"),
+    ("RoundDate", "r.RoundDate", "string"),
+    # analytics.season_of: the RoundDate year, this year when the date is missing
+    ("Season", "COALESCE(substr(r.RoundDate, 1, 4), strftime('%Y', 'now'))", "dict"),
+]
+# Exported column order: shot keys, then the round's columns, then the shot's.
+# PlayerID and Season (the partition keys) come from the round; a shot whose round
+# is missing falls back to its own PlayerID and this season, never null.
+COLUMNS = SHOT_COLUMNS[:2] + ROUND_COLUMNS[1:] + SHOT_COLUMNS[3:]
+
+SELECT_SHOTS = f"SELECT {', '.join(expr for _, expr, _ in SHOT_COLUMNS)} FROM FactShots WHERE ShotID > ?"
+# A full export walks idx_FactShots_PlayerID(PlayerID, RoundID) so each partition's
+# rows arrive together; an incremental one reads the rowid range above the watermark.
+ORDER_FULL = " ORDER BY PlayerID, RoundID, ShotID"
+ORDER_NEW = " ORDER BY ShotID"
+SELECT_ROUNDS = f"""
+    SELECT {", ".join(expr for _, expr, _ in ROUND_COLUMNS)}
+    FROM DimRound r LEFT JOIN DimPlayer p ON p.PlayerID = r.PlayerID
+"""
+NEW_ROUNDS = " WHERE r.RoundID IN (SELECT RoundID FROM FactShots WHERE ShotID > ?)"
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet export needs pyarrow (pip install pyarrow)") from None
+    return pyarrow, pyarrow.parquet
+
+
+def _types():
+    pa, _ = _pyarrow()
+    return {"int64": pa.int64(), "int16": pa.int16(), "int8": pa.int8(), "float64": pa.float64(),
+            "string": pa.string(), "dict": pa.dictionary(pa.int32(), pa.string()),
+            "surface": pa.dictionary(pa.int8(), pa.string())}
+
+
+def schema():
+    pa, _ = _pyarrow()
+    types = _types()
+    return pa.schema([(name, types[kind]) for name, _, kind in COLUMNS])
+
+
+def _arrays(columns, rows):
+    """Arrow arrays, one per (name, expr, kind) in `columns`, from SQLite rows."""
+    pa, _ = _pyarrow()
+    types = _types()
+    surface_names = pa.array(list(surfaces.NAMES), pa.string())  # index = surface code
+    arrays = []
+    for (_, _, kind), values in zip(columns, zip(*rows) if rows else [()] * len(columns)):
+        if kind == "surface":
+            arrays.append(pa.DictionaryArray.from_arrays(pa.array(values, pa.int8()), surface_names))
+        elif kind == "dict":
+            arrays.append(pa.array(values, pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(values, types[kind]))
+    return arrays
+
+
+def iter_batches(db_path=DB_PATH, after=0, chunk=CHUNK_ROWS):
+    """Yield Arrow RecordBatches (schema()) of up to `chunk` shots, for every shot with ShotID > after."""
+    pa, _ = _pyarrow()
+    fields = schema()
+    round_names = {name for name, _, _ in ROUND_COLUMNS[1:]}  # RoundID is the shot's
+    names = [name for name, _, _ in COLUMNS]
+    player, season = names.index("PlayerID"), names.index("Season")
+    with db.connection("export", db_path) as conn:
+        if after:
+            round_rows = conn.execute(SELECT_ROUNDS + NEW_ROUNDS, (after,)).fetchall()
+        else:
+            round_rows = conn.execute(SELECT_ROUNDS).fetchall()
+        rounds = pa.RecordBatch.from_arrays(_arrays(ROUND_COLUMNS, round_rows),
+                                            names=[name for name, _, _ in ROUND_COLUMNS])
+        cursor = conn.execute(SELECT_SHOTS + (ORDER_NEW if after else ORDER_FULL), (after,))
+        while True:
+            rows = cursor.fetchmany(chunk)
+            if not rows:
+                return
+            shots = dict(zip((name for name, _, _ in SHOT_COLUMNS), _arrays(SHOT_COLUMNS, rows)))
+            joined = rounds.take(pa.compute.index_in(shots["RoundID"], value_set=rounds.column("RoundID")))
+            arrays = [joined.column(name) if name in round_names else shots[name] for name, _, _ in COLUMNS]
+            arrays[player] = pa.compute.coalesce(arrays[player], shots["PlayerID"])
+            if arrays[season].null_count:
+                arrays[season] = pa.compute.coalesce(arrays[season].cast(pa.string()),
+                                                     season_of(None)).dictionary_encode()
+            yield pa.RecordBatch.from_arrays(arrays, schema=fields)
+
+
+# --- Files ---
+def _read_state(out_dir):
+    try:
+        with open(os.path.join(out_dir, STATE_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _write_state(out_dir, state):
+    path = os.path.join(out_dir, STATE_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def _remove_parts(out_dir, from_watermark):
+    """Delete part files written from `from_watermark` on: a full rewrite, or an unfinished run."""
+    for path in glob.glob(os.path.join(out_dir, "player=*", "season=*", "part-*.parquet")):
+        if int(os.path.basename(path).split("-")[1]) >= from_watermark:
+            os.remove(path)
+    if from_watermark == 0:
+        for folder in glob.glob(os.path.join(out_dir, "player=*")):
+            shutil.rmtree(folder)
+
+
+class PartitionWriters:
+    """Open ParquetWriters by (PlayerID, Season), least recently used closed first."""
+
+    def __init__(self, out_dir, watermark):
+        self.out_dir, self.watermark = out_dir, watermark
+        self.files = []
+        self._open = OrderedDict()
+        self.parts = {}  # partition -> part files started this run
+
+    def write(self, key, table):
+        writer = self._open.get(key)
+        if writer is None:
+            _, pq = _pyarrow()
+            player_id, season = key
+            folder = os.path.join(self.out_dir, f"player={player_id}", f"season={season}")
+            os.makedirs(folder, exist_ok=True)
+            n = self.parts[key] = self.parts.get(key, -1) + 1
+            path = os.path.join(folder, f"part-{self.watermark:012d}-{n}.parquet")
+            writer = self._open[key] = pq.ParquetWriter(path, schema(), compression=COMPRESSION)
+            self.files.append(path)
+            if len(self._open) > MAX_OPEN_WRITERS:
+                self._open.popitem(last=False)[1].close()
+        self._open.move_to_end(key)
+        writer.write_table(table)
+
+    def close(self):
+        while self._open:
+            self._open.popitem()[1].close()
+
+
+def export(out_dir, db_path=DB_PATH, full=False, chunk=CHUNK_ROWS):
+    """Write shots above the watermark in `out_dir` (all of them if full) as partitioned Parquet.
+
+    Returns {"shots", "files", "partitions", "watermark", "full", "seconds"}.
+    """
+    pa, _ = _pyarrow()
+    started = time.perf_counter()
+    os.makedirs(out_dir, exist_ok=True)
+    state = None if full else _read_state(out_dir)
+    after = state["shot_id"] if state else 0  # no state: first export, or a full one
+    if after == 0 and os.path.exists(os.path.join(out_dir, STATE_FILE)):
+        os.remove(os.path.join(out_dir, STATE_FILE))  # an interrupted full export must not look incremental
+    _remove_parts(out_dir, after)
+
+    writers = PartitionWriters(out_dir, after)
+    shots, last_shot, last_created = 0, after, state and state["created"]
+    try:
+        for batch in iter_batches(db_path, after, chunk):
+            # stable sort by partition keeps ShotID order inside each partition
+            players = batch.column("PlayerID").to_numpy()
+            seasons = batch.column("Season")
+            season_codes = seasons.indices.to_numpy()
+            order = np.lexsort((season_codes, players))
+            players, season_codes = players[order], season_codes[order]
+            starts = np.flatnonzero(np.diff(players) | np.diff(season_codes)) + 1
+            table = pa.Table.from_batches([batch]).take(order)
+            for start, end in zip([0, *starts], [*starts, len(order)]):
+                key = (int(players[start]), seasons.dictionary[season_codes[start]].as_py())
+                writers.write(key, table.slice(start, end - start))
+            shots += batch.num_rows
+            last_shot = max(last_shot, pa.compute.max(batch.column("ShotID")).as_py())
+            created = pa.compute.max(batch.column("CreatedDate")).as_py()
+            last_created = max(filter(None, (last_created, created)), default=None)
+    finally:
+        writers.close()
+    total = (state["shots"] if state else 0) + shots
+    _write_state(out_dir, {"shot_id": last_shot, "created": last_created, "shots": total,
+                           "exported": time.strftime("%Y-%m-%d %H:%M:%S")})
+    return {"shots": shots, "files": len(writers.files), "partitions": len(writers.parts),
+            "watermark": last_shot, "full": after == 0, "seconds": time.perf_counter() - started}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export FactShots to partitioned Parquet.")
+    parser.add_argument("out", help="output folder (player=<id>/season=<year>/part-*.parquet)")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--full", action="store_true", help="rewrite the whole export")
+    parser.add_argument("--chunk", type=int, default=CHUNK_ROWS, help="shots per batch")
+    args = parser.parse_args()
+
+    migrate(args.db)
+    try:
+        stats = export(args.out, args.db, args.full, args.chunk)
+    except ImportError as e:
+        print(f"❌ {e}")
+        raise SystemExit(1)
+    if not stats["shots"]:
+        print(f"✅ Nothing new since ShotID {stats['watermark']:,}")
+        return
+    print(f"✅ Exported {stats['shots']:,} shots to {stats['files']:,} files in "
+          f"{stats['partitions']:,} partitions in {stats['seconds']:.2f}s "
+          f"({'full' if stats['full'] else 'incremental'}); watermark ShotID {stats['watermark']:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""Streaming importer for historical shot logs (launch monitors, other apps).
+
+Reads a shot-per-row CSV or JSONL file of any size with bounded memory, maps its
+columns onto the shot_entry.add_shot record shape, scores each round and commits
+in batches. After every commit the byte offset of the next unread round is
+checkpointed, so a crashed import picks up where it left off:
+
+    python importer.py trackman.csv --map Lie=SurfaceStart --map Carry=DistanceStart
+"""
+import argparse
+import csv
+import hashlib
+import io
+import json
+import os
+import time
+from baseline import load_baseline
+from db import DB_PATH
+from ingest import ROUND_KEY, BadRecord, new_stats, reject, save_batch, validate_round
+from migrations import migrate
+
+# --- CONFIG ---
+BATCH_SIZE = 1000  # rounds per transaction
+
+
+# --- Reading with byte offsets ---
+def iter_rows(path, fmt, start=0):
+    """Yield (row dict, byte offset just past the row), starting at byte `start`.
+
+    CSV rows must each fit on one line (no quoted newlines), which is what
+    shot-log exports produce; that is what keeps the offsets exact.
+    """
+    with open(path, "rb") as f:
+        header = None
+        if fmt == "csv":
+            header = next(csv.reader([f.readline().decode("utf-8-sig")]))
+            start = max(start, f.tell())
+        f.seek(start)
+        offset = start
+        for line in f:
+            offset += len(line)
+            text = line.decode("utf-8").strip()
+            if not text:
+                continue
+            if fmt == "csv":
+                yield dict(zip(header, next(csv.reader(io.StringIO(text))))), offset
+                continue
+            try:
+                yield json.loads(text), offset
+            except ValueError as e:
+                yield BadRecord(f"byte {offset - len(line):,}: not valid JSON ({e})"), offset
+
+
+def map_row(row, column_map):
+    """Rename source columns to FactShots/DimRound names; unmapped columns pass through."""
+    return {column_map.get(k, k): v for k, v in row.items()}
+
+
+def iter_rounds(rows, column_map):
+    """Group consecutive mapped rows into round records.
+
+    Yields (record, offset) where offset is the end of the round's last row.
+    """
+    key = record = None
+    end = 0
+    for row, offset in rows:
+        if isinstance(row, BadRecord):  # rejected on its own, between the rounds around it
+            if record is not None:
+                yield record, end
+            key = record = None
+            yield row, offset
+            continue
+        row = map_row(row, column_map)
+        row_key = tuple(row.get(k) for k in ROUND_KEY)
+        if row_key != key:
+            if record is not None:
+                yield record, end
+            key = row_key
+            record = dict(zip(ROUND_KEY, row_key))
+            record["TeePreference"] = row.get("TeePreference")
+            record["Shots"] = []
+        record["Shots"].append(row)
+        end = offset
+    if record is not None:
+        yield record, end
+
+
+# --- Checkpoints ---
+def checkpoint_path(path, db_path=DB_PATH):
+    """One checkpoint per (source file, database): importing a file into another database starts over."""
+    db_key = hashlib.sha1(os.path.realpath(db_path).encode("utf-8")).hexdigest()[:12]
+    return f"{path}.{db_key}.checkpoint"
+
+
+def load_checkpoint(path, db_path=DB_PATH):
+    """Byte offset to resume from, or 0 if the file has no (or a stale) checkpoint."""
+    try:
+        with open(checkpoint_path(path, db_path), encoding="utf-8") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return 0
+    if saved.get("db") != os.path.realpath(db_path):
+        return 0
+    # A checkpoint past the end means the source file was replaced; start over
+    return saved["offset"] if saved.get("offset", 0) <= os.path.getsize(path) else 0
+
+
+def save_checkpoint(path, db_path, offset, rounds):
+    target = checkpoint_path(path, db_path)
+    with open(target + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"db": os.path.realpath(db_path), "offset": offset, "rounds": rounds}, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(target + ".tmp", target)  # atomic: never a half-written checkpoint
+
+
+# --- Import ---
+def import_file(path, db_path=DB_PATH, baseline=None, fmt=None, column_map=None,
+                batch_size=BATCH_SIZE, resume=True):
+    """Stream `path` into FactShots/DimRound. Returns the ingest stats plus the final offset.
+
+    Rounds are saved idempotently, so a crash between a commit and its checkpoint
+    only means the next run skips a batch it has already stored.
+    """
+    fmt = fmt or ("csv" if path.lower().endswith(".csv") else "jsonl")
+    baseline = baseline or load_baseline(db_path)
+    start = load_checkpoint(path, db_path) if resume else 0
+    stats = new_stats()
+    stats["resumed_at"] = start
+    started = time.perf_counter()
+
+    batch = []
+    offset = start
+    for n, (record, end) in enumerate(iter_rounds(iter_rows(path, fmt, start), column_map or {}),
+                                      start=1):
+        stats["rounds"] += 1
+        try:
+            batch.append((n, *validate_round(record)))
+        except (ValueError, TypeError, AttributeError) as e:
+            reject(stats, n, str(e))
+        offset = end
+        if len(batch) >= batch_size:
+            save_batch(batch, db_path, baseline, stats)
+            save_checkpoint(path, db_path, offset, stats["created"])
+            batch = []
+    if batch:
+        save_batch(batch, db_path, baseline, stats)
+    save_checkpoint(path, db_path, offset, stats["created"])
+
+    stats["offset"] = offset
+    stats["seconds"] = time.perf_counter() - started
+    stats["rounds_per_sec"] = stats["rounds"] / stats["seconds"] if stats["seconds"] else 0.0
+    return stats
+
+
+def parse_column_map(pairs, map_file=None):
+    column_map = {}
+    if map_file:
+        with open(map_file, encoding="utf-8") as f:
+            column_map.update(json.load(f))
+    for pair in pairs or []:
+        source, _, target = pair.partition("=")
+        if not target:
+            raise SystemExit(f"--map expects SOURCE=TARGET, got {pair!r}")
+        column_map[source] = target
+    return column_map
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream historical shot logs into FactShots/DimRound.")
+    parser.add_argument("path", help="shot-per-row CSV or JSONL file")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="default: from the file extension")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--baseline", help="baseline .csv or database (default: DimAvg in --db)")
+    parser.add_argument("--map", action="append", metavar="SOURCE=TARGET",
+                        help="rename a source column to a FactShots/DimRound column (repeatable)")
+    parser.add_argument("--map-file", help="JSON object of source -> target column names")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="rounds per commit")
+    parser.add_argument("--restart", action="store_true", help="ignore any checkpoint and start from the top")
+    args = parser.parse_args()
+
+    migrate(args.db)
+    stats = import_file(args.path, args.db, load_baseline(args.baseline or args.db), args.format,
+                        parse_column_map(args.map, args.map_file), args.batch_size,
+                        resume=not args.restart)
+
+    for n, message in stats["errors"][:20]:
+        print(f"❌ Round {n}: {message}")
+    if stats["rejected"] > 20:
+        print(f"❌ ... and {stats['rejected'] - 20:,} more rejected rounds")
+    for message in stats["missing_baselines"].values():
+        print(f"↪ {message}; those players were scored against the default baseline")
+    if stats["resumed_at"]:
+        print(f"↪ Resumed at byte {stats['resumed_at']:,}")
+    print(f"✅ {stats['rounds']:,} rounds in {stats['seconds']:.2f}s ({stats['rounds_per_sec']:,.0f}/s): "
+          f"{stats['created']:,} saved ({stats['shots']:,} shots), "
+          f"{stats['duplicates']:,} already saved, {stats['rejected']:,} rejected")
+
+
+if __name__ == "__main__":
+    main()
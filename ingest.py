@@ -0,0 +1,240 @@
+"""Headless round ingestion: validate, score and persist rounds without any UI.
+
+Takes round records as dicts, JSONL (one round per line with a "Shots" list) or
+CSV (one shot per row, rounds grouped by PlayerID/CoursePlayed/RoundDate):
+
+    python ingest.py rounds.jsonl
+    python ingest.py shots.csv --batch-size 1000
+"""
+import argparse
+import csv
+import itertools
+import json
+import time
+from baseline import get_baseline, load_baseline, player_baselines
+from db import DB_PATH
+from migrations import migrate
+from round_store import save_rounds
+from scoring import CATEGORIES, END_SURFACES, START_SURFACES, assign_hole_results, score_shots_by_player
+from shot import Shot
+import surfaces
+
+# --- CONFIG ---
+BATCH_SIZE = 500  # rounds per transaction
+ROUND_KEY = ("PlayerID", "CoursePlayed", "RoundDate")
+MAX_ERRORS = 100  # rejection messages kept; "rejected" still counts every one
+
+
+# --- Validation ---
+def _number(value, field, cast=float, required=True):
+    if value is None or value == "":
+        if required:
+            raise ValueError(f"{field} is required")
+        return None
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} must be a number, got {value!r}") from None
+
+
+def _surface(value, field, allowed):
+    try:
+        name = surfaces.canonical(value)  # "Bunker" is stored as "Sand"
+    except TypeError:  # a list or object where a surface name belongs
+        name = None
+    if name not in allowed:
+        raise ValueError(f"unknown {field} {value!r}")
+    return name
+
+
+def normalize_shot(raw, player_id):
+    """Coerce one raw shot into the record shape built by shot_entry.add_shot."""
+    surface_start = _surface(raw.get("SurfaceStart"), "SurfaceStart", START_SURFACES)
+    surface_end = _surface(raw.get("SurfaceEnd"), "SurfaceEnd", END_SURFACES)
+    category = raw.get("Category")
+    if category not in CATEGORIES:
+        raise ValueError(f"unknown Category {category!r}")
+
+    shot = Shot(
+        PlayerID=player_id,
+        Hole=_number(raw.get("Hole"), "Hole", int),
+        Par=_number(raw.get("Par"), "Par", int, required=False),
+        Category=category,
+        SurfaceStart=surface_start,
+        DistanceStart=_number(raw.get("DistanceStart"), "DistanceStart"),
+        SurfaceEnd=surface_end,
+        DistanceEnd=None if surface_end == "Hole" else _number(raw.get("DistanceEnd"), "DistanceEnd"),
+        ClubUsed=(raw.get("ClubUsed") or "").strip(),
+        ShotShape=(raw.get("ShotShape") or "").strip(),
+        Penalty=1 if _number(raw.get("Penalty"), "Penalty", int, required=False) else 0,
+        StrokesGained=_number(raw.get("StrokesGained"), "StrokesGained", required=False),
+    )
+    if shot.Par is not None and shot.Par not in (3, 4, 5):
+        raise ValueError(f"Par must be 3, 4 or 5, got {shot.Par}")
+    if shot.DistanceStart < 0 or (shot.DistanceEnd or 0) < 0:
+        raise ValueError("distances cannot be negative")
+    return shot
+
+
+def validate_round(record):
+    """Split a raw round record into (round_info, shots), raising ValueError if it is unusable."""
+    if isinstance(record, BadRecord):
+        raise ValueError(record.message)
+    for field in ROUND_KEY:
+        if not record.get(field):
+            raise ValueError(f"{field} is required")
+    player_id = _number(record["PlayerID"], "PlayerID", int)
+    raw_shots = record.get("Shots") or []
+    if not raw_shots:
+        raise ValueError("round has no shots")
+
+    shots = []
+    for n, raw in enumerate(raw_shots, start=1):
+        try:
+            shots.append(normalize_shot(raw, player_id))
+        except ValueError as e:
+            raise ValueError(f"shot {n}: {e}") from None
+
+    round_info = {
+        "RoundID": None,
+        "PlayerID": player_id,
+        "CoursePlayed": str(record["CoursePlayed"]).strip(),
+        "RoundDate": str(record["RoundDate"]).strip(),
+        "HolesPlayed": len({s["Hole"] for s in shots}),
+        "TeePreference": record.get("TeePreference") or "Tips",
+    }
+    return round_info, shots
+
+
+# --- Readers ---
+class BadRecord:
+    """Stands in for a source line that could not be parsed; validate_round rejects it."""
+
+    def __init__(self, message):
+        self.message = message
+
+
+def read_jsonl(path):
+    """Yield one round record per non-blank line (a BadRecord for a line that is not JSON)."""
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                yield BadRecord(f"line {line_no}: not valid JSON ({e})")
+
+
+def read_csv(path):
+    """Yield round records from a shot-per-row CSV; consecutive rows with the same round key form a round."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        for key, rows in itertools.groupby(reader, key=lambda r: tuple(r.get(k) for k in ROUND_KEY)):
+            rows = list(rows)
+            record = dict(zip(ROUND_KEY, key))
+            record["TeePreference"] = rows[0].get("TeePreference")
+            record["Shots"] = rows
+            yield record
+
+
+def read_records(path, fmt=None):
+    fmt = fmt or ("csv" if path.lower().endswith(".csv") else "jsonl")
+    return read_csv(path) if fmt == "csv" else read_jsonl(path)
+
+
+# --- Service ---
+def new_stats():
+    return {"rounds": 0, "created": 0, "duplicates": 0, "rejected": 0, "shots": 0, "errors": [],
+            "missing_baselines": {}}
+
+
+def reject(stats, n, message):
+    """Count a rejected round; only the first MAX_ERRORS messages are kept."""
+    stats["rejected"] += 1
+    if len(stats["errors"]) < MAX_ERRORS:
+        stats["errors"].append((n, message))
+
+
+def save_batch(batch, db_path, baseline, stats):
+    """Score and persist validated rounds [(n, round_info, shots), ...] in one transaction.
+
+    Each player is scored against their DimPlayer.Baseline; `baseline` is used
+    for everyone else, and for players whose named baseline is missing.
+    """
+    overrides, missing = player_baselines(db_path)
+    stats["missing_baselines"].update(missing)
+    unscored = set(score_shots_by_player(baseline, overrides,
+                                         [s for _, _, shots in batch for s in shots]))
+    ready = []
+    offset = 0
+    for n, round_info, shots in batch:
+        if unscored.intersection(range(offset, offset + len(shots))):
+            reject(stats, n, "a shot has no baseline for its surface and no StrokesGained")
+        else:
+            assign_hole_results(shots)
+            ready.append((round_info, shots))
+        offset += len(shots)
+    for (_, shots), (_, created) in zip(ready, save_rounds(ready, db_path)):
+        if created:
+            stats["created"] += 1
+            stats["shots"] += len(shots)
+        else:
+            stats["duplicates"] += 1
+
+
+def ingest(records, db_path=DB_PATH, baseline=None, batch_size=BATCH_SIZE):
+    """Validate, score and persist an iterable of round records in batched transactions.
+
+    Invalid rounds are skipped and reported; they never abort the batch.
+    Returns a stats dict.
+    """
+    baseline = baseline or get_baseline()
+    stats = new_stats()
+    started = time.perf_counter()
+
+    batch = []
+    for n, record in enumerate(records, start=1):
+        stats["rounds"] += 1
+        try:
+            batch.append((n, *validate_round(record)))
+        except (ValueError, TypeError, AttributeError) as e:
+            reject(stats, n, str(e))
+            continue
+        if len(batch) >= batch_size:
+            save_batch(batch, db_path, baseline, stats)
+            batch = []
+    if batch:
+        save_batch(batch, db_path, baseline, stats)
+
+    stats["seconds"] = time.perf_counter() - started
+    stats["rounds_per_sec"] = stats["rounds"] / stats["seconds"] if stats["seconds"] else 0.0
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate, score and save rounds without the UI.")
+    parser.add_argument("path", help="CSV or JSONL file of rounds")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="default: from the file extension")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--baseline", help="baseline .csv or database (default: DimAvg in --db)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    migrate(args.db)
+    baseline = load_baseline(args.baseline or args.db)
+    stats = ingest(read_records(args.path, args.format), args.db, baseline, args.batch_size)
+
+    for n, message in stats["errors"][:20]:
+        print(f"❌ Round {n}: {message}")
+    if stats["rejected"] > 20:
+        print(f"❌ ... and {stats['rejected'] - 20:,} more rejected rounds")
+    for message in stats["missing_baselines"].values():
+        print(f"↪ {message}; those players were scored against the default baseline")
+    print(f"✅ {stats['rounds']:,} rounds in {stats['seconds']:.2f}s ({stats['rounds_per_sec']:,.0f}/s): "
+          f"{stats['created']:,} saved ({stats['shots']:,} shots), "
+          f"{stats['duplicates']:,} already saved, {stats['rejected']:,} rejected")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""Write-ahead journal for the round being entered.
+
+Every shot_entry event (round started, shot added, shot taken back for editing,
+hole saved) is appended to journal/round_<PlayerID>.jsonl the moment it
+happens. Each line is flushed to the OS straight away, so an app crash loses
+nothing. A background thread fsyncs in batches, so a power cut loses at most
+FSYNC_INTERVAL of input and no append ever waits on the disk. Replaying the file
+rebuilds the exact shot_entry state. Saving the round compacts it into
+FactShots and deletes the file:
+
+    python journal.py            # list unfinished rounds
+    python journal.py --compact  # save every fully entered round to FactShots
+"""
+import argparse
+import glob
+import json
+import os
+import threading
+import zlib
+from db import DB_PATH
+from shot import Shot
+
+# --- CONFIG ---
+JOURNAL_DIR = os.environ.get("SG_JOURNAL_DIR", "journal")
+FSYNC_INTERVAL = 0.25  # seconds between batched fsyncs while events are pending
+
+
+def journal_path(player_id, journal_dir=None):
+    return os.path.join(journal_dir or JOURNAL_DIR, f"round_{player_id}.jsonl")
+
+
+def _encode(event):
+    # A CRC per line, so a torn last write is recognised on replay instead of misread
+    body = json.dumps(event, separators=(",", ":"))
+    return f"{zlib.crc32(body.encode()):08x} {body}\n"
+
+
+def _decode(line):
+    crc, _, body = line.rstrip("\n").partition(" ")
+    if not body or f"{zlib.crc32(body.encode()):08x}" != crc:
+        return None
+    return json.loads(body)
+
+
+def _intact_length(path):
+    """Bytes of `path` up to and including its last undamaged line."""
+    length = 0
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n") or _decode(line.decode("utf-8", "replace")) is None:
+                break
+            length += len(line)
+    return length
+
+
+class ShotJournal:
+    """Append-only event log for one in-progress round.
+
+    resume=True keeps the events already in the file (after cutting off a torn
+    last line, so new events are not appended to garbage); otherwise the file
+    starts empty.
+    """
+
+    def __init__(self, path, resume=False, fsync_interval=FSYNC_INTERVAL):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        if resume and os.path.exists(path):
+            os.truncate(path, _intact_length(path))
+        self._file = open(path, "a" if resume else "w", encoding="utf-8")
+        self._dirty = False
+        self._closed = threading.Event()
+        self._wake = threading.Condition()  # guards _dirty; appends never wait on a disk flush
+        self._sync_lock = threading.Lock()  # one fsync at a time, and never on a closed file
+        self._syncer = threading.Thread(target=self._sync_loop, args=(fsync_interval,), daemon=True)
+        self._syncer.start()
+
+    # --- Events ---
+    def start_round(self, round_info):
+        self._append({"e": "round", "round": round_info})
+
+    def add_shot(self, shot):
+        self._append({"e": "shot", "shot": shot.to_dict()})
+
+    def take_back_shot(self):
+        self._append({"e": "pop"})
+
+    def save_hole(self, hole, result):
+        self._append({"e": "hole", "hole": hole, "result": result})
+        self.sync()  # a finished hole is worth waiting for
+
+    # --- Durability ---
+    def _append(self, event):
+        self._file.write(_encode(event))
+        self._file.flush()  # in the OS page cache: survives the app dying
+        with self._wake:
+            self._dirty = True
+            self._wake.notify()
+
+    def _sync_loop(self, interval):
+        while not self._closed.is_set():
+            with self._wake:
+                while not self._dirty and not self._closed.is_set():
+                    self._wake.wait()
+            self._closed.wait(interval)  # let a burst of appends share one fsync
+            self.sync()
+
+    def sync(self):
+        with self._sync_lock:
+            with self._wake:
+                if not self._dirty or self._file.closed:
+                    return
+                self._dirty = False
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        self.sync()
+        self._closed.set()
+        with self._wake:
+            self._wake.notify()
+        with self._sync_lock:
+            self._file.close()
+
+
+def clear(player_id, journal_dir=None):
+    """Delete a player's journal once its round is safely in FactShots."""
+    path = journal_path(player_id, journal_dir)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+# --- Replay ---
+def replay(path):
+    """Rebuild shot_entry state from a journal.
+
+    Returns a dict with round_info, saved (shots of finished holes, HoleResult set),
+    current (shots of the hole in progress) and hole (the hole being entered).
+    PlayerIDs come back as ints, whatever type the journal was written with.
+    Replay stops at the first damaged line; everything before it is intact.
+    """
+    state = {"round_info": None, "saved": [], "current": [], "hole": 1}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            event = _decode(line)
+            if event is None:
+                break
+            kind = event["e"]
+            if kind == "round":
+                info = dict(event["round"], PlayerID=_player_id(event["round"].get("PlayerID")))
+                state.update(round_info=info, saved=[], current=[], hole=1)
+            elif kind == "shot":
+                shot = Shot.from_dict(event["shot"])
+                shot.PlayerID = _player_id(shot.PlayerID)
+                state["current"].append(shot)
+            elif kind == "pop" and state["current"]:
+                state["current"].pop()
+            elif kind == "hole":
+                for s in state["current"]:
+                    s.HoleResult = event["result"]
+                state["saved"].extend(state["current"])
+                state["current"] = []
+                state["hole"] = event["hole"] + 1
+    return state
+
+
+def _player_id(value):
+    # Journals written before login returned an int carry the PlayerID as a string
+    return None if value is None else int(value)
+
+
+def is_complete(state):
+    """Every hole of the round has been saved (only the summary's Save Round was missing)."""
+    info = state["round_info"]
+    return bool(info) and not state["current"] and state["hole"] > int(info["HolesPlayed"])
+
+
+def find_unfinished(player_id=None, journal_dir=None):
+    """[(path, state)] for journals left behind by a crash, optionally for one player."""
+    pattern = journal_path(player_id if player_id is not None else "*", journal_dir)
+    found = []
+    for path in sorted(glob.glob(pattern)):
+        state = replay(path)
+        if state["round_info"]:
+            found.append((path, state))
+    return found
+
+
+def compact(path, db_path=DB_PATH):
+    """Save a fully entered journaled round to FactShots/DimRound and delete the journal.
+
+    Returns (RoundID, created). Saving is idempotent, so compacting a round the
+    summary screen already saved just removes the file.
+    """
+    from round_store import save_round
+    state = replay(path)
+    if not is_complete(state):
+        raise ValueError(f"{path} is not a complete round (entering hole {state['hole']})")
+    result = save_round(state["round_info"], state["saved"], db_path)
+    os.remove(path)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or compact unfinished round journals.")
+    parser.add_argument("--dir", default=JOURNAL_DIR)
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--compact", action="store_true", help="save every fully entered round to FactShots")
+    args = parser.parse_args()
+
+    for path, state in find_unfinished(journal_dir=args.dir):
+        info = state["round_info"]
+        shots = len(state["saved"]) + len(state["current"])
+        if args.compact and is_complete(state):
+            round_id, created = compact(path, args.db)
+            print(f"✅ {info['CoursePlayed']} {info['RoundDate']}: "
+                  f"{'saved as' if created else 'already saved as'} RoundID {round_id}")
+        else:
+            print(f"↪ {info['CoursePlayed']} {info['RoundDate']} (PlayerID {info['PlayerID']}): "
+                  f"{shots} shots, entering hole {state['hole']} of {info['HolesPlayed']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+import numpy as np
+from scoring import CATEGORIES
+
+
+def summarize_round(shots):
+    """Round KPIs from a list of shot dicts: score vs par, FIR, GIR and SG totals.
+
+    Returns a dict with holes, strokes, par, fairways_hit, fairways_eligible,
+    greens_hit, sg_total and sg_by_category.
+    """
+    total_strokes = 0
+    total_par = 0
+    fairways_hit = 0
+    fairways_eligible = 0
+    greens_hit = 0
+    total_sg = 0
+
+    holes = {}
+    for shot in shots:
+        holes.setdefault(shot["Hole"], []).append(shot)
+
+    for shots_list in holes.values():
+        par = int(shots_list[0].get("Par", 0) or 0)
+        total_par += par
+        total_strokes += len(shots_list) + sum(s.get("Penalty", 0) for s in shots_list)
+        total_sg += sum(s.get("StrokesGained", 0) or 0 for s in shots_list)
+
+        # --- Fairway Hit Logic ---
+        first = shots_list[0]
+        if par >= 4:
+            fairways_eligible += 1
+            if (first.get("Category") == "Driving" and not first.get("Penalty")
+                    and first.get("SurfaceEnd") in ("Fairway", "Green", "Hole")):
+                fairways_hit += 1
+
+        # --- Green in Regulation Logic ---
+        strokes_to_green = next((i + 1 for i, s in enumerate(shots_list)
+                                 if s.get("SurfaceEnd") in ("Green", "Hole")), None)
+        if strokes_to_green and strokes_to_green <= (par - 2):
+            greens_hit += 1
+
+    sg_by_category = {cat: 0 for cat in CATEGORIES}
+    for s in shots:
+        cat = s.get("Category")
+        if cat in sg_by_category and s["StrokesGained"] is not None:
+            sg_by_category[cat] += s["StrokesGained"]
+
+    return {
+        "holes": len(holes),
+        "strokes": total_strokes,
+        "par": total_par,
+        "fairways_hit": fairways_hit,
+        "fairways_eligible": fairways_eligible,
+        "greens_hit": greens_hit,
+        "sg_total": total_sg,
+        "sg_by_category": sg_by_category,
+    }
+
+
+def score_vs_par(strokes, par):
+    diff = strokes - par
+    return f"+{diff}" if diff > 0 else f"-{-diff}" if diff < 0 else "E"
+
+
+# --- Columnar, many rounds at once ---
+SHOT_FIELDS = ("RoundID", "Hole", "Par", "Category", "SurfaceEnd", "Penalty", "StrokesGained")
+
+
+def shots_to_columns(shots):
+    """Shot records or dicts (or FactShots rows in SHOT_FIELDS order) -> dict of NumPy columns."""
+    rows = [s if isinstance(s, tuple) else tuple(map(s.get, SHOT_FIELDS)) for s in shots]
+    round_id, hole, par, category, surface_end, penalty, sg = zip(*rows) if rows else ((),) * 7
+    return {
+        "RoundID": np.array(round_id, dtype=np.int64),
+        "Hole": np.array(hole, dtype=np.int64),
+        "Par": np.array([p or 0 for p in par], dtype=np.int64),
+        "Category": np.array([c or "" for c in category], dtype=str),
+        "SurfaceEnd": np.array([e or "" for e in surface_end], dtype=str),
+        "Penalty": np.array([p or 0 for p in penalty], dtype=np.int64),
+        "StrokesGained": np.array(sg, dtype=float),  # None -> NaN
+    }
+
+
+def _ordered_sum(values, starts, lengths):
+    """Per-segment float sums accumulated strictly left to right, like Python's sum().
+
+    np.add.reduceat sums pairwise, which can differ in the last bit; this loops over
+    the longest segment instead (a hole's shots, a round's holes), not over segments.
+    """
+    out = np.zeros(len(starts))
+    for k in range(int(lengths.max()) if len(lengths) else 0):
+        active = lengths > k
+        out[active] += values[starts[active] + k]
+    return out
+
+
+def summarize_rounds(columns):
+    """summarize_round for every round in `columns` at once, via grouped reductions.
+
+    `columns` holds parallel arrays (see shots_to_columns) with each round's shots in
+    the order they were played. Returns a dict of arrays aligned on "round_id"
+    (ascending), with the same keys as summarize_round. Sums are taken in the same
+    order as the per-round code, so the results match it exactly.
+    """
+    round_ids = columns["RoundID"]
+    n = len(round_ids)
+    if n == 0:
+        empty = np.zeros(0)
+        return {"round_id": np.zeros(0, dtype=np.int64), "holes": empty, "strokes": empty,
+                "par": empty, "fairways_hit": empty, "fairways_eligible": empty,
+                "greens_hit": empty, "sg_total": empty,
+                "sg_by_category": {cat: empty for cat in CATEGORIES}}
+
+    # Holes in order of first appearance within each round, shots in played order
+    seq = np.arange(n)
+    holes = columns["Hole"] - columns["Hole"].min()
+    _, hole_key = np.unique(round_ids * (holes.max() + 1) + holes, return_inverse=True)
+    first_seen = np.full(hole_key.max() + 1, n)
+    np.minimum.at(first_seen, hole_key, seq)
+    order = np.lexsort((seq, first_seen[hole_key], round_ids))
+
+    rid = round_ids[order]
+    hkey = hole_key[order]
+    penalty = columns["Penalty"][order]
+    sg = np.nan_to_num(columns["StrokesGained"][order])
+    surface_end = columns["SurfaceEnd"][order]
+    category = columns["Category"][order]
+
+    # --- Per hole ---
+    hole_starts = np.flatnonzero(np.r_[True, hkey[1:] != hkey[:-1]])
+    hole_len = np.diff(np.r_[hole_starts, n])
+    par = columns["Par"][order][hole_starts]
+    strokes = hole_len + np.add.reduceat(penalty, hole_starts)
+    hole_sg = _ordered_sum(sg, hole_starts, hole_len)
+
+    eligible = par >= 4
+    fairway = (eligible & (category[hole_starts] == "Driving") & (penalty[hole_starts] == 0)
+               & np.isin(surface_end[hole_starts], ("Fairway", "Green", "Hole")))
+
+    pos = seq - np.repeat(hole_starts, hole_len)  # 0-based shot number within the hole
+    on_green = np.isin(surface_end, ("Green", "Hole"))
+    first_green = np.minimum.reduceat(np.where(on_green, pos, n), hole_starts)
+    gir = (first_green < n) & (first_green + 1 <= par - 2)
+
+    # --- Per round ---
+    hole_rid = rid[hole_starts]
+    round_starts = np.flatnonzero(np.r_[True, hole_rid[1:] != hole_rid[:-1]])
+    unique_rounds = hole_rid[round_starts]
+    by_round = lambda values: np.add.reduceat(values, round_starts)
+
+    # Category sums follow the original shot order, like the per-round loop
+    round_index = np.searchsorted(unique_rounds, round_ids)
+    raw_sg = columns["StrokesGained"]
+    has_sg = ~np.isnan(raw_sg)
+    sg_by_category = {}
+    for cat in CATEGORIES:
+        mask = has_sg & (columns["Category"] == cat)
+        sg_by_category[cat] = np.bincount(round_index[mask], weights=raw_sg[mask],
+                                          minlength=len(unique_rounds))
+
+    return {
+        "round_id": unique_rounds,
+        "holes": np.diff(np.r_[round_starts, len(hole_starts)]),
+        "strokes": by_round(strokes),
+        "par": by_round(par),
+        "fairways_hit": by_round(fairway.astype(np.int64)),
+        "fairways_eligible": by_round(eligible.astype(np.int64)),
+        "greens_hit": by_round(gir.astype(np.int64)),
+        "sg_total": _ordered_sum(hole_sg, round_starts, np.diff(np.r_[round_starts, len(hole_starts)])),
+        "sg_by_category": sg_by_category,
+    }
+
+
+def iter_round_summaries(result):
+    """Unpack summarize_rounds output into (RoundID, summarize_round-style dict) pairs."""
+    for i, round_id in enumerate(result["round_id"].tolist()):
+        yield round_id, {
+            "holes": int(result["holes"][i]),
+            "strokes": int(result["strokes"][i]),
+            "par": int(result["par"][i]),
+            "fairways_hit": int(result["fairways_hit"][i]),
+            "fairways_eligible": int(result["fairways_eligible"][i]),
+            "greens_hit": int(result["greens_hit"][i]),
+            "sg_total": float(result["sg_total"][i]),
+            "sg_by_category": {cat: float(v[i]) for cat, v in result["sg_by_category"].items()},
+        }
@@ -1,29 +1,89 @@
+import argparse
+import threading
+
+
+def warm_up(errors):
+    """Migrate the schema, index names for autocomplete and load the baseline while the login screen is up."""
+    try:
+        from migrations import migrate
+        from baseline import get_baseline
+        import name_index
+        migrate()
+        name_index.load()
+        get_baseline()
+    except Exception as e:
+        errors.append(e)
+
+
+def offer_recovery(player):
+    """Ask about a round a crash left in the journal. Returns a replay state to resume, or None."""
+    import tkinter as tk
+    from tkinter import messagebox
+    import journal
+
+    unfinished = journal.find_unfinished(player["PlayerID"])
+    if not unfinished:
+        return None
+    path, state = unfinished[0]
+    info = state["round_info"]
+    root = tk.Tk()
+    root.withdraw()
+    try:
+        if journal.is_complete(state):
+            if messagebox.askyesno("Recover Round", f"Your round at {info['CoursePlayed']} on "
+                                   f"{info['RoundDate']} was fully entered but never saved.\n\nSave it now?"):
+                round_id, _ = journal.compact(path)
+                print(f"✅ Recovered round saved (RoundID {round_id})")
+            else:
+                journal.clear(player["PlayerID"])
+            return None
+        if messagebox.askyesno("Resume Round", f"Resume your round at {info['CoursePlayed']} on "
+                               f"{info['RoundDate']} from hole {state['hole']}?"):
+            return state
+        journal.clear(player["PlayerID"])
+        return None
+    finally:
+        root.destroy()
+
 
 def main():
+    # Step 0: Schema migration, name index and baseline load run in the background during login
+    warmup_errors = []
+    warmer = threading.Thread(target=warm_up, args=(warmup_errors,), daemon=True)
+    warmer.start()
+
     # Step 1: Login
-    import login
-    login.window.mainloop()  # Blocks until login window closes
+    from login import open_login
+    player = open_login()  # Blocks until login window closes
 
-    # If login was successful, a global variable will exist
-    if not hasattr(login, "logged_in_player"):
+    if not player:
         print("❌ Login not completed. Exiting.")
         return
 
-    player = login.logged_in_player
     print(f"✅ Logged in as {player['PlayerName']} (PlayerID: {player['PlayerID']})")
 
-    # Step 2: Round setup
-    from round_setup import open_round_setup, round_info
-    open_round_setup(player)
+    # Everything after login needs the migrated schema and the loaded baseline
+    warmer.join()
+    if warmup_errors:
+        print(f"❌ Startup failed: {warmup_errors[0]}")
+        return
+
+    # Step 2: Round setup, unless a crashed round is resumed from its journal
+    import round_setup
+    resume = offer_recovery(player)
+    if resume:
+        round_setup.round_info = resume["round_info"]
+    else:
+        round_setup.open_round_setup(player)
 
-    # If round setup completed, a global variable round_info should exist
-    if not hasattr(round_info, "get"):
+    # If round setup completed, round_info will have been filled in
+    if not round_setup.round_info:
         print("❌ Round setup not completed. Exiting.")
         return
 
     # Step 3: Shot entry
     from shot_entry import open_shot_entry, cached_shots
-    open_shot_entry()
+    open_shot_entry(resume)
     # Step 4: After summary screen executes, cached_shots will have been saved
     from round_summary import open_summary_screen
     open_summary_screen(cached_shots)
@@ -31,4 +91,11 @@ def main():
     print("✅ App flow completed successfully.")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Shots Gained Tracker")
+    parser.add_argument("--profile", metavar="FILE", help="run under cProfile and save the stats to FILE")
+    args = parser.parse_args()
+    if args.profile:
+        import metrics
+        metrics.profile(main, args.profile)
+    else:
+        main()
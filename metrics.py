@@ -0,0 +1,166 @@
+"""Hot-path instrumentation: timers, counters and latency histograms keyed by operation.
+
+Off unless SG_METRICS is set, and close to free when off: timed() hands back the
+undecorated function, timer() returns a shared no-op context manager and
+count()/observe() return on their first line. When on, everything is written to
+SG_METRICS_FILE at exit, as Prometheus text if the name ends in .prom and as
+JSON otherwise:
+
+    SG_METRICS=1 python main.py
+    SG_METRICS=1 SG_METRICS_FILE=sg.prom python ingest.py rounds.jsonl
+"""
+import atexit
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# --- CONFIG ---
+ENABLED = os.environ.get("SG_METRICS", "").lower() not in ("", "0", "false", "no")
+METRICS_FILE = os.environ.get("SG_METRICS_FILE", "sg_metrics.json")
+
+# Histogram bucket upper bounds in seconds, 10 us to 10 s
+BUCKETS = (1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 0.01, 0.025, 0.05,
+           0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_NOOP = nullcontext()
+_lock = threading.Lock()
+_timers = {}  # op -> [count, total seconds, max seconds, [count per bucket + overflow]]
+_counters = {}  # name -> total
+
+
+# --- Recording ---
+def observe(op, seconds):
+    """Add one duration to op's timer and histogram."""
+    if not ENABLED:
+        return
+    with _lock:
+        entry = _timers.get(op)
+        if entry is None:
+            entry = _timers[op] = [0, 0.0, 0.0, [0] * (len(BUCKETS) + 1)]
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] = max(entry[2], seconds)
+        entry[3][bisect.bisect_left(BUCKETS, seconds)] += 1
+
+
+def count(name, n=1):
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+@contextmanager
+def _timing(op):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(op, time.perf_counter() - started)
+
+
+def timer(op):
+    """Context manager timing its block under `op`:  with metrics.timer("chart_render"): ..."""
+    return _timing(op) if ENABLED else _NOOP
+
+
+def timed(op):
+    """Decorator timing every call under `op`. Applied at import, so when metrics are
+    off the function is returned untouched and costs nothing."""
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(op, time.perf_counter() - started)
+        return wrapper
+    return decorate
+
+
+# --- Reading ---
+def _quantile(buckets, n, q):
+    """Upper bound of the bucket holding the q-th quantile (the Prometheus estimate)."""
+    target = q * n
+    seen = 0
+    for bound, c in zip(BUCKETS, buckets):
+        seen += c
+        if seen >= target:
+            return bound
+    return float("inf")
+
+
+def snapshot():
+    """{"timers": {op: stats in ms}, "counters": {name: total}}."""
+    with _lock:
+        timers = {}
+        for op, (n, total, worst, buckets) in sorted(_timers.items()):
+            timers[op] = {
+                "count": n, "total_ms": total * 1000, "avg_ms": total / n * 1000,
+                "max_ms": worst * 1000,
+                "p50_ms": _quantile(buckets, n, 0.5) * 1000,
+                "p95_ms": _quantile(buckets, n, 0.95) * 1000,
+                "buckets": dict(zip([str(b) for b in BUCKETS] + ["+Inf"], buckets)),
+            }
+        return {"timers": timers, "counters": dict(sorted(_counters.items()))}
+
+
+def reset():
+    with _lock:
+        _timers.clear()
+        _counters.clear()
+
+
+def prometheus_text():
+    lines = ["# HELP sg_operation_seconds Duration of instrumented operations.",
+             "# TYPE sg_operation_seconds histogram"]
+    with _lock:
+        for op, (n, total, _, buckets) in sorted(_timers.items()):
+            cumulative = 0
+            for bound, c in zip([repr(b) for b in BUCKETS] + ["+Inf"], buckets):
+                cumulative += c
+                lines.append(f'sg_operation_seconds_bucket{{op="{op}",le="{bound}"}} {cumulative}')
+            lines.append(f'sg_operation_seconds_sum{{op="{op}"}} {total!r}')
+            lines.append(f'sg_operation_seconds_count{{op="{op}"}} {n}')
+        lines += ["# HELP sg_events_total Counted events.", "# TYPE sg_events_total counter"]
+        lines += [f'sg_events_total{{name="{name}"}} {value}' for name, value in sorted(_counters.items())]
+    return "\n".join(lines) + "\n"
+
+
+def export(path=None):
+    """Write the current metrics to `path` (default SG_METRICS_FILE). Returns the path."""
+    path = path or METRICS_FILE
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        if path.endswith(".prom"):
+            f.write(prometheus_text())
+        else:
+            json.dump(snapshot(), f, indent=2)
+    os.replace(tmp, path)
+    return path
+
+
+if ENABLED:
+    atexit.register(export)
+
+
+# --- Profiling ---
+def profile(fn, path, top=25):
+    """Run fn() under cProfile, save the stats to `path` and print the top entries."""
+    import cProfile
+    import pstats
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(fn)
+    finally:
+        profiler.dump_stats(path)
+        pstats.Stats(path).sort_stats("cumulative").print_stats(top)
+        print(f"✅ Profile written to {path} (open with: python -m pstats {path})")
@@ -0,0 +1,107 @@
+import sqlite3
+import analytics
+import baseline
+import round_store
+import surfaces
+import tableload
+from db import DB_PATH
+
+
+# --- MIGRATIONS ---
+def _add_lookup_indexes(conn):
+    # Covering index: the baseline lookup is answered from the index alone
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_DimAvg_Surface_Distance "
+                 "ON DimAvg(Surface, Distance, TourAvg)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_FactShots_RoundID "
+                 "ON FactShots(RoundID, Hole)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_FactShots_PlayerID "
+                 "ON FactShots(PlayerID, RoundID)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_DimRound_PlayerID_RoundDate "
+                 "ON DimRound(PlayerID, RoundDate)")
+    conn.execute("ANALYZE")
+
+
+def _add_round_hash(conn):
+    # Content hash of a saved round; the unique index makes re-saving the same round a no-op
+    conn.execute("ALTER TABLE DimRound ADD COLUMN RoundHash TEXT")
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_DimRound_RoundHash ON DimRound(RoundHash)")
+
+
+def _add_player_aggregates(conn):
+    analytics.create_tables(conn)
+    analytics.rebuild(conn)  # backfill rounds saved before the aggregates existed
+
+
+def _add_player_baseline(conn):
+    # Name of the compiled baseline (baselines/<name>.sgb) a player is scored against; NULL is tour
+    conn.execute("ALTER TABLE DimPlayer ADD COLUMN Baseline TEXT")
+
+
+def _add_sync_state(conn):
+    # When a round was pushed to the sync server; the partial index finds the unsynced ones
+    conn.execute("ALTER TABLE DimRound ADD COLUMN SyncedDate DATETIME")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_DimRound_Unsynced ON DimRound(RoundID) "
+                 "WHERE SyncedDate IS NULL")
+
+
+# (version, description, function). Append only: never edit or reorder applied entries.
+MIGRATIONS = [
+    (1, "Base star schema from tableload.py", tableload.create_tables),
+    (2, "Indexes for baseline lookup and per-player history", _add_lookup_indexes),
+    (3, "DimRound.RoundHash for idempotent round saves", _add_round_hash),
+    (4, "Per-round and per-season player aggregates", _add_player_aggregates),
+    (5, "DimPlayer.Baseline for per-player expectation curves", _add_player_baseline),
+    (6, "DimSurface and FactShots surface codes", surfaces.create_tables),
+    (7, "BaselineVersion stamps for DimAvg syncs", baseline.create_tables),
+    (8, "DimRound.SyncedDate for pushing rounds to a sync server", _add_sync_state),
+    (9, "DimRound.RoundHash recomputed without pickle memo references", round_store.rehash_rounds),
+    (10, "DimRound.RoundHash recomputed from canonical JSON", round_store.rehash_rounds),
+]
+
+
+def current_version(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS SchemaVersion (
+            Version INTEGER PRIMARY KEY,
+            Description TEXT,
+            AppliedDate DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    return conn.execute("SELECT COALESCE(MAX(Version), 0) FROM SchemaVersion").fetchone()[0]
+
+
+def migrate(db_path=DB_PATH, verbose=False):
+    """Bring the database up to the latest schema version and switch it to WAL.
+
+    Each migration runs in its own transaction together with its SchemaVersion row,
+    so a failure leaves the database at the last fully applied version.
+    Returns the resulting version.
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        version = current_version(conn)
+        for number, description, apply in MIGRATIONS:
+            if number <= version:
+                continue
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                apply(conn)
+                conn.execute("INSERT INTO SchemaVersion (Version, Description) VALUES (?, ?)",
+                             (number, description))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            version = number
+            if verbose:
+                print(f"✅ Applied migration {number}: {description}")
+
+        # journal_mode is stored in the file, but cannot change inside a transaction
+        conn.execute("PRAGMA journal_mode=WAL")
+        return version
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    print(f"✅ {DB_PATH} is at schema version {migrate(verbose=True)}")
@@ -0,0 +1,182 @@
+"""In-memory prefix/trigram indexes of player, course and tee names for autocomplete.
+
+Loaded once in the background at startup and kept current as rounds are saved,
+so login and round setup match as-you-type without touching the database:
+
+    name_index.load()                      # main.warm_up runs this during login
+    name_index.courses.search("pebb")      # [("Pebble Beach", None), ...], most played first
+    name_index.players.search("smith j")   # [("John Smith", (12,)), ...]; word prefixes and typos match
+
+Prefix matches come from a sorted list of every word-start of every name, so a
+lookup is a bisect plus a bounded scan. When those run short, trigram overlap
+fills in misspellings ("pebel" still finds "Pebble Beach").
+"""
+import bisect
+import threading
+from collections import Counter
+import db
+from db import DB_PATH
+
+# --- CONFIG ---
+LIMIT = 8  # suggestions returned
+SCAN_LIMIT = 200  # prefix matches ranked per lookup; bounds the cost of one-letter queries
+MIN_SIMILARITY = 0.5  # share of the query's trigrams a fuzzy match must contain
+FUZZY_BUDGET = 1000  # trigram postings read per misspelled query
+FUZZY_CANDIDATES = 12  # best-counted names checked in full
+BULK_KEYS = 64  # more new prefix keys than this are merged by one sort, not inserted one by one
+
+
+def normalize(text):
+    """Casefolded, single-spaced form used for matching."""
+    return " ".join(str(text).casefold().split())
+
+
+def trigrams(norm):
+    padded = f"  {norm} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """Names with a value each (PlayerID, times played, ...), searchable by prefix and trigram.
+
+    `weight` orders suggestions (higher first); names equal after normalize()
+    are one entry. Safe to read from the Tk thread while another thread adds.
+    """
+
+    def __init__(self):
+        self.names, self.values, self.weights = [], [], []
+        self._norms = []
+        self._rank = []  # (-weight, name) per entry: suggestion order among equal matches
+        self._by_norm = {}  # normalized name -> entry id
+        self._keys, self._key_ids = [], []  # sorted word-start suffixes and their entry ids
+        self._trigrams = {}  # trigram -> [entry id, ...]
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, name, value=None, weight=0):
+        """Add a name, or raise an existing one's weight and replace its value."""
+        self.add_many([(name, value, weight)])
+
+    def add_many(self, items):
+        """add() for each (name, value, weight), sorting the prefix keys once for a bulk load."""
+        with self._lock:
+            keys = []
+            for name, value, weight in items:
+                norm = normalize(name)
+                if not norm:
+                    continue
+                i = self._by_norm.get(norm)
+                if i is not None:
+                    self.weights[i] += weight
+                    self._rank[i] = (-self.weights[i], self.names[i])
+                    if value is not None:
+                        self.values[i] = value
+                    continue
+                i = self._by_norm[norm] = len(self.names)
+                self.names.append(" ".join(str(name).split()))
+                self._norms.append(norm)
+                self.values.append(value)
+                self.weights.append(weight)
+                self._rank.append((-weight, self.names[i]))
+                keys += [(norm[start:], i) for start in [0] + [n + 1 for n, ch in enumerate(norm) if ch == " "]]
+                for tri in trigrams(norm):
+                    self._trigrams.setdefault(tri, []).append(i)
+            if len(keys) <= BULK_KEYS:
+                for key, i in keys:
+                    pos = bisect.bisect_left(self._keys, key)
+                    self._keys.insert(pos, key)
+                    self._key_ids.insert(pos, i)
+            else:
+                keys = sorted([*zip(self._keys, self._key_ids), *keys])
+                self._keys = [key for key, _ in keys]
+                self._key_ids = [i for _, i in keys]
+
+    def get(self, name):
+        """(name, value) for an exact (normalized) match, or None."""
+        i = self._by_norm.get(normalize(name))
+        return None if i is None else (self.names[i], self.values[i])
+
+    def search(self, text, limit=LIMIT):
+        """Up to `limit` (name, value) suggestions: prefix matches first, then close spellings."""
+        query = normalize(text)
+        if not query:
+            return []
+        with self._lock:
+            found = self._prefix(query)
+            # whole-name prefix matches before ones on a later word
+            ranked = (sorted([i for i in found if self._norms[i].startswith(query)], key=self._rank.__getitem__)
+                      + sorted([i for i in found if not self._norms[i].startswith(query)],
+                               key=self._rank.__getitem__))
+            if len(ranked) < limit and len(query) >= 3:
+                seen = set(ranked)
+                ranked += [i for i in self._fuzzy(query) if i not in seen]
+            return [(self.names[i], self.values[i]) for i in ranked[:limit]]
+
+    def _prefix(self, query):
+        found = {}
+        pos = bisect.bisect_left(self._keys, query)
+        end = min(len(self._keys), pos + SCAN_LIMIT)
+        while pos < end and self._keys[pos].startswith(query):
+            found[self._key_ids[pos]] = None
+            pos += 1
+        return list(found)
+
+    def _fuzzy(self, query):
+        wanted = trigrams(query)
+        need = MIN_SIMILARITY * len(wanted)
+        # Count hits from the rarest trigrams first, up to a fixed number of postings,
+        # then check the best-counted names against every trigram of the query
+        hits = Counter()
+        budget = FUZZY_BUDGET
+        for ids in sorted((self._trigrams.get(tri, ()) for tri in wanted), key=len):
+            if budget <= 0:
+                break
+            hits.update(ids[:budget])
+            budget -= len(ids)
+        scored = []
+        for i, _ in hits.most_common(FUZZY_CANDIDATES):
+            n = len(wanted & trigrams(self._norms[i]))
+            if n >= need:
+                scored.append((-n, self._rank[i], i))
+        return [i for *_, i in sorted(scored)]
+
+
+# --- Shared indexes ---
+players = NameIndex()  # PlayerName -> (PlayerID, ...); names can repeat
+player_names = {}  # PlayerID -> PlayerName
+courses = NameIndex()  # CoursePlayed -> times played
+tees = NameIndex()  # TeePreference -> times played
+loaded = threading.Event()
+_load_lock = threading.Lock()
+
+
+def load(db_path=DB_PATH):
+    """Fill the shared indexes from DimPlayer and DimRound (once per process)."""
+    with _load_lock:
+        if loaded.is_set():
+            return
+        with db.connection("name_index", db_path) as conn:
+            player_rows = conn.execute("SELECT PlayerName, PlayerID FROM DimPlayer").fetchall()
+            course_rows = conn.execute("SELECT CoursePlayed, COUNT(*) FROM DimRound "
+                                       "WHERE CoursePlayed IS NOT NULL GROUP BY CoursePlayed").fetchall()
+            tee_rows = conn.execute("SELECT TeePreference, COUNT(*) FROM DimRound "
+                                    "WHERE TeePreference IS NOT NULL GROUP BY TeePreference").fetchall()
+        ids = {}
+        for name, player_id in player_rows:
+            player_names[player_id] = name
+            ids.setdefault(normalize(name), (name, []))[1].append(player_id)
+        players.add_many((name, tuple(player_ids), 0) for name, player_ids in ids.values())
+        courses.add_many((name, None, n) for name, n in course_rows)
+        tees.add_many((name, None, n) for name, n in tee_rows)
+        loaded.set()
+
+
+def record_rounds(round_infos):
+    """Count newly saved rounds' course and tee names (before load, the load will see them)."""
+    if not loaded.is_set():
+        return
+    for info in round_infos:
+        courses.add(info.get("CoursePlayed") or "", weight=1)
+        tees.add(info.get("TeePreference") or "", weight=1)
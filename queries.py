@@ -0,0 +1,199 @@
+"""Read-only queries over the star schema, for dashboards and tools outside the GUI.
+
+Each function runs one fixed SQL statement, so sqlite3's per-connection statement
+cache (db.STATEMENT_CACHE_SIZE) keeps it prepared on the pooled connections, and
+each one is answered from the DimRound/FactShots indexes rather than a table scan.
+Results are immutable tuples of named records, cached for CACHE_TTL seconds in an
+LRU of CACHE_SIZE entries. Saving or rescoring rounds clears the cache:
+
+    from queries import rounds_by_player, sg_by_category
+    rounds = rounds_by_player(3, "2025-01-01", "2025-06-30")
+    for row in sg_by_category(3, "2025-01-01"):
+        print(row.key, row.shots, f"{row.sg_total:+.2f}")
+"""
+import functools
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from datetime import date
+import db
+import metrics
+from db import DB_PATH
+
+# --- CONFIG ---
+CACHE_SIZE = 512  # results kept
+CACHE_TTL = 60.0  # seconds; bounds staleness when another process writes the database
+DISTANCE_BUCKET = 25  # default bucket width for sg_by_distance, in each surface's own unit
+FIRST_DATE, LAST_DATE = "0000-01-01", "9999-12-31"  # open ends of a date range
+
+# --- RECORDS ---
+RoundRecord = namedtuple("RoundRecord", "RoundID PlayerID CoursePlayed RoundDate HolesPlayed TeePreference")
+ShotRecord = namedtuple("ShotRecord", "ShotID RoundID PlayerID Hole Par HoleResult Category SurfaceStart "
+                                      "DistanceStart SurfaceEnd DistanceEnd ClubUsed ShotShape Penalty "
+                                      "StrokesGained")
+SGRecord = namedtuple("SGRecord", "key shots sg_total sg_per_shot")
+
+# --- SQL ---
+# Rounds are found through idx_DimRound_PlayerID_RoundDate and their shots through
+# idx_FactShots_RoundID, so every query reads only the player's rows in range.
+SELECT_ROUNDS = f"""
+    SELECT {", ".join(RoundRecord._fields)} FROM DimRound
+    WHERE PlayerID = ? AND RoundDate BETWEEN ? AND ?
+    ORDER BY RoundDate, RoundID
+"""
+SELECT_SHOTS = f"""
+    SELECT {", ".join(ShotRecord._fields)} FROM FactShots
+    WHERE RoundID = ?
+    ORDER BY Hole, ShotID
+"""
+_SG_FROM = """
+    FROM DimRound r JOIN FactShots f ON f.RoundID = r.RoundID
+    WHERE r.PlayerID = ? AND r.RoundDate BETWEEN ? AND ? AND f.StrokesGained IS NOT NULL
+"""
+SG_BY_CATEGORY = f"""
+    SELECT f.Category, COUNT(*), SUM(f.StrokesGained) {_SG_FROM}
+    GROUP BY f.Category ORDER BY f.Category
+"""
+SG_BY_SURFACE = f"""
+    SELECT f.SurfaceStart, COUNT(*), SUM(f.StrokesGained) {_SG_FROM}
+    GROUP BY f.SurfaceStart ORDER BY f.SurfaceStart
+"""
+SG_BY_DISTANCE = f"""
+    SELECT f.SurfaceStart, CAST(f.DistanceStart / ? AS INTEGER) * ? AS Bucket,
+           COUNT(*), SUM(f.StrokesGained) {_SG_FROM}
+    GROUP BY f.SurfaceStart, Bucket ORDER BY f.SurfaceStart, Bucket
+"""
+
+
+# --- Cache ---
+class QueryCache:
+    """LRU of query results whose entries also expire `ttl` seconds after they were read.
+
+    invalidate() bumps a generation number as well as clearing, so a query that
+    was already running when the data changed cannot store its stale result.
+    """
+
+    def __init__(self, size=CACHE_SIZE, ttl=CACHE_TTL):
+        self.size = size
+        self.ttl = ttl
+        self.generation = 0
+        self._entries = OrderedDict()  # key -> (expires at, result)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """(True, result) on a live hit, else (False, None)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, entry[1]
+
+    def put(self, key, result, generation):
+        with self._lock:
+            if generation != self.generation:
+                return  # read before the last invalidate()
+            self._entries[key] = (time.monotonic() + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+cache = QueryCache()
+
+
+def invalidate():
+    """Drop every cached result. Called after rounds are saved or rescored."""
+    cache.invalidate()
+
+
+def _cached(fn):
+    """Serve repeated calls with the same arguments from the cache."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = (fn.__name__, args, tuple(sorted(kwargs.items())))
+        hit, result = cache.get(key)
+        if hit:
+            metrics.count("query_cache_hit")
+            return result
+        metrics.count("query_cache_miss")
+        generation = cache.generation
+        result = fn(*args, **kwargs)
+        cache.put(key, result, generation)
+        return result
+    return wrapper
+
+
+def _date_range(start, end):
+    """ISO date strings for BETWEEN; None leaves that end open. Raises ValueError on bad dates."""
+    bounds = []
+    for value, default in ((start, FIRST_DATE), (end, LAST_DATE)):
+        if value is None:
+            bounds.append(default)
+        elif isinstance(value, date):
+            bounds.append(value.isoformat())
+        else:
+            bounds.append(date.fromisoformat(str(value)).isoformat())
+    if bounds[0] > bounds[1]:
+        raise ValueError(f"start date {bounds[0]} is after end date {bounds[1]}")
+    return tuple(bounds)
+
+
+def _sg_records(rows):
+    """SGRecords from (*key, shots, sg_total) rows; a one-column key is unwrapped."""
+    return tuple(SGRecord(key[0] if len(key) == 1 else tuple(key), n, total, total / n)
+                 for *key, n, total in rows)
+
+
+# --- Queries ---
+@_cached
+def rounds_by_player(player_id, start=None, end=None, db_path=DB_PATH):
+    """A player's rounds dated between start and end (inclusive, ISO dates), oldest first."""
+    with db.connection("query_rounds", db_path) as conn:
+        rows = conn.execute(SELECT_ROUNDS, (player_id, *_date_range(start, end))).fetchall()
+    return tuple(RoundRecord._make(row) for row in rows)
+
+
+@_cached
+def shots_by_round(round_id, db_path=DB_PATH):
+    """Every shot of one round in playing order."""
+    with db.connection("query_shots", db_path) as conn:
+        rows = conn.execute(SELECT_SHOTS, (round_id,)).fetchall()
+    return tuple(ShotRecord._make(row) for row in rows)
+
+
+@_cached
+def sg_by_category(player_id, start=None, end=None, db_path=DB_PATH):
+    """SGRecord per shot category (Driving, Approach, ...) over the player's rounds in range."""
+    with db.connection("query_sg_category", db_path) as conn:
+        rows = conn.execute(SG_BY_CATEGORY, (player_id, *_date_range(start, end))).fetchall()
+    return _sg_records(rows)
+
+
+@_cached
+def sg_by_surface(player_id, start=None, end=None, db_path=DB_PATH):
+    """SGRecord per starting surface over the player's rounds in range."""
+    with db.connection("query_sg_surface", db_path) as conn:
+        rows = conn.execute(SG_BY_SURFACE, (player_id, *_date_range(start, end))).fetchall()
+    return _sg_records(rows)
+
+
+@_cached
+def sg_by_distance(player_id, start=None, end=None, width=DISTANCE_BUCKET, db_path=DB_PATH):
+    """SGRecord per (starting surface, distance bucket); the bucket is its lower bound."""
+    if width <= 0:
+        raise ValueError("width must be positive")
+    with db.connection("query_sg_distance", db_path) as conn:
+        rows = conn.execute(SG_BY_DISTANCE, (width, width, player_id, *_date_range(start, end))).fetchall()
+    return _sg_records(rows)
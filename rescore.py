@@ -0,0 +1,112 @@
+import argparse
+import time
+import numpy as np
+import analytics
+import db
+import queries
+import surfaces
+from baseline import load_baseline, player_baselines, strokes_gained_by_player
+from db import DB_PATH
+from migrations import migrate
+
+# --- CONFIG ---
+CHUNK_SIZE = 50_000
+SELECT_CHUNK = """
+    SELECT ShotID, PlayerID, SurfaceStartCode, SurfaceStart, DistanceStart, SurfaceEndCode, SurfaceEnd,
+           DistanceEnd, Penalty, StrokesGained
+    FROM FactShots WHERE ShotID > ? ORDER BY ShotID LIMIT ?
+"""
+UPDATE_SG = "UPDATE FactShots SET StrokesGained=? WHERE ShotID=?"
+
+
+def iter_shot_chunks(conn, chunk_size=CHUNK_SIZE):
+    """Yield FactShots in ShotID order as column tuples, one bounded chunk at a time."""
+    last_id = 0
+    while True:
+        rows = conn.execute(SELECT_CHUNK, (last_id, chunk_size)).fetchall()
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        yield tuple(zip(*rows))
+
+
+def rescore_chunk(baseline, columns, overrides=None):
+    """Recompute SG for one chunk. Returns (shot_ids, new_sg, old_sg) as arrays.
+
+    Players in `overrides` (PlayerID -> Baseline) are scored against their own
+    baseline, everyone else against `baseline`.
+    """
+    shot_ids, player_ids, start_code, surf_start, dist_start, end_code, surf_end, dist_end, penalty, old_sg = columns
+    surf_start = surfaces.stored_codes(start_code, surf_start)
+    surf_end = surfaces.stored_codes(end_code, surf_end)
+    dist_end = np.array(dist_end, dtype=float)  # None (holed out) becomes NaN
+    penalty = np.array([p or 0 for p in penalty], dtype=float)
+    new_sg = strokes_gained_by_player(baseline, overrides or {}, player_ids, surf_start, dist_start,
+                                      surf_end, dist_end, penalty)
+    old_sg = np.array(old_sg, dtype=float)
+    return np.array(shot_ids, dtype=np.int64), new_sg, old_sg
+
+
+def rescore_all(db_path, baseline, chunk_size=CHUNK_SIZE, dry_run=False):
+    """Rescore every FactShots row inside a single transaction.
+
+    Players with a DimPlayer.Baseline are scored against that baseline, everyone
+    else (and players whose named baseline is missing) against `baseline`.
+
+    Only rows whose SG actually changes are written, and the aggregates of the
+    players they belong to are rebuilt in the same transaction. Shots whose
+    surfaces have no baseline curve keep their stored value. Returns a stats dict.
+    """
+    started = time.perf_counter()
+    overrides, missing = player_baselines(db_path)
+    stats = {"baseline": baseline.version, "shots": 0, "updated": 0, "skipped": 0, "players": 0,
+             "missing_baselines": missing}
+    affected = set()
+    with db.connection("rescore", db_path) as conn:
+        with conn:  # one transaction: commits on success, rolls back on any error
+            for columns in iter_shot_chunks(conn, chunk_size):
+                shot_ids, new_sg, old_sg = rescore_chunk(baseline, columns, overrides)
+                scorable = ~np.isnan(new_sg)
+                changed = scorable & ~np.isclose(new_sg, old_sg, rtol=0, atol=1e-9)
+                stats["shots"] += len(shot_ids)
+                stats["skipped"] += int((~scorable).sum())
+                stats["updated"] += int(changed.sum())
+                affected.update(np.array(columns[1], dtype=np.int64)[changed].tolist())
+                if not dry_run:
+                    conn.executemany(UPDATE_SG, zip(new_sg[changed].tolist(),
+                                                    shot_ids[changed].tolist()))
+            stats["players"] = len(affected)
+            if dry_run:
+                conn.rollback()
+            elif affected:
+                analytics.rebuild(conn, affected)
+    if not dry_run:
+        queries.invalidate()
+    stats["seconds"] = time.perf_counter() - started
+    stats["shots_per_sec"] = stats["shots"] / stats["seconds"] if stats["seconds"] else 0.0
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute FactShots.StrokesGained against a baseline.")
+    parser.add_argument("--db", default=DB_PATH, help="database holding FactShots")
+    parser.add_argument("--baseline", default=None,
+                        help="baseline source: a .csv file or a database with DimAvg (default: --db)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="compute and report, write nothing")
+    args = parser.parse_args()
+
+    migrate(args.db)
+    baseline = load_baseline(args.baseline or args.db)
+    stats = rescore_all(args.db, baseline, args.chunk_size, args.dry_run)
+    for message in stats["missing_baselines"].values():
+        print(f"↪ {message}; those players were scored against {stats['baseline']}")
+    print(f"✅ Rescored {stats['shots']:,} shots against baseline {stats['baseline']} "
+          f"in {stats['seconds']:.2f}s ({stats['shots_per_sec']:,.0f} shots/s): "
+          f"{stats['updated']:,} updated for {stats['players']:,} players, "
+          f"{stats['skipped']:,} without a baseline"
+          + (" (dry run)" if args.dry_run else ""))
+
+
+if __name__ == "__main__":
+    main()
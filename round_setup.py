@@ -1,6 +1,8 @@
 import tkinter as tk
 from tkinter import messagebox
 from datetime import date
+import autocomplete
+import name_index
 
 # --- Azure Dark Palette (consistent with login.py) ---
 BG_PRIMARY   = "#0E1726"
@@ -33,11 +35,15 @@ def open_round_setup(logged_in_player):
             messagebox.showwarning("Missing Info", "Please fill in all fields.")
             return
 
+        # Use the spelling of a course or tee already played, so stats group them together
+        course = (name_index.courses.get(course) or (course,))[0]
+        tees = (name_index.tees.get(tees) or (tees,))[0]
+
         # Cache info only (no DB write)
         global round_info
         round_info = {
             "RoundID": None,  # to be assigned at the end
-            "PlayerID": logged_in_player["PlayerID"],
+            "PlayerID": int(logged_in_player["PlayerID"]),
             "PlayerName": logged_in_player["PlayerName"],
             "CoursePlayed": course,
             "RoundDate": round_date,
@@ -110,6 +116,10 @@ def open_round_setup(logged_in_player):
     date_entry = add_field("Date (YYYY-MM-DD):", str(date.today()))
     holes_entry = add_field("Holes Played:", "18")
     tees_entry = add_field("Tee Preference:", "Tips")
+    # Suggest courses and tees from earlier rounds, most played first
+    autocomplete.attach(course_entry, name_index.courses.search)
+    autocomplete.attach(tees_entry, name_index.tees.search)
+    course_entry.focus_set()
 
     # --- Save Button ---
     def on_hover(e): e.widget.config(bg=ACCENT_HOVER)
@@ -0,0 +1,188 @@
+import hashlib
+import itertools
+import json
+import sqlite3
+from datetime import date
+import analytics
+import db
+import metrics
+import name_index
+import queries
+import surfaces
+from db import DB_PATH
+from shot import ShotTable
+
+# FactShots columns written per shot, in insert order (RoundID is prepended)
+SHOT_COLUMNS = ("PlayerID", "Hole", "Par", "HoleResult", "Category", "SurfaceStart",
+                "DistanceStart", "SurfaceEnd", "DistanceEnd", "ClubUsed", "ShotShape",
+                "Penalty", "StrokesGained")
+
+INSERT_ROUND = """
+    INSERT INTO DimRound (PlayerID, CoursePlayed, RoundDate, HolesPlayed, TeePreference, RoundHash)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+# Surface codes (surfaces.SURFACES) stored after them; derived from the names, so not hashed
+CODE_COLUMNS = ("SurfaceStartCode", "SurfaceEndCode")
+INSERT_SHOT = f"""
+    INSERT INTO FactShots (RoundID, {", ".join(SHOT_COLUMNS + CODE_COLUMNS)})
+    VALUES ({", ".join("?" * (len(SHOT_COLUMNS) + len(CODE_COLUMNS) + 1))})
+"""
+_START, _END = SHOT_COLUMNS.index("SurfaceStart"), SHOT_COLUMNS.index("SurfaceEnd")
+
+# Stay well under SQLite's bound-parameter limit when checking hashes in bulk
+HASH_LOOKUP_CHUNK = 500
+
+
+def _shot_rows(shots):
+    if isinstance(shots, ShotTable):
+        return list(shots.rows(SHOT_COLUMNS))
+    return [tuple(map(s.get, SHOT_COLUMNS)) for s in shots]
+
+
+def insert_row(round_id, row):
+    """INSERT_SHOT parameters for one row of SHOT_COLUMNS values."""
+    return (round_id, *row, surfaces.code(row[_START]) or None, surfaces.code(row[_END]) or None)
+
+
+def _canonical(convert):
+    def canonical(value):
+        if value is None:
+            return None
+        try:
+            return convert(value)
+        except (TypeError, ValueError):
+            return str(value)  # malformed legacy value: hashed as text rather than failing the save
+    return canonical
+
+
+# The type each SHOT_COLUMNS value is hashed as: 400 and 400.0, or a numeric
+# string from an old import, are the same distance on every device
+_HASH_TYPES = tuple(float if name in ("DistanceStart", "DistanceEnd", "StrokesGained")
+                    else int if name in ("PlayerID", "Hole", "Par", "Penalty") else str
+                    for name in SHOT_COLUMNS)
+
+
+def _hash_column(values, kind):
+    if set(map(type, values)) <= {kind, type(None)}:
+        return values  # the usual case: already canonical, nothing converted per value
+    return list(map(_canonical(kind), values))
+
+
+def _hash_rows(round_info, rows):
+    # Canonical JSON, not pickle: the same bytes on every Python version and device,
+    # whatever types and key order the round arrived with. Shots are hashed column by column.
+    columns = zip(*rows) if rows else [()] * len(SHOT_COLUMNS)
+    payload = {"PlayerID": _canonical(int)(round_info.get("PlayerID")),
+               "CoursePlayed": _canonical(str)(round_info.get("CoursePlayed")),
+               "RoundDate": _canonical(str)(round_info.get("RoundDate")),
+               "Shots": {name: _hash_column(values, kind)
+                         for name, kind, values in zip(SHOT_COLUMNS, _HASH_TYPES, columns)}}
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+def round_hash(round_info, shots):
+    """Content hash of a round: who, where, when and every shot as entered."""
+    return _hash_rows(round_info, _shot_rows(shots))
+
+
+def rehash_rounds(conn):
+    """Recompute every DimRound.RoundHash from the stored shots (after a hash change).
+
+    A round whose hash matches an earlier round's is a duplicate saved under the
+    old hash; it keeps a NULL hash rather than being deleted.
+    """
+    rounds = {rid: {"PlayerID": pid, "CoursePlayed": course, "RoundDate": rdate}
+              for rid, pid, course, rdate in
+              conn.execute("SELECT RoundID, PlayerID, CoursePlayed, RoundDate FROM DimRound")}
+    shots = conn.execute(f"SELECT RoundID, {', '.join(SHOT_COLUMNS)} FROM FactShots "
+                         "ORDER BY RoundID, ShotID")
+    hashes = {}
+    for round_id, rows in itertools.groupby(shots, key=lambda row: row[0]):
+        if round_id in rounds:
+            hashes.setdefault(_hash_rows(rounds[round_id], [row[1:] for row in rows]), round_id)
+    conn.execute("UPDATE DimRound SET RoundHash = NULL")
+    conn.executemany("UPDATE DimRound SET RoundHash = ? WHERE RoundID = ?", hashes.items())
+
+
+def _existing_rounds(conn, hashes):
+    found = {}
+    hashes = list(hashes)
+    for i in range(0, len(hashes), HASH_LOOKUP_CHUNK):
+        chunk = hashes[i:i + HASH_LOOKUP_CHUNK]
+        rows = conn.execute(
+            f"SELECT RoundHash, RoundID FROM DimRound WHERE RoundHash IN ({','.join('?' * len(chunk))})",
+            chunk,
+        )
+        found.update(rows)
+    return found
+
+
+def _write_rounds(conn, prepared, known):
+    results = []
+    shot_rows = []
+    created_rounds = []
+    with conn:  # commits on success, rolls back every round in the batch on any error
+        for rhash, round_info, rows, shots in prepared:
+            if rhash in known:
+                results.append((known[rhash], False))
+                continue
+            player_id = round_info.get("PlayerID", rows[0][0])
+            round_date = round_info.get("RoundDate") or str(date.today())
+            round_id = conn.execute(INSERT_ROUND, (
+                player_id,
+                round_info.get("CoursePlayed"),
+                round_date,
+                len({row[1] for row in rows}),
+                round_info.get("TeePreference") or "Tips",
+                rhash,
+            )).lastrowid
+            known[rhash] = round_id
+            created_rounds.append(round_info)
+            shot_rows.extend(insert_row(round_id, row) for row in rows)
+            analytics.record_round(conn, round_id, player_id, round_date, shots)
+            results.append((round_id, True))
+        conn.executemany(INSERT_SHOT, shot_rows)
+    created = sum(new for _, new in results)
+    if created:
+        queries.invalidate()  # after the commit, so no reader re-caches the old rows
+        name_index.record_rounds(created_rounds)
+    metrics.count("rounds_saved", created)
+    metrics.count("rounds_already_saved", len(results) - created)
+    metrics.count("shots_saved", len(shot_rows))
+    return results
+
+
+@metrics.timed("save_rounds")
+def save_rounds(rounds, db_path=DB_PATH):
+    """Write many (round_info, shots) pairs in one transaction.
+
+    Rounds already in the database, or repeated within the batch, are not written
+    again (matched on content hash). Returns [(RoundID, created), ...] in input order.
+    """
+    prepared = []
+    for round_info, shots in rounds:
+        if not shots:
+            raise ValueError("A round needs at least one shot.")
+        rows = _shot_rows(shots)
+        prepared.append((_hash_rows(round_info, rows), round_info, rows, shots))
+    with db.connection("save_round", db_path) as conn:
+        hashes = {rhash for rhash, *_ in prepared}
+        known = _existing_rounds(conn, hashes)
+        try:
+            return _write_rounds(conn, prepared, dict(known))
+        except sqlite3.IntegrityError:
+            # Another device saved one of these rounds between our check and insert.
+            # Retry once against the refreshed hashes; anything else is a real error.
+            refreshed = _existing_rounds(conn, hashes)
+            if len(refreshed) == len(known):
+                raise
+            return _write_rounds(conn, prepared, refreshed)
+
+
+def save_round(round_info, shots, db_path=DB_PATH):
+    """Write the DimRound row and all of its shots in one transaction.
+
+    Saving the same round twice (same content hash) writes nothing the second
+    time. Returns (RoundID, created).
+    """
+    return save_rounds([(round_info, shots)], db_path)[0]
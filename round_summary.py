@@ -1,9 +1,12 @@
 import tkinter as tk
 from tkinter import messagebox
-import sqlite3
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
-from round_setup import round_info
+import charts
+import round_setup
+import sync_server
+from round_store import round_hash, save_round as store_round
+import journal
+from kpis import summarize_round, score_vs_par
+from ui_worker import BackgroundWorker
 
 # --- COLORS ---
 BG_COLOR = "#121a24"
@@ -11,7 +14,6 @@ CARD_BG = "#1f2b3a"
 TEXT_COLOR = "#e5e5e5"
 GREEN_TEXT = "#00B050"
 RED_TEXT = "#FF5C5C"
-DB_PATH = "shots_gained.db"
 # --- Microsoft Azure Dark Palette ---
 BG_PRIMARY   = "#0E1726"
 CARD_BG2      = "#1E293B"
@@ -38,52 +40,14 @@ def open_summary_screen(shots):
     center_window(window, 900, 700)
 
     # --- Aggregate Round Data ---
-    total_strokes = 0
-    total_par = 0
-    fairways_hit = 0
-    greens_hit = 0
-    total_sg = 0
-
-
-    holes = {}
-    for shot in shots:
-        hole = shot["Hole"]
-        holes.setdefault(hole, []).append(shot)
-
-    for hole, shots_list in holes.items():
-        if not shots_list:
-            continue
-
-        if shots_list:
-            par = int(shots_list[0].get("Par", 0) or 0)
-            total_par += par
-            strokes = len(shots_list) + sum(s.get("Penalty", 0) for s in shots_list)
-            total_strokes += strokes
-            total_sg += sum(s.get("StrokesGained", 0) or 0 for s in shots_list)
-
-        # --- Fairway Hit Logic ---
-        first = shots_list[0]
-        if first.get("Category") == "Driving" and not first.get("Penalty"):
-            if par >= 4 and first.get("SurfaceEnd") in ("Fairway", "Green","Hole"):
-                fairways_hit += 1
-
-        # --- Green in Regulation Logic ---
-        strokes_to_green = next((i + 1 for i, s in enumerate(shots_list)
-                                 if s.get("SurfaceEnd") in ( "Green","Hole")), None)
-        if strokes_to_green and strokes_to_green <= (par - 2):
-            greens_hit += 1
-
-    # --- Totals ---
-    if total_strokes - total_par > 0:
-        score_vs_par = f"+{total_strokes-total_par}"
-    elif total_strokes - total_par < 0:
-        score_vs_par = f"-{total_par-total_strokes}"
-    else:
-        score_vs_par = "E"
-
-    holes_played = len(holes)
+    kpis = summarize_round(shots)
+    total_strokes, total_par = kpis["strokes"], kpis["par"]
+    total_sg = kpis["sg_total"]
+    score_display = score_vs_par(total_strokes, total_par)
+
+    holes_played = kpis["holes"]
+    greens_hit, fairways_hit, fir_eligible = kpis["greens_hit"], kpis["fairways_hit"], kpis["fairways_eligible"]
     gir_pct = (greens_hit / holes_played * 100) if holes_played else 0
-    fir_eligible = sum(1 for h, s in holes.items() if s and s[0].get("Par", 0) >= 4)
     fir_pct = (fairways_hit / fir_eligible * 100) if fir_eligible else 0
 
     gir_display = f"{greens_hit}/{holes_played} ({gir_pct:.0f}%)"
@@ -104,7 +68,7 @@ def open_summary_screen(shots):
         return val_label
 
     lbl_total_sg = kpi_chip(kpi_frame, "Total SG", f"{total_sg:+.2f}")
-    lbl_score_par = kpi_chip(kpi_frame, "Score vs Par", f"{score_vs_par}")
+    lbl_score_par = kpi_chip(kpi_frame, "Score vs Par", score_display)
     kpi_chip(kpi_frame, "Fairways Hit", fir_display)
     kpi_chip(kpi_frame, "Greens in Reg", gir_display)
 
@@ -115,77 +79,57 @@ def open_summary_screen(shots):
     lbl_total_sg.config(fg=sg_color)
 
     # --- SG by Category Chart ---
-    categories = ["Driving", "Approach", "Short Game", "Putting"]
-    sg_by_cat = {cat: 0 for cat in categories}
-    for s in shots:
-        cat = s.get("Category")
-        if cat in sg_by_cat and s["StrokesGained"] is not None:
-            sg_by_cat[cat] += s["StrokesGained"]
-
-    fig, ax = plt.subplots(figsize=(7, 4), facecolor=BG_COLOR)
-    values = list(sg_by_cat.values())
-    bars = ax.barh(categories, list(sg_by_cat.values()),
-                   color=[GREEN_TEXT if v > 0 else RED_TEXT if v < 0 else TEXT_COLOR
-                          for v in sg_by_cat.values()])
-    ax.set_facecolor(BG_COLOR)
-    ax.tick_params(colors=TEXT_COLOR)
-    ax.spines[:].set_color(TEXT_COLOR)
-    ax.set_xlabel("Strokes Gained", color=TEXT_COLOR, fontsize=11)
-    ax.margins(x=0.15)  # adds space left/right so labels don’t get clipped
-    plt.subplots_adjust(left=0.25, right=0.95, top=0.92, bottom=0.15)  # fine-tuned padding
-
-    ax.axvline(0, color=TEXT_COLOR, linestyle="--", linewidth=1, alpha=0.6)
-
-    # --- White numeric labels on bars ---
-    for bar, val in zip(bars, values):
-        xpos = bar.get_width()
-        ax.text(
-            xpos + (0.05 if xpos >= 0 else -0.05),
-            bar.get_y() + bar.get_height() / 2,
-            f"{val:+.2f}",
-            va="center",
-            ha="left" if xpos >= 0 else "right",
-            color="white",
-            fontsize=10,
-            fontweight="bold"
-        )
-
+    # Usually pre-rendered while the "Round Complete" dialog was up; see charts.prerender
+    png = charts.round_chart(round_hash(round_setup.round_info, shots), kpis["sg_by_category"])
+    chart_image = charts.photo_image(window, png)
     chart_frame = tk.Frame(window, bg=BG_COLOR)
     chart_frame.pack(pady=15)
-    canvas = FigureCanvasTkAgg(fig, master=chart_frame)
-    canvas.draw()
-    canvas.get_tk_widget().pack()
+    chart_label = tk.Label(chart_frame, image=chart_image, bg=BG_COLOR, bd=0)
+    chart_label.image = chart_image  # Tk drops images nothing in Python references
+    chart_label.pack()
 
     # --- Save Function ---
-    def save_round():
+    worker = BackgroundWorker(window)
+
+    def on_saved(result):
+        (round_id, created), upload = result
+        if created:
+            message = "✅ Round successfully saved to database!"
+        else:
+            message = f"Round already saved (RoundID {round_id})."
+        if isinstance(upload, Exception):
+            message += f"\n\nNot uploaded to the sync server ({upload}); it will be sent with the next round."
+        elif upload:
+            message += f"\n\n✅ Uploaded {upload['pushed']} round(s) to the sync server."
+        messagebox.showinfo("Round Saved", message)
+        worker.stop()
+        window.destroy()
+
+    def on_save_failed(e):
+        save_btn.config(state="normal", text="Save Round")
+        messagebox.showerror("Error", f"Database save failed:\n{e}")
+
+    def store_and_clear_journal(round_info, shots):
+        result = store_round(round_info, shots)
+        journal.clear(round_info["PlayerID"])  # compacted into FactShots; nothing left to replay
+        return result, upload_pending()
+
+    def upload_pending():
+        """Push this and any earlier unsent rounds when a sync server is configured."""
+        if not sync_server.SYNC_URL:
+            return None
         try:
-            conn = sqlite3.connect(DB_PATH)
-            c = conn.cursor()
-
-            # Save DimRound if not already in DB
-            c.execute("""
-                INSERT INTO DimRound (PlayerID, CoursePlayed, RoundDate, HolesPlayed, TeePreference)
-                VALUES (?, ?, date('now'), ?, 'Tips')
-            """, (shots[0]["PlayerID"], round_info["CoursePlayed"], len(holes)))
-            round_id = c.lastrowid
-
-            for s in shots:
-                c.execute("""
-                    INSERT INTO FactShots
-                    (PlayerID, RoundID, Hole, Par, HoleResult, Category, SurfaceStart, DistanceStart,
-                     SurfaceEnd, DistanceEnd, ClubUsed, ShotShape, Penalty, StrokesGained)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (s["PlayerID"], round_id, s["Hole"], s.get("Par"), s.get("HoleResult"),
-                      s["Category"], s["SurfaceStart"], s["DistanceStart"], s["SurfaceEnd"],
-                      s["DistanceEnd"], s["ClubUsed"], s["ShotShape"], s["Penalty"], s["StrokesGained"]))
-            conn.commit()
-            conn.close()
-
-            messagebox.showinfo("Round Saved", "✅ Round successfully saved to database!")
-            window.destroy()
-
+            return sync_server.push_pending()
         except Exception as e:
-            messagebox.showerror("Error", f"Database save failed:\n{e}")
+            # Best effort after the local commit: a bad response must not read as a failed save
+            print(f"❌ Sync upload failed: {e!r}")
+            return e  # saved locally either way; the next push retries
+
+    def save_round():
+        # The write runs on the worker thread; the window keeps repainting meanwhile
+        save_btn.config(state="disabled", text="Saving…")
+        worker.submit(store_and_clear_journal, round_setup.round_info, shots, on_done=on_saved,
+                      on_error=on_save_failed, timing="ui_save_round")
 
     # --- Save Button ---
     save_btn = tk.Button(
@@ -0,0 +1,76 @@
+import numpy as np
+import metrics
+import surfaces
+from baseline import group_by_baseline
+
+# --- Vocabulary offered by the shot-entry form ---
+CATEGORIES = ["Driving", "Approach", "Short Game", "Putting"]
+START_SURFACES = surfaces.START_SURFACES
+END_SURFACES = surfaces.END_SURFACES
+
+
+def determine_hole_result(par, num, penalties):
+    total = num + penalties
+    diff = total - par
+    return (
+        "Eagle" if diff <= -2 else
+        "Birdie" if diff == -1 else
+        "Par" if diff == 0 else
+        "Bogey" if diff == 1 else
+        "Double Bogey" if diff == 2 else
+        f"Other (+{diff})"
+    )
+
+
+@metrics.timed("score_shots")
+def score_shots(baseline, shots):
+    """Fill StrokesGained on a list of shot dicts with one vectorized baseline call.
+
+    Shots whose surfaces have no baseline keep any StrokesGained they already carry.
+    Returns the indexes of shots that could not be scored at all.
+    """
+    if not shots:
+        return []
+    sg = baseline.strokes_gained(
+        [s["SurfaceStart"] for s in shots],
+        [s["DistanceStart"] for s in shots],
+        [s["SurfaceEnd"] for s in shots],
+        [np.nan if s["DistanceEnd"] is None else s["DistanceEnd"] for s in shots],
+        [s["Penalty"] for s in shots],
+    )
+    unscored = []
+    for i, (shot, val) in enumerate(zip(shots, sg.tolist())):
+        if val == val:  # not NaN
+            shot["StrokesGained"] = val
+        elif shot.get("StrokesGained") is None:
+            unscored.append(i)
+    return unscored
+
+
+def score_shots_by_player(default, overrides, shots):
+    """score_shots with each player's shots against their own baseline.
+
+    `overrides` maps PlayerID -> Baseline (baseline.player_baselines); everyone
+    else is scored against `default`.
+    """
+    if not overrides:
+        return score_shots(default, shots)
+    unscored = []
+    for baseline, rows in group_by_baseline([s["PlayerID"] for s in shots], default, overrides):
+        rows = rows.tolist()
+        unscored += [rows[i] for i in score_shots(baseline, [shots[i] for i in rows])]
+    return sorted(unscored)
+
+
+def assign_hole_results(shots):
+    """Set HoleResult on every shot from its hole's par, shot count and penalties."""
+    holes = {}
+    for s in shots:
+        holes.setdefault(s["Hole"], []).append(s)
+    for hole_shots in holes.values():
+        par = hole_shots[0].get("Par")
+        if not par:
+            continue
+        res = determine_hole_result(par, len(hole_shots), sum(s["Penalty"] for s in hole_shots))
+        for s in hole_shots:
+            s["HoleResult"] = res
@@ -0,0 +1,276 @@
+"""End-of-season processing in parallel: rescore, aggregate and report per player.
+
+FactShots is partitioned by PlayerID into groups of similar size. Each group goes
+to a worker process, which reads its players' shots, rescores them, rolls them up
+into round and season KPIs and renders each player's report. The parent merges
+the results in ShotID/RoundID/PlayerID order, so the output never depends on which
+worker finished first. The parent is also the only writer:
+
+    python season_pipeline.py --workers 8 --reports reports/
+    python season_pipeline.py --baseline baselines/tour.sgb --season 2025 --dry-run
+"""
+import argparse
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import analytics
+import queries
+from baseline import get_baseline, load_baseline, load_named, player_baseline_names, strokes_gained_by_player
+from db import DB_PATH
+from kpis import summarize_rounds
+from migrations import migrate
+from rescore import UPDATE_SG
+
+# --- CONFIG ---
+WORKERS = os.cpu_count() or 1
+PARTITIONS_PER_WORKER = 4  # smaller partitions even out players with very different volumes
+PLAYER_CHUNK = 500  # PlayerIDs per IN (...) list
+
+SELECT_SHOTS = """
+    SELECT s.ShotID, s.RoundID, s.PlayerID, s.Hole, s.Par, s.Category, s.SurfaceStart,
+           s.DistanceStart, s.SurfaceEnd, s.DistanceEnd, s.Penalty, s.StrokesGained
+    FROM FactShots s WHERE s.PlayerID IN ({})
+"""
+SELECT_ROUNDS = "SELECT RoundID, PlayerID, RoundDate FROM DimRound WHERE PlayerID IN ({})"
+
+# Report colours, matching the round summary screen
+BG_COLOR = "#121a24"
+TEXT_COLOR = "#e5e5e5"
+GREEN_TEXT = "#00B050"
+RED_TEXT = "#FF5C5C"
+
+
+# --- Partitioning ---
+def player_shot_counts(conn):
+    return conn.execute("SELECT PlayerID, COUNT(*) FROM FactShots "
+                        "GROUP BY PlayerID ORDER BY PlayerID").fetchall()
+
+
+def partition_players(counts, parts):
+    """Split [(PlayerID, shots)] into at most `parts` groups of similar total shots.
+
+    Largest players are placed first, each into the currently lightest group
+    (ties to the lowest index), so the split is the same on every run.
+    """
+    groups = [[] for _ in range(max(1, min(parts, len(counts))))]
+    loads = [0] * len(groups)
+    for player_id, shots in sorted(counts, key=lambda c: (-c[1], c[0])):
+        i = loads.index(min(loads))
+        groups[i].append(player_id)
+        loads[i] += shots
+    return [sorted(g) for g in groups if g]
+
+
+# --- Worker ---
+_worker_baseline = None
+
+
+def _init_worker(baseline_source):
+    # Once per process; a compiled .sgb baseline is mapped, not parsed
+    global _worker_baseline
+    _worker_baseline = load_baseline(baseline_source)
+
+
+def _fetch(conn, sql, player_ids):
+    rows = []
+    for i in range(0, len(player_ids), PLAYER_CHUNK):
+        chunk = player_ids[i:i + PLAYER_CHUNK]
+        rows.extend(conn.execute(sql.format(",".join("?" * len(chunk))), chunk))
+    return rows
+
+
+def render_report(path, player_id, season, kpis, round_sg):
+    """Season report PNG: SG by category and SG per round. Uses the Agg backend, no pyplot."""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize=(9, 4), facecolor=BG_COLOR)
+    FigureCanvasAgg(fig)
+    by_cat, trend = fig.subplots(1, 2)
+    for ax in (by_cat, trend):
+        ax.set_facecolor(BG_COLOR)
+        ax.tick_params(colors=TEXT_COLOR)
+        ax.spines[:].set_color(TEXT_COLOR)
+
+    cats = list(kpis["sg_by_category"])
+    values = list(kpis["sg_by_category"].values())
+    by_cat.barh(cats, values, color=[GREEN_TEXT if v > 0 else RED_TEXT if v < 0 else TEXT_COLOR
+                                     for v in values])
+    by_cat.axvline(0, color=TEXT_COLOR, linestyle="--", linewidth=1, alpha=0.6)
+    by_cat.set_title("SG by category", color=TEXT_COLOR)
+
+    trend.plot(range(1, len(round_sg) + 1), round_sg, color=GREEN_TEXT, marker="o", markersize=3)
+    trend.axhline(0, color=TEXT_COLOR, linestyle="--", linewidth=1, alpha=0.6)
+    trend.set_title("SG per round", color=TEXT_COLOR)
+
+    fig.suptitle(f"Player {player_id} · {season} · {kpis['rounds']} rounds · "
+                 f"SG {kpis['sg_total']:+.2f} · {kpis['score_vs_par']}", color=TEXT_COLOR)
+    fig.subplots_adjust(left=0.14, right=0.97, wspace=0.3)
+    fig.savefig(path, facecolor=BG_COLOR)
+
+
+def process_partition(task):
+    """Rescore, aggregate and report one group of players. Runs in a worker process.
+
+    `baseline_names` maps the group's players that have their own baseline to its
+    name; the rest are scored against the pipeline baseline. Returns plain data
+    only: changed (ShotID, SG) pairs, AggRound rows and per-player season KPIs,
+    each sorted by its key.
+    """
+    index, db_path, player_ids, baseline_names, season, report_dir = task
+    overrides = {pid: get_baseline(name) for pid, name in baseline_names.items()}  # mapped once per process
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        shots = _fetch(conn, SELECT_SHOTS, player_ids)
+        rounds = {rid: (pid, rdate) for rid, pid, rdate in _fetch(conn, SELECT_ROUNDS, player_ids)}
+    finally:
+        conn.close()
+
+    stats = {"partition": index, "players": len(player_ids), "shots": len(shots),
+             "updated": 0, "skipped": 0}
+    if not shots:
+        return stats, np.zeros(0, dtype=np.int64), np.zeros(0), [], {}
+    (shot_ids, round_ids, shot_players, hole, par, category, surf_start, dist_start, surf_end, dist_end,
+     penalty, old_sg) = zip(*shots)
+
+    # --- Rescore (as rescore.py: unscorable shots keep their stored SG) ---
+    shot_ids = np.array(shot_ids, dtype=np.int64)
+    penalty = np.array([p or 0 for p in penalty], dtype=np.int64)
+    old_sg = np.array(old_sg, dtype=float)
+    new_sg = strokes_gained_by_player(_worker_baseline, overrides, shot_players, surf_start, dist_start,
+                                      surf_end, np.array(dist_end, dtype=float), penalty)
+    scorable = ~np.isnan(new_sg)
+    changed = scorable & ~np.isclose(new_sg, old_sg, rtol=0, atol=1e-9)
+    sg = np.where(changed, new_sg, old_sg)  # exactly what ends up stored
+    stats["updated"] = int(changed.sum())
+    stats["skipped"] = int((~scorable).sum())
+
+    # --- Round and season KPIs over the rescored values, shots in played order ---
+    order = np.lexsort((shot_ids, np.array(round_ids, dtype=np.int64)))
+    summaries = summarize_rounds({
+        "RoundID": np.array(round_ids, dtype=np.int64)[order],
+        "Hole": np.array(hole, dtype=np.int64)[order],
+        "Par": np.array([p or 0 for p in par], dtype=np.int64)[order],
+        "Category": np.array([c or "" for c in category], dtype=str)[order],
+        "SurfaceEnd": np.array([e or "" for e in surf_end], dtype=str)[order],
+        "Penalty": penalty[order],
+        "StrokesGained": sg[order],
+    })
+    agg_rows = analytics.agg_round_rows(summaries, rounds)
+
+    players = {}
+    for row in sorted(agg_rows, key=lambda r: (r[1], r[2] or "", r[0])):  # player, date, round
+        if season is None or row[3] == season:
+            players.setdefault(row[1], []).append(row)
+    reports = {}
+    for player_id, rows in players.items():
+        sums = [sum(col) for col in zip(*(r[4:] for r in rows))]
+        kpis = analytics.kpis_from_sums(len(rows), sums)
+        if report_dir:
+            kpis["report"] = os.path.join(report_dir, f"player_{player_id}_{season or 'all'}.png")
+            render_report(kpis["report"], player_id, season or "all seasons", kpis,
+                          [r[10] for r in rows])  # SGTotal
+        reports[player_id] = kpis
+
+    idx = np.flatnonzero(changed)
+    return stats, shot_ids[idx], new_sg[idx], agg_rows, reports
+
+
+# --- Pipeline ---
+def latest_season(conn):
+    row = conn.execute("SELECT MAX(RoundDate) FROM DimRound").fetchone()
+    return analytics.season_of(row[0]) if row and row[0] else None
+
+
+def run_season(db_path=DB_PATH, baseline_source=None, season=None, workers=WORKERS,
+               report_dir=None, dry_run=False, partitions=None):
+    """Run the whole pipeline. Returns (stats, {PlayerID: season KPIs}).
+
+    workers=1 runs every partition in this process, without a pool.
+    """
+    baseline_source = baseline_source or db_path
+    started = time.perf_counter()
+    conn = sqlite3.connect(db_path)
+    try:
+        season = season or latest_season(conn)
+        groups = partition_players(player_shot_counts(conn),
+                                   partitions or workers * PARTITIONS_PER_WORKER)
+    finally:
+        conn.close()
+    # Players on a named baseline; a missing file is reported and they get the pipeline baseline
+    names = player_baseline_names(db_path)
+    _, missing = load_named(names.values())
+    names = {pid: name for pid, name in names.items() if name not in missing}
+    if report_dir:
+        os.makedirs(report_dir, exist_ok=True)
+
+    tasks = [(i, db_path, g, {pid: names[pid] for pid in g if pid in names}, season, report_dir)
+             for i, g in enumerate(groups)]
+    if workers > 1:
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(baseline_source,)) as pool:
+            results = list(pool.map(process_partition, tasks))  # in task order, not finish order
+    else:
+        _init_worker(baseline_source)
+        results = [process_partition(t) for t in tasks]
+
+    # --- Deterministic merge ---
+    shot_ids = np.concatenate([r[1] for r in results] or [np.zeros(0, dtype=np.int64)])
+    new_sg = np.concatenate([r[2] for r in results] or [np.zeros(0)])
+    by_shot = np.argsort(shot_ids, kind="stable")
+    agg_rows = sorted((row for r in results for row in r[3]), key=lambda row: row[0])
+    reports = dict(sorted((pid, k) for r in results for pid, k in r[4].items()))
+
+    stats = {"baseline": load_baseline(baseline_source).version, "season": season, "workers": workers,
+             "partitions": len(groups), "players": sum(r[0]["players"] for r in results),
+             "shots": sum(r[0]["shots"] for r in results),
+             "updated": len(shot_ids), "skipped": sum(r[0]["skipped"] for r in results),
+             "missing_baselines": missing}
+    stats["compute_seconds"] = time.perf_counter() - started
+
+    if not dry_run:
+        conn = sqlite3.connect(db_path)
+        try:
+            with conn:  # one transaction for SG and both aggregate tables
+                conn.executemany(UPDATE_SG, zip(new_sg[by_shot].tolist(), shot_ids[by_shot].tolist()))
+                analytics.replace_all(conn, agg_rows)
+        finally:
+            conn.close()
+        queries.invalidate()
+    if report_dir:
+        with open(os.path.join(report_dir, f"season_{season or 'all'}.json"), "w", encoding="utf-8") as f:
+            json.dump({"stats": stats, "players": reports}, f, indent=2)
+
+    stats["seconds"] = time.perf_counter() - started
+    stats["shots_per_sec"] = stats["shots"] / stats["seconds"] if stats["seconds"] else 0.0
+    return stats, reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel end-of-season rescoring, aggregation and reports.")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--baseline", help="baseline .sgb, .csv or database (default: DimAvg in --db)")
+    parser.add_argument("--season", help="season to report on (default: latest)")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--reports", help="directory for per-player PNG reports and a season JSON")
+    parser.add_argument("--dry-run", action="store_true", help="compute and report, write nothing to the DB")
+    args = parser.parse_args()
+
+    migrate(args.db)
+    stats, reports = run_season(args.db, args.baseline, args.season, args.workers,
+                                args.reports, args.dry_run)
+    for message in stats["missing_baselines"].values():
+        print(f"↪ {message}; those players were scored against {stats['baseline']}")
+    print(f"✅ Season {stats['season']}: {stats['players']:,} players, {stats['shots']:,} shots "
+          f"in {stats['seconds']:.2f}s on {stats['workers']} workers "
+          f"({stats['shots_per_sec']:,.0f} shots/s): {stats['updated']:,} SG updated, "
+          f"{stats['skipped']:,} without a baseline" + (" (dry run)" if args.dry_run else ""))
+    if args.reports:
+        print(f"✅ {len(reports):,} player reports in {args.reports}")
+
+
+if __name__ == "__main__":
+    main()
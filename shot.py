@@ -0,0 +1,196 @@
+"""Compact shot records.
+
+Shot is the add_shot record as a __slots__ object: same field names, a fraction of a
+dict's memory, and still readable with shot["Category"] / shot.get("Par") so code
+written against the old dicts keeps working.
+
+ShotTable stores many shots column by column in typed arrays, with surfaces,
+categories and other repeated strings kept as small integer codes.
+"""
+import math
+from array import array
+import numpy as np
+import surfaces
+from scoring import CATEGORIES
+
+FIELDS = ("PlayerID", "RoundID", "Hole", "Par", "Category", "SurfaceStart", "DistanceStart",
+          "SurfaceEnd", "DistanceEnd", "ClubUsed", "ShotShape", "Penalty", "StrokesGained",
+          "HoleResult")
+
+
+class Shot:
+    __slots__ = FIELDS
+
+    def __init__(self, PlayerID=None, RoundID=None, Hole=None, Par=None, Category=None,
+                 SurfaceStart=None, DistanceStart=None, SurfaceEnd=None, DistanceEnd=None,
+                 ClubUsed="", ShotShape="", Penalty=0, StrokesGained=None, HoleResult=None):
+        self.PlayerID = PlayerID
+        self.RoundID = RoundID
+        self.Hole = Hole
+        self.Par = Par
+        self.Category = Category
+        self.SurfaceStart = SurfaceStart
+        self.DistanceStart = DistanceStart
+        self.SurfaceEnd = SurfaceEnd
+        self.DistanceEnd = DistanceEnd
+        self.ClubUsed = ClubUsed
+        self.ShotShape = ShotShape
+        self.Penalty = Penalty
+        self.StrokesGained = StrokesGained
+        self.HoleResult = HoleResult
+
+    # --- dict-style access ---
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        if key not in FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in FIELDS else default
+
+    def to_dict(self):
+        return {f: getattr(self, f) for f in FIELDS}
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(**{f: d[f] for f in FIELDS if f in d})
+
+    def __eq__(self, other):
+        return isinstance(other, Shot) and all(getattr(self, f) == getattr(other, f) for f in FIELDS)
+
+    def __repr__(self):
+        return f"Shot({', '.join(f'{f}={getattr(self, f)!r}' for f in FIELDS)})"
+
+
+class Vocabulary:
+    """String <-> small int codes for one categorical column. Code 0 is None."""
+
+    __slots__ = ("values", "codes")
+
+    def __init__(self, values=()):
+        self.values = [None]
+        self.codes = {None: 0}
+        for v in values:
+            self.code(v)
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+# column -> array typecode; None is stored as 0 for ids/par and NaN for floats
+NUMERIC_COLUMNS = {"PlayerID": "q", "RoundID": "q", "Hole": "h", "Par": "b", "Penalty": "b",
+                   "DistanceStart": "d", "DistanceEnd": "d", "StrokesGained": "d"}
+CATEGORICAL_COLUMNS = ("Category", "SurfaceStart", "SurfaceEnd", "ClubUsed", "ShotShape",
+                       "HoleResult")
+
+
+def _number(val, typecode):
+    """A value for a NUMERIC_COLUMNS array. Numeric strings ("12" from a form) are accepted."""
+    if typecode == "d":
+        return math.nan if val is None else float(val)
+    return 0 if val is None else int(val)
+
+
+class ShotTable:
+    """Column-oriented collection of shots. Appends, iterates and indexes like a list of Shot."""
+
+    def __init__(self, shots=()):
+        self.columns = {col: array(code) for col, code in NUMERIC_COLUMNS.items()}
+        self.columns.update({col: array("B") for col in CATEGORICAL_COLUMNS})
+        # Seeded in registry order, so surface codes here are surfaces.SURFACES codes
+        surface_vocab = Vocabulary(s.name for s in surfaces.SURFACES)
+        self.vocab = {
+            "Category": Vocabulary(CATEGORIES),
+            "SurfaceStart": surface_vocab,
+            "SurfaceEnd": surface_vocab,  # one surface vocabulary, so start/end codes compare directly
+            "ClubUsed": Vocabulary(),
+            "ShotShape": Vocabulary(),
+            "HoleResult": Vocabulary(),
+        }
+        self.extend(shots)
+
+    def __len__(self):
+        return len(self.columns["Hole"])
+
+    def append(self, shot):
+        get = shot.get
+        for col, typecode in NUMERIC_COLUMNS.items():
+            self.columns[col].append(_number(get(col), typecode))
+        for col in CATEGORICAL_COLUMNS:
+            self._set_code(col, None, self.vocab[col].code(get(col)))
+
+    def _set_code(self, col, i, code):
+        column = self.columns[col]
+        if code > 255 and column.typecode == "B":
+            # More than 255 distinct values (free-text clubs, say): widen to 16-bit codes
+            column = self.columns[col] = array("H", column)
+        if i is None:
+            column.append(code)
+        else:
+            column[i] = code
+
+    def extend(self, shots):
+        for s in shots:
+            self.append(s)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        values = {}
+        for col, typecode in NUMERIC_COLUMNS.items():
+            val = self.columns[col][i]
+            if typecode == "d":
+                values[col] = None if math.isnan(val) else val
+            else:
+                values[col] = val or None if col in ("PlayerID", "RoundID", "Par") else val
+        for col in CATEGORICAL_COLUMNS:
+            values[col] = self.vocab[col].values[self.columns[col][i]]
+        return Shot(**values)
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def __setitem__(self, i, shot):
+        # Rare (editing a saved shot): rebuild that row in place
+        for col, typecode in NUMERIC_COLUMNS.items():
+            self.columns[col][i] = _number(shot.get(col), typecode)
+        for col in CATEGORICAL_COLUMNS:
+            self._set_code(col, i, self.vocab[col].code(shot.get(col)))
+
+    def clear(self):
+        for col in self.columns.values():
+            del col[:]
+
+    def rows(self, columns):
+        """Yield tuples of the given columns with Python values (for executemany)."""
+        return (tuple(map(shot.get, columns)) for shot in self)
+
+    def to_columns(self):
+        """Columns for kpis.summarize_rounds, read straight from the array buffers."""
+        def view(col, dtype):
+            column = self.columns[col]
+            return np.frombuffer(column, dtype=column.typecode).astype(dtype, copy=False)
+
+        def decode(col):
+            labels = np.array([v or "" for v in self.vocab[col].values], dtype=str)
+            return labels[view(col, np.intp)]
+
+        return {
+            "RoundID": view("RoundID", np.int64),
+            "Hole": view("Hole", np.int64),
+            "Par": view("Par", np.int64),
+            "Category": decode("Category"),
+            "SurfaceEnd": decode("SurfaceEnd"),
+            "Penalty": view("Penalty", np.int64),
+            "StrokesGained": view("StrokesGained", float),
+        }
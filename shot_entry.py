@@ -1,7 +1,15 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import sqlite3
-from round_setup import round_info
+import charts
+import metrics
+import round_setup
+from baseline import get_baseline, get_player_baseline
+from scoring import CATEGORIES, START_SURFACES, END_SURFACES, determine_hole_result
+from journal import ShotJournal, journal_path
+from kpis import summarize_round
+from round_store import round_hash
+from shot import Shot, ShotTable
+from ui_worker import BackgroundWorker
 
 # --- Azure Dark Palette ---
 BG_PRIMARY   = "#0E1726"
@@ -16,60 +24,105 @@ FIELD_BORDER = "#2D3E55"
 GREEN_TEXT   = "#13A10E"
 RED_TEXT     = "#C50F1F"
 
-DB_PATH = "shots_gained.db"
-cached_shots = []
+cached_shots = ShotTable()  # every saved hole of the round, column by column
 
 def center_window(win, w, h):
     sw, sh = win.winfo_screenwidth(), win.winfo_screenheight()
     x, y = (sw - w) // 2, (sh - h) // 2
     win.geometry(f"{w}x{h}+{x}+{y}")
 
-def open_shot_entry():
-    """Shot entry window, Azure dark with grid layout and cached data only."""
+def open_shot_entry(resume=None):
+    """Shot entry window, Azure dark with grid layout and cached data only.
+
+    Every event is journaled as it happens; `resume` is a journal.replay() state
+    to carry on a round that was interrupted.
+    """
+    round_info = round_setup.round_info  # read at open time, after round setup has filled it
     hole_num = 1
     shots_this_hole = []
     last_surface, last_distance = None, None
+    journal = ShotJournal(journal_path(round_info["PlayerID"]), resume=resume is not None)
+    if resume is None:
+        journal.start_round(round_info)
+    else:
+        hole_num = resume["hole"]
+        shots_this_hole = resume["current"]
+        cached_shots.extend(resume["saved"])
+        if shots_this_hole:
+            last = shots_this_hole[-1]
+            last_surface, last_distance = last.SurfaceEnd, "" if last.DistanceEnd is None else str(last.DistanceEnd)
+    baseline_cache = []
 
     # --- FUNCTIONS ---
-    def calculate_strokes_gained():
-        """Compute SG live (no DB write)."""
+    def current_baseline():
+        """(baseline, warning or None). Loaded once, on the worker thread, not per keystroke."""
+        if not baseline_cache:
+            try:
+                baseline_cache.append((get_player_baseline(round_info["PlayerID"]), None))
+            except ValueError as e:
+                baseline_cache.append((get_baseline(), f"{e}\nScoring against the tour baseline instead."))
+        return baseline_cache[0]
+
+    def warn_baseline(result):
+        if result[1]:
+            messagebox.showwarning("Baseline", result[1])
+
+    def read_shot_fields():
+        """Form values the SG calculation needs, or None while the surfaces are unset."""
+        surf_start = surface_start_dd.get()
+        surf_end = surface_end_dd.get()
+        if not surf_start or not surf_end:
+            return None
+        dist_start = float(distance_start_entry.get())
+        dist_end = None if surf_end == "Hole" else float(distance_end_entry.get())
+        return surf_start, dist_start, surf_end, dist_end, penalty_var.get()
+
+    def compute_sg(surf_start, dist_start, surf_end, dist_end, penalty):
+        """(SG, None) or (None, message). Pure, so it can run on the worker thread."""
+        with metrics.timer("sg_calc"):
+            return sg_for(current_baseline()[0], surf_start, dist_start, surf_end, dist_end, penalty)
+
+    def sg_for(baseline, surf_start, dist_start, surf_end, dist_end, penalty):
+        start_val = baseline.lookup(surf_start, dist_start)
+        if start_val is None:
+            return None, "Start Avg Missing"
+        if surf_end == "Hole":
+            end_val = 0
+        else:
+            end_val = baseline.lookup(surf_end, dist_end)
+            if end_val is None:
+                return None, "End Avg Missing"
+        sg_val = start_val - (1 + end_val)
+        if penalty:
+            sg_val -= 1
+        return sg_val, None
+
+    def show_sg(result):
+        sg_val, error = result
+        if error:
+            sg_label.config(text=error, fg=RED_TEXT)
+            return
+        color = GREEN_TEXT if sg_val > 0 else RED_TEXT if sg_val < 0 else TEXT_COLOR
+        sg_label.config(text=f"Strokes Gained: {sg_val:+.2f}", bg = "#2D3E55", fg=color)
+        sg_label.sg_value = sg_val
+
+    def show_sg_error(e):
+        sg_label.config(text=f"Error: {e}", fg=RED_TEXT)
+
+    def calculate_strokes_gained(debounce=False):
+        """Compute SG live (no DB write) on the worker; keystrokes are debounced."""
         try:
-            surf_start = surface_start_dd.get()
-            surf_end = surface_end_dd.get()
-            if not surf_start or not surf_end:
-                return
-            dist_start = float(distance_start_entry.get())
+            fields = read_shot_fields()
         except ValueError:
             sg_label.config(text="Strokes Gained: --", fg=TEXT_COLOR)
             return
-        try:
-            conn = sqlite3.connect(DB_PATH)
-            c = conn.cursor()
-            c.execute("SELECT TourAvg FROM DimAvg WHERE Surface=? AND Distance=?", (surf_start, int(dist_start)))
-            start_row = c.fetchone()
-            if not start_row:
-                sg_label.config(text="Start Avg Missing", fg=RED_TEXT)
-                return
-            if surf_end == "Hole":
-                end_val = 0
-            else:
-                dist_end = float(distance_end_entry.get())
-                c.execute("SELECT TourAvg FROM DimAvg WHERE Surface=? AND Distance=?", (surf_end, int(dist_end)))
-                end_row = c.fetchone()
-                if not end_row:
-                    sg_label.config(text="End Avg Missing", fg=RED_TEXT)
-                    return
-                end_val = end_row[0]
-            sg_val = start_row[0] - (1 + end_val)
-            if penalty_var.get():
-                sg_val -= 1
-            color = GREEN_TEXT if sg_val > 0 else RED_TEXT if sg_val < 0 else TEXT_COLOR
-            sg_label.config(text=f"Strokes Gained: {sg_val:+.2f}", bg = "#2D3E55", fg=color)
-            sg_label.sg_value = sg_val
-        except Exception as e:
-            sg_label.config(text=f"Error: {e}", fg=RED_TEXT)
-        finally:
-            conn.close()
+        if fields is None:
+            return
+        callbacks = dict(on_done=show_sg, on_error=show_sg_error, timing="ui_sg_input_to_label")
+        if debounce:
+            worker.debounce("sg", compute_sg, *fields, **callbacks)
+        else:
+            worker.submit(compute_sg, *fields, key="sg", **callbacks)
 
     def toggle_end_state(event=None):
         if surface_end_dd.get() == "Hole":
@@ -80,29 +133,40 @@ def open_shot_entry():
 
     def add_shot():
         nonlocal last_surface, last_distance
+        if worker.pending("sg"):
+            # A recalculation is still queued: use the current fields, not the label's last value,
+            # and cancel the queued one so it cannot land on the cleared form afterwards
+            worker.cancel("sg")
+            try:
+                fields = read_shot_fields()
+            except ValueError:
+                fields = None
+            if fields:
+                show_sg(compute_sg(*fields))
         sg_val = getattr(sg_label, "sg_value", None)
         if sg_val is None:
             messagebox.showwarning("Warning", "Please complete shot details first.")
             return
 
-        shot = {
-            "PlayerID": round_info["PlayerID"],
-            "RoundID": round_info["RoundID"],
-            "Hole": hole_num,
-            "Par": int(par_dd.get()) if par_dd.get() else None,
-            "Category": category_dd.get(),
-            "SurfaceStart": surface_start_dd.get(),
-            "DistanceStart": float(distance_start_entry.get()),
-            "SurfaceEnd": surface_end_dd.get(),
-            "DistanceEnd": None if surface_end_dd.get() == "Hole" else float(distance_end_entry.get()),
-            "ClubUsed": club_entry.get().strip(),
-            "ShotShape": shape_entry.get().strip(),
-            "Penalty": 1 if penalty_var.get() else 0,
-            "StrokesGained": sg_val
-        }
-
-        # Append and display
+        shot = Shot(
+            PlayerID=round_info["PlayerID"],
+            RoundID=round_info["RoundID"],
+            Hole=hole_num,
+            Par=int(par_dd.get()) if par_dd.get() else None,
+            Category=category_dd.get(),
+            SurfaceStart=surface_start_dd.get(),
+            DistanceStart=float(distance_start_entry.get()),
+            SurfaceEnd=surface_end_dd.get(),
+            DistanceEnd=None if surface_end_dd.get() == "Hole" else float(distance_end_entry.get()),
+            ClubUsed=club_entry.get().strip(),
+            ShotShape=shape_entry.get().strip(),
+            Penalty=1 if penalty_var.get() else 0,
+            StrokesGained=sg_val
+        )
+
+        # Append, journal and display
         shots_this_hole.append(shot)
+        journal.add_shot(shot)
         tree.insert("", "end", values=(
             shot["Category"],
             shot["SurfaceStart"],
@@ -127,6 +191,7 @@ def open_shot_entry():
             return
 
         last_shot = shots_this_hole.pop()
+        journal.take_back_shot()
         clear_fields()
         category_dd.set(last_shot["Category"])
         surface_start_dd.set(last_shot["SurfaceStart"])
@@ -175,18 +240,6 @@ def open_shot_entry():
         elif last_surface == "Tee":
             category_dd.set("Driving")
 
-    def determine_hole_result(par, num, penalties):
-        total = num + penalties
-        diff = total - par
-        return (
-            "Eagle" if diff <= -2 else
-            "Birdie" if diff == -1 else
-            "Par" if diff == 0 else
-            "Bogey" if diff == 1 else
-            "Double Bogey" if diff == 2 else
-            f"Other (+{diff})"
-        )
-
     def save_hole():
         if not shots_this_hole:
             messagebox.showwarning("No Shots", "Please add at least one shot.")
@@ -200,6 +253,7 @@ def open_shot_entry():
         for s in shots_this_hole:
             s["HoleResult"] = res
             cached_shots.append(s)
+        journal.save_hole(hole_num, res)
         shots_this_hole.clear()
         tree.delete(*tree.get_children())
         messagebox.showinfo("Hole Saved", f"Hole {hole_num} saved as {res}")
@@ -217,7 +271,12 @@ def open_shot_entry():
             distance_start_entry.delete(0, tk.END)
             distance_end_entry.config(state="normal")
         else:
+            # Draw the summary chart in the background while the dialog is read
+            charts.prerender(round_hash(round_info, cached_shots),
+                             summarize_round(cached_shots)["sg_by_category"])
             messagebox.showinfo("Round Complete", "All holes recorded.")
+            worker.stop()
+            journal.close()  # kept until the summary screen has saved the round
             window.destroy()
             from round_summary import open_summary_screen
             open_summary_screen(cached_shots)
@@ -229,6 +288,8 @@ def open_shot_entry():
     window.configure(bg=BG_PRIMARY)
     window.resizable(False, False)
     center_window(window, 1000, 850)
+    worker = BackgroundWorker(window)
+    worker.submit(current_baseline, on_done=warn_baseline)  # load while the form is drawn
 
     card = tk.Frame(window, bg=CARD_BG, padx=40, pady=30, highlightbackground=FIELD_BORDER, highlightthickness=1)
     card.pack(expand=True, pady=25)
@@ -254,11 +315,11 @@ def open_shot_entry():
 
     # Form fields (clean grid alignment)
     row_labels = [
-        ("Category:", ["Driving", "Approach", "Short Game", "Putting"]),
-        ("Surface Start:", ["Tee", "Fairway", "Rough", "Sand", "Green", "Penalty"]),
+        ("Category:", CATEGORIES),
+        ("Surface Start:", START_SURFACES),
         ("Distance Start (yds/ft):", None),
-        ("Surface End:", ["Tee", "Fairway", "Rough", "Sand", "Green", "Penalty", "Hole"]),
-        ("Distance End (yds):", None),
+        ("Surface End:", END_SURFACES),
+        ("Distance End (yds/ft):", None),
         ("Club Used*:", None),
         ("Shot Shape*:", None)
     ]
@@ -315,6 +376,17 @@ def open_shot_entry():
     # Live SG recalculation
     for w in [surface_start_dd, surface_end_dd, distance_start_entry, distance_end_entry]:
         w.bind("<FocusOut>", lambda e: calculate_strokes_gained())
-        w.bind("<KeyRelease>", lambda e: calculate_strokes_gained())
+        w.bind("<KeyRelease>", lambda e: calculate_strokes_gained(debounce=True))
+
+    # Resumed round: put back the hole that was in progress
+    for s in shots_this_hole:
+        tree.insert("", "end", values=(
+            s["Category"], s["SurfaceStart"], s["DistanceStart"],
+            s["SurfaceEnd"], s["DistanceEnd"] or "", s["Penalty"], f"{s['StrokesGained']:+.2f}"
+        ))
+    if resume is not None:
+        if shots_this_hole and shots_this_hole[0]["Par"]:
+            par_dd.set(shots_this_hole[0]["Par"])
+        clear_fields(preserve_last=True)
 
     window.mainloop()
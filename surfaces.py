@@ -0,0 +1,115 @@
+"""Canonical surface registry shared by the baseline, the shot-entry form and FactShots.
+
+Every name a surface goes by (shot-entry label, DimAvg row, dimaverages.csv row)
+resolves to one entry with a fixed integer code. Baselines index their curves by
+code, the form offers the registry's names, and FactShots stores the codes next
+to the names (DimSurface documents them in the database):
+
+    surfaces.canonical("Bunker")   # "Sand"
+    surfaces.code("Sand")          # 4
+    surfaces.encode(["Tee", "Bunker", "Hole"])  # array([1, 4, 8])
+"""
+from collections import namedtuple
+import numpy as np
+
+# code: stored in FactShots and DimSurface, so never renumber or reuse one
+# unit: how distances from this surface are entered (putts in feet)
+# curve: the surface whose baseline curve is used when it has none of its own
+Surface = namedtuple("Surface", "code name unit curve")
+
+UNKNOWN = 0
+SURFACES = (
+    Surface(1, "Tee", "Yds", None),
+    Surface(2, "Fairway", "Yds", None),
+    Surface(3, "Rough", "Yds", None),
+    Surface(4, "Sand", "Yds", None),
+    Surface(5, "Recovery", "Yds", None),
+    Surface(6, "Green", "Ft", None),
+    # No tour curve exists for a penalty area. The ball is played after a drop, usually
+    # in the rough, so it is scored on the rough curve; the stroke itself is the Penalty box.
+    Surface(7, "Penalty", "Yds", "Rough"),
+    Surface(8, "Hole", None, None),
+)
+HOLE = 8
+
+# Other spellings found in baseline sources; dimaverages.csv calls the bunker "Bunker"
+ALIASES = {"Bunker": "Sand"}
+
+BY_NAME = {s.name: s for s in SURFACES}
+BY_CODE = {s.code: s for s in SURFACES}
+# Any name, alias or code -> code. One dict probe encodes a value of any of those kinds.
+CODES = {**{s.name: s.code for s in SURFACES}, **{a: BY_NAME[n].code for a, n in ALIASES.items()},
+         **{s.code: s.code for s in SURFACES}}
+NAMES = np.array([""] + [s.name for s in SURFACES], dtype=object)  # code -> name
+
+# Offered by the shot-entry form, in dropdown order
+START_SURFACES = ["Tee", "Fairway", "Rough", "Sand", "Recovery", "Green", "Penalty"]
+END_SURFACES = START_SURFACES + ["Hole"]
+
+
+def canonical(name):
+    """The registry name for `name` or one of its aliases; None if it is not a surface."""
+    c = CODES.get(name)
+    return BY_CODE[c].name if c else None
+
+
+def code(name):
+    """Integer code for a name, alias or code; UNKNOWN (0) if it is not a surface."""
+    return CODES.get(name, UNKNOWN)
+
+
+def unit(name):
+    s = BY_CODE.get(CODES.get(name))
+    return s.unit if s else "Yds"
+
+
+def curve_name(name):
+    """The surface whose baseline curve scores `name` (itself unless it has a fallback)."""
+    s = BY_CODE[CODES[name]]
+    return s.curve or s.name
+
+
+def encode(values):
+    """Codes for a sequence of names, aliases or codes. Integer arrays pass straight through."""
+    if isinstance(values, np.ndarray) and values.dtype.kind in "iu":
+        return values
+    return np.fromiter((CODES.get(v, UNKNOWN) for v in values), dtype=np.intp)
+
+
+def decode(codes):
+    """Names for an array of codes ("" for UNKNOWN)."""
+    return NAMES[np.asarray(codes, dtype=np.intp)]
+
+
+def stored_codes(codes, names):
+    """Codes for a FactShots column pair. Rows saved before the code columns existed
+    carry NULL codes and fall back to their names."""
+    if None not in codes:
+        return np.array(codes, dtype=np.intp)
+    return np.fromiter((CODES.get(n, UNKNOWN) if c is None else c for c, n in zip(codes, names)),
+                       dtype=np.intp)
+
+
+# --- Schema (applied by migrations.py) ---
+CREATE_DIM_SURFACE = """
+CREATE TABLE IF NOT EXISTS DimSurface (
+    SurfaceCode INTEGER PRIMARY KEY,
+    Surface TEXT NOT NULL UNIQUE,
+    Unit_of_Measurement TEXT,
+    CurveSurface TEXT
+)
+"""
+
+
+def create_tables(conn):
+    """DimSurface from the registry, plus code columns on FactShots backfilled from the names."""
+    conn.execute(CREATE_DIM_SURFACE)
+    conn.executemany("INSERT OR REPLACE INTO DimSurface VALUES (?, ?, ?, ?)",
+                     [(s.code, s.name, s.unit, s.curve) for s in SURFACES])
+    names = [(name, c) for name, c in CODES.items() if isinstance(name, str)]
+    for column in ("SurfaceStart", "SurfaceEnd"):
+        conn.execute(f"ALTER TABLE FactShots ADD COLUMN {column}Code INTEGER REFERENCES DimSurface(SurfaceCode)")
+        # One pass over the table; unknown names are left NULL
+        conn.execute(f"UPDATE FactShots SET {column}Code = CASE {column} "
+                     f"{' '.join('WHEN ? THEN ?' for _ in names)} END",
+                     [v for pair in names for v in pair])
@@ -0,0 +1,342 @@
+"""Local sync service: devices push completed rounds to one central database.
+
+Each scoring laptop keeps its own shots_gained.db. Rounds saved there are pushed
+to this server as gzip-compressed JSON batches (POST /rounds, records in the
+ingest.py shape). The server validates them like ingest does and hands them to
+a single writer task. That task folds every upload waiting at that moment into
+one save_rounds transaction, so hundreds of concurrent uploads cost a few
+commits rather than hundreds. Rounds are deduplicated by content hash, so
+pushing the same round twice, from any device, stores it once.
+
+Rounds are only accepted for players on the server's roster (DimPlayer). Pushes
+carry the PlayerName with the PlayerID, and a round whose name does not match
+the server's player of that ID is rejected rather than credited to someone else.
+
+    python sync_server.py serve --db central.db --port 8765
+    python sync_server.py push --db shots_gained.db --url http://127.0.0.1:8765
+
+round_summary pushes automatically after each save when SG_SYNC_URL is set.
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import time
+import urllib.request
+import zlib
+import db
+from baseline import load_baseline, player_baselines
+from db import DB_PATH
+from ingest import validate_round
+from migrations import migrate
+from round_store import SHOT_COLUMNS, round_hash, save_rounds
+from scoring import assign_hole_results, score_shots_by_player
+
+# --- CONFIG ---
+SYNC_URL = os.environ.get("SG_SYNC_URL")  # client side; unset means rounds stay local
+HOST = "127.0.0.1"
+PORT = 8765
+MAX_BODY = 32 * 1024 * 1024  # bytes after decompression
+MAX_WRITE_ROUNDS = 5000  # rounds per writer transaction
+PUSH_BATCH = 200  # rounds per upload
+TIMEOUT = 30.0  # seconds, client and server side
+BACKLOG = 1024  # pending connections the listening socket queues
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           411: "Length Required", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+# --- Server ---
+def gunzip(data, limit):
+    """Decompress a gzip body, or return None if it inflates past `limit` bytes.
+
+    Never holds more than limit + 1 decompressed bytes, whatever the compression ratio.
+    """
+    inflater = zlib.decompressobj(wbits=31)  # 31: expect a gzip header and trailer
+    out = inflater.decompress(data, limit + 1)
+    if len(out) > limit:
+        return None
+    if not inflater.eof:
+        raise EOFError("compressed batch is truncated")
+    return out
+
+
+class SyncServer:
+    """asyncio HTTP front end plus one writer task that owns all database writes."""
+
+    def __init__(self, db_path=DB_PATH, baseline=None):
+        self.db_path = db_path
+        self.baseline = baseline or load_baseline(db_path)
+        self.stats = {"uploads": 0, "rounds": 0, "created": 0, "duplicates": 0, "rejected": 0,
+                      "transactions": 0, "missing_baselines": []}
+        self._queue = None
+
+    async def serve(self, host=HOST, port=PORT, ready=None):
+        """Run until cancelled. `ready(port)` is called once the socket is listening."""
+        self._queue = asyncio.Queue()
+        writer = asyncio.create_task(self._writer())
+        server = await asyncio.start_server(self._handle, host, port, backlog=BACKLOG)
+        if ready:
+            ready(server.sockets[0].getsockname()[1])
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            writer.cancel()
+
+    # --- HTTP ---
+    async def _handle(self, reader, writer):
+        try:
+            # The timeout covers reading the request, not the wait for the writer
+            status, body, records = await asyncio.wait_for(self._request(reader), TIMEOUT)
+            if records is not None:
+                status, body = 200, {"results": await self.upload(records)}
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError,
+                ConnectionError):
+            writer.close()
+            return
+        except Exception as e:
+            status, body = 500, {"error": str(e)}
+        payload = json.dumps(body).encode()
+        writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode() + payload)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+    async def _request(self, reader):
+        """(status, body, None) to answer at once, or (None, None, records) for an upload."""
+        head = await reader.readuntil(b"\r\n\r\n")
+        request_line, *header_lines = head.decode("latin-1").split("\r\n")
+        method, path, _ = request_line.split(" ", 2)
+        headers = {}
+        for line in header_lines:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        if path == "/health":
+            return 200, {"status": "ok", **self.stats}, None
+        if path != "/rounds":
+            return 404, {"error": f"no such endpoint {path}"}, None
+        if method != "POST":
+            return 405, {"error": "POST round batches to /rounds"}, None
+        if "content-length" not in headers:
+            return 411, {"error": "Content-Length is required"}, None
+        length = int(headers["content-length"])
+        if length > MAX_BODY:
+            return 413, {"error": f"batch larger than {MAX_BODY} bytes"}, None
+        body = await reader.readexactly(length)
+        try:
+            if headers.get("content-encoding") == "gzip":
+                body = gunzip(body, MAX_BODY)
+                if body is None:
+                    return 413, {"error": f"batch larger than {MAX_BODY} bytes once decompressed"}, None
+            records = json.loads(body)["rounds"]
+        except (OSError, EOFError, zlib.error, ValueError, KeyError, TypeError) as e:
+            return 400, {"error": f"unreadable batch: {e}"}, None
+        return None, None, records
+
+    # --- Rounds ---
+    async def upload(self, records):
+        """Validate one batch of round records and wait for the writer to store it.
+
+        Returns one result per record, in order: {"round_id", "created", "hash"}
+        or {"error"}.
+        """
+        results = [None] * len(records)
+        valid = []
+        for i, record in enumerate(records):
+            try:
+                round_info, shots = validate_round(record)
+            except (ValueError, TypeError, AttributeError) as e:
+                results[i] = {"error": str(e)}
+                continue
+            round_info["PlayerName"] = record.get("PlayerName")  # checked against the roster by _write
+            valid.append((i, round_info, shots))
+        if valid:
+            done = asyncio.get_running_loop().create_future()
+            await self._queue.put((valid, done))
+            # shielded: a dropped request must not cancel the future the writer will resolve
+            for i, result in await asyncio.shield(done):
+                results[i] = result
+        self.stats["uploads"] += 1
+        self.stats["rounds"] += len(records)
+        self.stats["rejected"] += sum("error" in r for r in results)
+        return results
+
+    async def _writer(self):
+        while True:
+            uploads = [await self._queue.get()]
+            rounds = len(uploads[0][0])
+            while not self._queue.empty() and rounds < MAX_WRITE_ROUNDS:
+                uploads.append(self._queue.get_nowait())
+                rounds += len(uploads[-1][0])
+            # One failed batch fails its own uploads and the writer carries on
+            try:
+                outcomes = await asyncio.to_thread(self._write, [valid for valid, _ in uploads])
+            except Exception as e:
+                for _, done in uploads:
+                    if not done.done():
+                        done.set_exception(e)
+                continue
+            for (_, done), outcome in zip(uploads, outcomes):
+                if not done.done():
+                    done.set_result(outcome)
+
+    def _write(self, uploads):
+        """Score and store every upload in one transaction (runs on a worker thread)."""
+        overrides, missing = player_baselines(self.db_path)  # each player's own baseline, as on the device
+        self.stats["missing_baselines"] = sorted(missing)
+        roster = self._roster({info["PlayerID"] for valid in uploads for _, info, _ in valid})
+        ready, outcomes = [], []
+        for valid in uploads:
+            outcome = []
+            for i, round_info, shots in valid:
+                error = roster_error(roster, round_info)
+                if error:
+                    outcome.append((i, {"error": error}))
+                    continue
+                # SG computed on the device is kept; only shots that arrive without one are scored
+                unscored = [s for s in shots if s["StrokesGained"] is None]
+                if unscored and score_shots_by_player(self.baseline, overrides, unscored):
+                    outcome.append((i, {"error": "a shot has no baseline for its surface and no StrokesGained"}))
+                    continue
+                assign_hole_results(shots)
+                outcome.append((i, len(ready)))
+                ready.append((round_info, shots))
+            outcomes.append(outcome)
+
+        saved = save_rounds(ready, self.db_path) if ready else []
+        self.stats["transactions"] += 1
+        for outcome in outcomes:
+            for n, (i, slot) in enumerate(outcome):
+                if isinstance(slot, dict):
+                    continue
+                round_id, created = saved[slot]
+                self.stats["created" if created else "duplicates"] += 1
+                outcome[n] = (i, {"round_id": round_id, "created": created,
+                                  "hash": round_hash(*ready[slot])})
+        return outcomes
+
+    def _roster(self, player_ids):
+        """{PlayerID: PlayerName} for the given IDs that exist in the server's DimPlayer."""
+        player_ids = sorted(player_ids)
+        with db.connection("sync_roster", self.db_path) as conn:
+            return dict(conn.execute("SELECT PlayerID, PlayerName FROM DimPlayer "
+                                     f"WHERE PlayerID IN ({','.join('?' * len(player_ids))})", player_ids))
+
+
+def roster_error(roster, round_info):
+    """Why a round cannot be stored for its PlayerID, or None."""
+    player_id, name = round_info["PlayerID"], round_info.get("PlayerName")
+    if player_id not in roster:
+        return f"unknown PlayerID {player_id}; add the player to the server's roster first"
+    if name and " ".join(name.casefold().split()) != " ".join(str(roster[player_id]).casefold().split()):
+        return f"PlayerID {player_id} is {roster[player_id]} on the server, not {name}"
+    return None
+
+
+# --- Client ---
+def post_rounds(url, records, timeout=TIMEOUT):
+    """POST one gzip-compressed batch of round records; returns the per-round results."""
+    body = gzip.compress(json.dumps({"rounds": records}).encode())
+    request = urllib.request.Request(url.rstrip("/") + "/rounds", data=body, method="POST", headers={
+        "Content-Type": "application/json", "Content-Encoding": "gzip"})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())["results"]
+
+
+def unsynced_records(conn, limit=PUSH_BATCH):
+    """(RoundIDs, ingest-shaped records) for the oldest local rounds not yet pushed."""
+    rounds = conn.execute(
+        "SELECT r.RoundID, r.PlayerID, p.PlayerName, r.CoursePlayed, r.RoundDate, r.TeePreference "
+        "FROM DimRound r LEFT JOIN DimPlayer p ON p.PlayerID = r.PlayerID "
+        "WHERE r.SyncedDate IS NULL ORDER BY r.RoundID LIMIT ?", (limit,)).fetchall()
+    if not rounds:
+        return [], []
+    shots = {}
+    rows = conn.execute(
+        f"SELECT RoundID, {', '.join(SHOT_COLUMNS)} FROM FactShots "
+        f"WHERE RoundID IN ({','.join('?' * len(rounds))}) ORDER BY RoundID, ShotID",
+        [r[0] for r in rounds])
+    for round_id, *values in rows:
+        shots.setdefault(round_id, []).append(dict(zip(SHOT_COLUMNS, values)))
+    records = [{"PlayerID": pid, "PlayerName": name, "CoursePlayed": course, "RoundDate": rdate,
+                "TeePreference": tee, "Shots": shots.get(rid, [])}
+               for rid, pid, name, course, rdate, tee in rounds]
+    return [r[0] for r in rounds], records
+
+
+def push_pending(db_path=DB_PATH, url=None, batch=PUSH_BATCH):
+    """Upload every local round not yet on the server, oldest first.
+
+    Rounds the server stored (or already had) are marked synced; rejected ones
+    stay pending and are reported. Raises OSError when the server is unreachable,
+    leaving the rest for the next push. Returns {"pushed", "rejected", "errors"}.
+    """
+    url = url or SYNC_URL
+    if not url:
+        raise ValueError("No sync server configured (set SG_SYNC_URL or pass --url)")
+    stats = {"pushed": 0, "rejected": 0, "errors": []}
+    skip = set()  # rejected this run; retried on the next push
+    with db.connection("sync_push", db_path) as conn:
+        while True:
+            round_ids, records = unsynced_records(conn, batch + len(skip))
+            pending = [(rid, rec) for rid, rec in zip(round_ids, records) if rid not in skip]
+            if not pending:
+                return stats
+            results = post_rounds(url, [rec for _, rec in pending])
+            accepted = []
+            for (rid, _), result in zip(pending, results):
+                if "error" in result:
+                    skip.add(rid)
+                    stats["rejected"] += 1
+                    stats["errors"].append((rid, result["error"]))
+                else:
+                    accepted.append((rid,))
+            with conn:
+                conn.executemany("UPDATE DimRound SET SyncedDate=CURRENT_TIMESTAMP WHERE RoundID=?",
+                                 accepted)
+            stats["pushed"] += len(accepted)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Central round store for several scoring devices.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="run the sync server")
+    serve.add_argument("--db", default=DB_PATH, help="central database")
+    serve.add_argument("--host", default=HOST)
+    serve.add_argument("--port", type=int, default=PORT)
+    push = sub.add_parser("push", help="upload this device's unsynced rounds")
+    push.add_argument("--db", default=DB_PATH, help="local database")
+    push.add_argument("--url", default=SYNC_URL, help="server URL (default: $SG_SYNC_URL)")
+    args = parser.parse_args()
+
+    migrate(args.db)
+    if args.command == "push":
+        started = time.perf_counter()
+        try:
+            stats = push_pending(args.db, args.url)
+        except (OSError, ValueError) as e:
+            print(f"❌ Push failed: {e}")
+            raise SystemExit(1)
+        for round_id, message in stats["errors"][:20]:
+            print(f"❌ Round {round_id}: {message}")
+        print(f"✅ Pushed {stats['pushed']:,} rounds in {time.perf_counter() - started:.2f}s, "
+              f"{stats['rejected']:,} rejected")
+        return
+
+    server = SyncServer(args.db)
+    try:
+        asyncio.run(server.serve(args.host, args.port,
+                                 ready=lambda port: print(f"✅ Sync server on http://{args.host}:{port}")))
+    except KeyboardInterrupt:
+        print(f"↪ Stopped: {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,29 @@
 import sqlite3
+from db import DB_PATH
 
-# --- CONFIG ---
-db_path = "shots_gained.db"
+# --- TABLES ---
+CREATE_DIM_PLAYER = """
+CREATE TABLE IF NOT EXISTS DimPlayer (
+    PlayerID INTEGER PRIMARY KEY AUTOINCREMENT,
+    PlayerName TEXT NOT NULL,
+    Handicap REAL,
+    HomeCourse TEXT,
+    TeePreference TEXT,
+    DominantHand TEXT,
+    CreatedDate DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+"""
 
-# --- CONNECT ---
-conn = sqlite3.connect(db_path)
-cursor = conn.cursor()
+CREATE_DIM_AVG = """
+CREATE TABLE IF NOT EXISTS "DimAvg" (
+"Surface" TEXT,
+  "Distance" INTEGER,
+  "TourAvg" REAL,
+  "Unit_of_Measurement" TEXT
+);
+"""
 
-# --- CREATE TABLE ---
-cursor.execute("""
+CREATE_DIM_ROUND = """
 CREATE TABLE IF NOT EXISTS DimRound (
     RoundID INTEGER PRIMARY KEY AUTOINCREMENT,
     PlayerID INTEGER NOT NULL,
@@ -19,9 +34,45 @@ CREATE TABLE IF NOT EXISTS DimRound (
     CreatedDate DATETIME DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (PlayerID) REFERENCES DimPlayer(PlayerID)
 );
-""")
+"""
+
+CREATE_FACT_SHOTS = """
+CREATE TABLE IF NOT EXISTS "FactShots" (
+	"ShotID"	INTEGER,
+	"PlayerID"	INTEGER NOT NULL,
+	"RoundID"	INTEGER NOT NULL,
+	"Hole"	NUMERIC NOT NULL,
+	"Par"	INTEGER,
+	"HoleResult"	TEXT,
+	"Category"	NUMERIC,
+	"SurfaceStart"	TEXT,
+	"DistanceStart"	REAL,
+	"SurfaceEnd"	TEXT,
+	"DistanceEnd"	REAL,
+	"ClubUsed"	TEXT,
+	"ShotShape"	TEXT,
+	"Penalty"	INTEGER DEFAULT 0,
+	"StrokesGained"	REAL,
+	"CreatedDate"	DATETIME DEFAULT CURRENT_TIMESTAMP,
+	PRIMARY KEY("ShotID" AUTOINCREMENT),
+	FOREIGN KEY("PlayerID") REFERENCES "DimPlayer"("PlayerID"),
+	FOREIGN KEY("RoundID") REFERENCES "DimRound"("RoundID")
+);
+"""
+
+
+def create_tables(conn):
+    """Create the tables this script owns. Safe to run against an existing database."""
+    cursor = conn.cursor()
+    for ddl in (CREATE_DIM_PLAYER, CREATE_DIM_AVG, CREATE_DIM_ROUND, CREATE_FACT_SHOTS):
+        cursor.execute(ddl)
+
 
-conn.commit()
-conn.close()
+if __name__ == "__main__":
+    # --- CONNECT ---
+    conn = sqlite3.connect(DB_PATH)
+    create_tables(conn)
+    conn.commit()
+    conn.close()
 
-print("✅ DimRound table created successfully.")
+    print("✅ Tables created successfully.")
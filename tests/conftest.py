@@ -0,0 +1,79 @@
+"""Shared fixtures: a migrated throwaway database with the tour baseline and two players."""
+import csv
+import os
+import sqlite3
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import db  # noqa: E402
+from baseline import CSV_PATH, load_baseline  # noqa: E402
+from migrations import migrate  # noqa: E402
+from shot import Shot  # noqa: E402
+
+PLAYERS = [(1, "Barry Babbitt"), (2, "Pat Jones")]
+
+
+@pytest.fixture(autouse=True)
+def repo_cwd(monkeypatch):
+    # dimaverages.csv and baselines/ are found relative to the repository
+    monkeypatch.chdir(ROOT)
+    yield
+    db.close_all()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "test.db")
+    migrate(path)
+    conn = sqlite3.connect(path)
+    with open(CSV_PATH, newline="", encoding="utf-8-sig") as f:
+        rows = [(r["Surface"], int(r["Distance"]), float(r["SG Avg"]), r["Unit of Measurement"])
+                for r in csv.DictReader(f)]
+    with conn:
+        conn.executemany("INSERT INTO DimAvg VALUES (?, ?, ?, ?)", rows)
+        conn.executemany("INSERT INTO DimPlayer (PlayerID, PlayerName) VALUES (?, ?)", PLAYERS)
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def baseline():
+    return load_baseline(CSV_PATH)
+
+
+def play_hole(player_id, hole, par=4, tee=400):
+    """Tee -> fairway -> green -> holed: a par-4 played in four, distances as floats like the entry form."""
+    return [
+        Shot(PlayerID=player_id, Hole=hole, Par=par, Category="Driving", SurfaceStart="Tee",
+             DistanceStart=float(tee), SurfaceEnd="Fairway", DistanceEnd=150.0),
+        Shot(PlayerID=player_id, Hole=hole, Par=par, Category="Approach", SurfaceStart="Fairway",
+             DistanceStart=150.0, SurfaceEnd="Green", DistanceEnd=20.0),
+        Shot(PlayerID=player_id, Hole=hole, Par=par, Category="Putting", SurfaceStart="Green",
+             DistanceStart=20.0, SurfaceEnd="Green", DistanceEnd=3.0),
+        Shot(PlayerID=player_id, Hole=hole, Par=par, Category="Putting", SurfaceStart="Green",
+             DistanceStart=3.0, SurfaceEnd="Hole", DistanceEnd=None),
+    ]
+
+
+@pytest.fixture
+def make_round(baseline):
+    """make_round(player_id, course, date, holes) -> (round_info, scored shots)."""
+    from scoring import assign_hole_results, score_shots
+
+    def make(player_id=1, course="Test Links", round_date="2025-06-01", holes=2, tee=400):
+        shots = [s for h in range(1, holes + 1) for s in play_hole(player_id, h, tee=tee + h)]
+        score_shots(baseline, shots)
+        assign_hole_results(shots)
+        info = {"RoundID": None, "PlayerID": player_id, "CoursePlayed": course,
+                "RoundDate": round_date, "HolesPlayed": holes, "TeePreference": "Tips"}
+        return info, shots
+    return make
+
+
+def round_record(round_info, shots):
+    """The ingest/sync record shape of a round."""
+    return {**{k: round_info[k] for k in ("PlayerID", "CoursePlayed", "RoundDate", "TeePreference")},
+            "Shots": [s.to_dict() for s in shots]}
@@ -0,0 +1,24 @@
+import charts
+
+SG = {"Driving": 0.4, "Approach": -0.2, "Short Game": 0.0, "Putting": 0.1}
+
+
+def test_failed_prerender_falls_back_to_drawing_the_chart(monkeypatch):
+    charts.clear()
+    real_render = charts.render_png
+    calls = []
+
+    def render_once_broken(draw, *args):
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("out of memory")
+        return real_render(draw, *args)
+
+    monkeypatch.setattr(charts, "render_png", render_once_broken)
+    charts.prerender("round-1", SG)
+    png = charts.round_chart("round-1", SG)
+
+    assert png.startswith(b"\x89PNG")
+    assert len(calls) == 2
+    assert "round-1" not in charts._pending
+    assert charts.cached("round-1") == png
@@ -0,0 +1,26 @@
+import db
+
+
+def test_close_waits_for_borrowed_connections(tmp_path):
+    pool = db.ConnectionPool(str(tmp_path / "pool.db"), size=2)
+    borrowed = pool.acquire()
+    idle = pool.acquire()
+    pool.release(idle)
+
+    pool.close()
+    assert pool._opened == 1  # the borrowed one is still open and still counts
+    borrowed.execute("SELECT 1")
+    pool.release(borrowed)
+    assert pool._opened == 0 and pool._idle.empty()
+
+    fresh = pool.acquire()  # the pool can be used again after close
+    assert fresh is not borrowed and pool._opened == 1
+    pool.release(fresh)
+    pool.close()
+
+
+def test_operations_are_timed_without_metrics(db_path):
+    db.reset_timings()
+    with db.connection("lookup", db_path) as conn:
+        conn.execute("SELECT COUNT(*) FROM DimPlayer").fetchone()
+    assert db.timings()["lookup"]["count"] == 1
@@ -0,0 +1,27 @@
+import sqlite3
+import pytest
+import export
+from analytics import season_of
+from round_store import save_rounds
+
+pytest.importorskip("pyarrow")
+
+
+def test_export_with_an_orphan_round(db_path, make_round, tmp_path):
+    import pyarrow.dataset as ds
+    # player 3 has no DimPlayer row, and one shot's round has been deleted
+    save_rounds([make_round(), make_round(player_id=3), make_round(round_date="2024-05-01")], db_path)
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("DELETE FROM DimRound WHERE RoundDate = '2024-05-01'")
+    stored = conn.execute("SELECT COUNT(*) FROM FactShots").fetchone()[0]
+
+    out = str(tmp_path / "export")
+    stats = export.export(out, db_path, full=True)
+
+    table = ds.dataset(out, format="parquet", partitioning="hive").to_table()
+    assert stats["shots"] == table.num_rows == stored
+    rows = table.to_pylist()
+    assert {(r["PlayerID"], r["PlayerName"]) for r in rows} == {(1, "Barry Babbitt"), (3, None), (1, None)}
+    assert {r["Season"] for r in rows if r["RoundDate"] is None} == {season_of(None)}
+    assert {(r["player"], str(r["season"])) for r in rows} == {(1, "2025"), (3, "2025"), (1, season_of(None))}
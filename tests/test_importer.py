@@ -0,0 +1,72 @@
+import csv
+import sqlite3
+import pytest
+import importer
+import ingest
+from migrations import migrate
+
+FIELDS = ["PlayerID", "CoursePlayed", "RoundDate", "Hole", "Par", "Category", "SurfaceStart",
+          "DistanceStart", "SurfaceEnd", "DistanceEnd", "Penalty"]
+
+
+def write_log(path, make_round, rounds=3):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        for n in range(rounds):
+            info, shots = make_round(round_date=f"2025-06-{n + 1:02d}")
+            for s in shots:
+                writer.writerow({**info, **s.to_dict()})
+
+
+def stored_rounds(db_path):
+    return sqlite3.connect(db_path).execute("SELECT COUNT(*) FROM DimRound").fetchone()[0]
+
+
+def test_resume_after_crash_imports_each_round_once(tmp_path, db_path, baseline, make_round, monkeypatch):
+    source = str(tmp_path / "log.csv")
+    write_log(source, make_round)
+    real_save = importer.save_batch
+    calls = []
+
+    def crash_on_second_batch(*args):
+        calls.append(1)
+        if len(calls) == 2:
+            raise RuntimeError("power cut")
+        real_save(*args)
+
+    monkeypatch.setattr(importer, "save_batch", crash_on_second_batch)
+    with pytest.raises(RuntimeError):
+        importer.import_file(source, db_path, baseline, batch_size=1)
+    assert stored_rounds(db_path) == 1
+
+    monkeypatch.setattr(importer, "save_batch", real_save)
+    stats = importer.import_file(source, db_path, baseline, batch_size=1)
+    assert stats["resumed_at"] > 0
+    assert stats["created"] == 2
+    assert stored_rounds(db_path) == 3
+
+
+def test_checkpoint_belongs_to_one_database(tmp_path, db_path, baseline, make_round):
+    source = str(tmp_path / "log.csv")
+    write_log(source, make_round)
+    importer.import_file(source, db_path, baseline)
+
+    other = str(tmp_path / "other.db")
+    migrate(other)
+    sqlite3.connect(other).executescript(f"ATTACH '{db_path}' AS src; "
+                                         "INSERT INTO DimPlayer SELECT * FROM src.DimPlayer;")
+    stats = importer.import_file(source, other, baseline)
+    assert stats["resumed_at"] == 0
+    assert stored_rounds(other) == 3
+
+
+def test_rejections_are_counted_but_only_the_first_messages_kept(tmp_path, db_path, baseline, monkeypatch):
+    monkeypatch.setattr(ingest, "MAX_ERRORS", 5)
+    source = tmp_path / "log.jsonl"
+    source.write_text("not json\n" * 12, encoding="utf-8")
+    stats = importer.import_file(str(source), db_path, baseline)
+    assert stats["rejected"] == 12
+    assert len(stats["errors"]) == 5
+    n, message = stats["errors"][1]
+    assert n == 2 and message.startswith("byte 9: not valid JSON")
@@ -0,0 +1,21 @@
+import json
+import sqlite3
+from conftest import round_record
+import ingest
+
+
+def test_bad_lines_are_rejected_and_the_rest_saved(tmp_path, db_path, baseline, make_round):
+    good = [round_record(*make_round(round_date=f"2025-06-0{n}")) for n in (1, 2)]
+    listed = round_record(*make_round(round_date="2025-06-03"))
+    listed["Shots"][0]["SurfaceStart"] = ["Tee"]  # unhashable: canonical() raises TypeError
+    path = tmp_path / "rounds.jsonl"
+    path.write_text("\n".join([json.dumps(good[0]), '{"PlayerID": 1, "Shots": [',
+                               json.dumps(listed), "", json.dumps(good[1])]) + "\n", encoding="utf-8")
+
+    stats = ingest.ingest(ingest.read_jsonl(str(path)), db_path, baseline)
+
+    assert (stats["rounds"], stats["created"], stats["rejected"]) == (4, 2, 2)
+    messages = dict(stats["errors"])
+    assert messages[2].startswith("line 2: not valid JSON")
+    assert messages[3] == "shot 1: unknown SurfaceStart ['Tee']"
+    assert sqlite3.connect(db_path).execute("SELECT COUNT(*) FROM DimRound").fetchone()[0] == 2
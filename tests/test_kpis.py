@@ -0,0 +1,38 @@
+import random
+from kpis import iter_round_summaries, shots_to_columns, summarize_round, summarize_rounds
+from scoring import CATEGORIES
+
+SURFACES = ["Fairway", "Rough", "Sand", "Green", "Hole", "Recovery"]
+
+
+def random_round(rng, round_id):
+    """A round with its holes played in shuffled order, some SG and Par missing."""
+    shots = []
+    holes = list(range(1, rng.choice([9, 18]) + 1))
+    rng.shuffle(holes)  # shotgun starts, or holes entered out of order
+    for hole in holes:
+        par = rng.choice([3, 4, 4, 5, None])
+        for n in range(rng.randint(1, 7)):
+            shots.append({
+                "RoundID": round_id, "Hole": hole,
+                "Par": None if n and rng.random() < 0.2 else par,  # only the first shot's Par counts
+                "Category": rng.choice([*CATEGORIES, None]),
+                "SurfaceEnd": rng.choice(SURFACES),
+                "Penalty": int(rng.random() < 0.1),
+                "StrokesGained": None if rng.random() < 0.15 else rng.uniform(-1.5, 1.5),
+            })
+    return shots
+
+
+def test_batch_kpis_match_the_per_round_code():
+    rng = random.Random(11)
+    rounds = [random_round(rng, round_id) for round_id in rng.sample(range(1, 1000), 40)]
+    batch = dict(iter_round_summaries(summarize_rounds(shots_to_columns(
+        [s for r in rng.sample(rounds, len(rounds)) for s in r]))))  # rounds in any order
+
+    assert sorted(batch) == sorted(r[0]["RoundID"] for r in rounds)
+    for shots in rounds:
+        expected = summarize_round(shots)
+        got = batch[shots[0]["RoundID"]]
+        for field, value in expected.items():
+            assert got[field] == value, (shots[0]["RoundID"], field)
@@ -0,0 +1,30 @@
+import threading
+import pytest
+import db
+import login
+import name_index
+from name_index import NameIndex
+
+
+def test_bulk_load_matches_adding_one_by_one():
+    names = [f"Player {n} Of Club {n % 7}" for n in range(500)] + ["Player 3 of club 3"]
+    one_by_one, bulk = NameIndex(), NameIndex()
+    for n, name in enumerate(names):
+        one_by_one.add(name, value=n, weight=n % 5)
+    bulk.add_many((name, n, n % 5) for n, name in enumerate(names))
+
+    assert bulk._keys == sorted(bulk._keys) == one_by_one._keys
+    assert sorted(zip(bulk._keys, bulk._key_ids)) == sorted(zip(one_by_one._keys, one_by_one._key_ids))
+    for query in ("player 3", "club 6", "plyer 42"):
+        assert bulk.search(query) == one_by_one.search(query)
+    bulk.add("Zed Newcomer", value=-1)  # small adds after a bulk load keep the keys sorted
+    assert bulk._keys == sorted(bulk._keys) and bulk.search("newc") == [("Zed Newcomer", -1)]
+
+
+def test_login_by_name_does_not_wait_for_the_index(db_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", db_path)
+    monkeypatch.setattr(name_index, "loaded", threading.Event())  # still loading
+
+    assert login.find_player("pat  JONES") == (2, "Pat Jones")
+    with pytest.raises(ValueError, match="No player"):
+        login.find_player("Nobody Here")
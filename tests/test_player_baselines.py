@@ -0,0 +1,77 @@
+import csv
+import sqlite3
+import pytest
+import baseline as baseline_module
+from baseline import CSV_PATH, Baseline, save_to_file
+from conftest import round_record
+from ingest import ingest
+from rescore import rescore_all
+from round_store import save_rounds
+from season_pipeline import run_season
+
+TEE_SG = """SELECT s.PlayerID, ROUND(SUM(s.StrokesGained), 6) FROM FactShots s
+            WHERE s.SurfaceStart = 'Tee' GROUP BY s.PlayerID ORDER BY s.PlayerID"""
+
+
+@pytest.fixture
+def scratch(tmp_path, db_path, monkeypatch):
+    """baselines/scratch.sgb expects half a stroke more from the tee; player 2 is scored against it."""
+    with open(CSV_PATH, newline="", encoding="utf-8-sig") as f:
+        rows = [(r["Surface"], r["Distance"], float(r["SG Avg"]) + (0.5 if r["Surface"] == "Tee" else 0),
+                 r["Unit of Measurement"]) for r in csv.DictReader(f)]
+    monkeypatch.setattr(baseline_module, "BASELINE_DIR", str(tmp_path / "baselines"))
+    (tmp_path / "baselines").mkdir()
+    save_to_file(Baseline(rows), baseline_module.baseline_path("scratch"), "scratch")
+    set_player_baseline(db_path, 2, "scratch")
+    yield
+    baseline_module.invalidate()
+
+
+def set_player_baseline(db_path, player_id, name):
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("UPDATE DimPlayer SET Baseline = ? WHERE PlayerID = ?", (name, player_id))
+    conn.close()
+
+
+def tee_sg(db_path):
+    return dict(sqlite3.connect(db_path).execute(TEE_SG).fetchall())
+
+
+def both_players(make_round):
+    return [make_round(player_id=1), make_round(player_id=2)]
+
+
+def test_ingest_scores_each_player_against_their_baseline(db_path, baseline, make_round, scratch):
+    records = [round_record(info, shots) for info, shots in both_players(make_round)]
+    for record in records:
+        for shot in record["Shots"]:
+            shot["StrokesGained"] = None  # scored by ingest, not carried over
+    ingest(records, db_path, baseline)
+    sg = tee_sg(db_path)
+    assert sg[2] - sg[1] == pytest.approx(1.0)  # two holes, half a stroke each
+
+
+def test_rescore_and_pipeline_use_player_baselines(db_path, baseline, make_round, scratch):
+    save_rounds(both_players(make_round), db_path)  # both scored against the tour baseline
+    assert tee_sg(db_path)[1] == tee_sg(db_path)[2]
+
+    stats = rescore_all(db_path, baseline)
+    assert stats["players"] == 1 and not stats["missing_baselines"]
+    sg = tee_sg(db_path)
+    assert sg[2] - sg[1] == pytest.approx(1.0)
+
+    set_player_baseline(db_path, 1, "scratch")
+    run_season(db_path, workers=1)
+    sg = tee_sg(db_path)
+    assert sg[1] == sg[2]
+
+
+def test_missing_player_baseline_falls_back_and_is_reported(db_path, baseline, make_round, scratch):
+    save_rounds(both_players(make_round), db_path)
+    set_player_baseline(db_path, 2, "nope")
+    stats = rescore_all(db_path, baseline)
+    assert list(stats["missing_baselines"]) == ["nope"]
+    assert stats["updated"] == 0
+    stats, _ = run_season(db_path, workers=1)
+    assert list(stats["missing_baselines"]) == ["nope"]
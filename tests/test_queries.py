@@ -0,0 +1,49 @@
+import sqlite3
+import queries
+from queries import QueryCache
+from round_store import save_rounds
+
+
+def test_saving_rounds_invalidates_cached_reads(db_path, make_round, monkeypatch):
+    monkeypatch.setattr(queries, "cache", QueryCache())
+    save_rounds([make_round(round_date="2025-06-01")], db_path)
+    assert len(queries.rounds_by_player(1, db_path=db_path)) == 1
+
+    # A write that skips round_store (another process) is not seen until the TTL runs out
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("INSERT INTO DimRound (PlayerID, CoursePlayed, RoundDate) VALUES (1, 'Elsewhere', '2025-06-02')")
+    conn.close()
+    assert len(queries.rounds_by_player(1, db_path=db_path)) == 1
+
+    save_rounds([make_round(round_date="2025-06-03")], db_path)
+    assert [r.RoundDate for r in queries.rounds_by_player(1, db_path=db_path)] == [
+        "2025-06-01", "2025-06-02", "2025-06-03"]
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(queries.time, "monotonic", lambda: now[0])
+    cache = QueryCache(ttl=60)
+    cache.put("key", "result", cache.generation)
+    now[0] += 59
+    assert cache.get("key") == (True, "result")
+    now[0] += 2
+    assert cache.get("key") == (False, None) and len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted_at_capacity():
+    cache = QueryCache(size=2)
+    cache.put("a", 1, cache.generation)
+    cache.put("b", 2, cache.generation)
+    cache.get("a")  # now "b" is the oldest
+    cache.put("c", 3, cache.generation)
+    assert [cache.get(key)[0] for key in "abc"] == [True, False, True]
+
+
+def test_result_read_before_invalidate_is_not_stored():
+    cache = QueryCache()
+    generation = cache.generation  # a query starts...
+    cache.invalidate()  # ...a round is saved while it runs...
+    cache.put("key", "stale", generation)  # ...and its result arrives
+    assert cache.get("key") == (False, None)
@@ -0,0 +1,71 @@
+import sqlite3
+import analytics
+from baseline import load_baseline
+from rescore import rescore_all
+from round_store import save_rounds
+from season_pipeline import run_season
+
+SG_BY_ROUND = "SELECT RoundID, ROUND(SUM(StrokesGained), 6) FROM FactShots GROUP BY RoundID ORDER BY RoundID"
+AGG_BY_ROUND = "SELECT RoundID, ROUND(SGTotal, 6) FROM AggRound ORDER BY RoundID"
+SG_BY_SEASON = """SELECT r.PlayerID, substr(r.RoundDate, 1, 4), COUNT(DISTINCT r.RoundID),
+                         ROUND(SUM(s.StrokesGained), 6)
+                  FROM FactShots s JOIN DimRound r ON r.RoundID = s.RoundID
+                  GROUP BY 1, 2 ORDER BY 1, 2"""
+AGG_BY_SEASON = "SELECT PlayerID, Season, Rounds, ROUND(SGTotal, 6) FROM AggPlayerSeason ORDER BY 1, 2"
+
+
+def save_club(db_path, make_round):
+    save_rounds([make_round(player_id=1, round_date="2025-06-01"),
+                 make_round(player_id=1, round_date="2025-06-08"),
+                 make_round(player_id=2, round_date="2025-06-01", course="Other Links")], db_path)
+
+
+def harder_tees(db_path):
+    """A new baseline: a tenth of a stroke more expected from every tee shot."""
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("UPDATE DimAvg SET TourAvg = TourAvg + 0.1 WHERE Surface = 'Tee'")
+    conn.close()
+    return load_baseline(db_path)
+
+
+def assert_aggregates_match_shots(db_path):
+    conn = sqlite3.connect(db_path)
+    assert conn.execute(AGG_BY_ROUND).fetchall() == conn.execute(SG_BY_ROUND).fetchall()
+    assert conn.execute(AGG_BY_SEASON).fetchall() == conn.execute(SG_BY_SEASON).fetchall()
+    conn.close()
+
+
+def test_rescore_rebuilds_aggregates(db_path, make_round):
+    save_club(db_path, make_round)
+    before = sqlite3.connect(db_path).execute(AGG_BY_ROUND).fetchall()
+
+    stats = rescore_all(db_path, harder_tees(db_path))
+
+    assert stats["updated"] > 0 and stats["players"] == 2
+    assert sqlite3.connect(db_path).execute(AGG_BY_ROUND).fetchall() != before
+    assert_aggregates_match_shots(db_path)
+
+
+def test_dry_run_leaves_aggregates_alone(db_path, make_round):
+    save_club(db_path, make_round)
+    before = sqlite3.connect(db_path).execute(AGG_BY_SEASON).fetchall()
+    rescore_all(db_path, harder_tees(db_path), dry_run=True)
+    assert sqlite3.connect(db_path).execute(AGG_BY_SEASON).fetchall() == before
+
+
+def test_season_pipeline_rebuilds_aggregates(db_path, make_round):
+    save_club(db_path, make_round)
+    harder_tees(db_path)
+    stats, _ = run_season(db_path, workers=1)
+    assert stats["updated"] > 0
+    assert_aggregates_match_shots(db_path)
+
+
+def test_rebuild_for_some_players_keeps_the_others(db_path, make_round):
+    save_club(db_path, make_round)
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("UPDATE AggPlayerSeason SET SGTotal = 99")
+        analytics.rebuild(conn, [1])
+    assert [sg for _, _, _, sg in conn.execute(AGG_BY_SEASON)] == [0.0492, 99]
@@ -0,0 +1,80 @@
+import sqlite3
+import pytest
+import db
+import journal
+import login
+from conftest import play_hole
+from round_store import save_rounds
+from scoring import assign_hole_results, score_shots
+from shot import Shot, ShotTable
+
+
+@pytest.fixture
+def signed_in(db_path, monkeypatch):
+    """find_player against the test database, before the name index has loaded."""
+    monkeypatch.setattr(db, "DB_PATH", db_path)
+    return login.find_player("1")
+
+
+def test_hole_saves_with_player_id_from_login(db_path, baseline, signed_in):
+    pid, name = signed_in
+    assert (pid, name) == (1, "Barry Babbitt")
+
+    cached = ShotTable()
+    shots = play_hole(pid, 1)
+    score_shots(baseline, shots)
+    assign_hole_results(shots)
+    for s in shots:  # what shot_entry.save_hole does
+        cached.append(s)
+    round_info = {"RoundID": None, "PlayerID": pid, "CoursePlayed": "Test Links",
+                  "RoundDate": "2025-06-01", "HolesPlayed": 1, "TeePreference": "Tips"}
+    [(round_id, created)] = save_rounds([(round_info, cached)], db_path)
+
+    assert created
+    rows = sqlite3.connect(db_path).execute(
+        "SELECT PlayerID, COUNT(*) FROM FactShots WHERE RoundID = ? GROUP BY PlayerID", (round_id,)).fetchall()
+    assert rows == [(1, 4)]
+
+
+def test_shot_table_accepts_numeric_strings():
+    shot = play_hole("2", 1)[0]
+    shot.Hole, shot.DistanceStart = "1", "400"
+    table = ShotTable([shot])
+    assert (table[0].PlayerID, table[0].Hole, table[0].DistanceStart) == (2, 1, 400.0)
+    table[0] = play_hole(1, 3)[0]
+    assert (table[0].PlayerID, table[0].Hole) == (1, 3)
+
+
+
+def test_resume_from_journal_and_save(tmp_path, db_path, make_round):
+    info, shots = make_round(player_id=1, holes=2)
+    old = journal.ShotJournal(journal.journal_path(1, str(tmp_path)))
+    old.start_round(dict(info, PlayerID="1", HolesPlayed="2"))  # as journaled before PlayerID was an int
+    for s in shots[:4]:
+        old.add_shot(Shot.from_dict(dict(s.to_dict(), PlayerID="1")))
+    old.save_hole(1, shots[0].HoleResult)
+    old.add_shot(shots[4])  # the app dies partway through hole 2
+    old.close()
+
+    [(path, state)] = journal.find_unfinished(1, str(tmp_path))
+    assert state["round_info"]["PlayerID"] == 1 and state["hole"] == 2
+
+    # What shot_entry does on resume, then hole 2 is finished and saved
+    cached = ShotTable()
+    cached.extend(state["saved"])
+    resumed = journal.ShotJournal(path, resume=True)
+    for s in shots[5:]:
+        resumed.add_shot(s)
+    resumed.save_hole(2, shots[4].HoleResult)
+    resumed.close()
+    for s in state["current"] + shots[5:]:
+        s.HoleResult = shots[4].HoleResult
+        cached.append(s)
+
+    # The summary screen saves the table; compacting the journal then finds the same round
+    [(round_id, created)] = save_rounds([(state["round_info"], cached)], db_path)
+    assert created
+    assert journal.compact(path, db_path) == (round_id, False)
+    rows = sqlite3.connect(db_path).execute(
+        "SELECT PlayerID, COUNT(*) FROM FactShots GROUP BY PlayerID").fetchall()
+    assert rows == [(1, 8)]
@@ -0,0 +1,42 @@
+import json
+import sqlite3
+from round_store import rehash_rounds, round_hash, save_rounds
+from shot import Shot, ShotTable
+
+
+def test_hash_does_not_depend_on_where_the_shots_came_from(make_round):
+    info, shots = make_round()
+    from_json = [Shot.from_dict(json.loads(json.dumps(s.to_dict()))) for s in shots]
+    assert round_hash(info, ShotTable(shots)) == round_hash(info, from_json) == round_hash(info, shots)
+
+
+def test_hash_does_not_depend_on_number_types_or_key_order(make_round):
+    info, shots = make_round()
+    as_entered = [s.to_dict() for s in shots]
+    # whole-number distances as ints, PlayerID as a string, keys in another order
+    retyped = [{k: int(v) if k.startswith("Distance") and v is not None else v
+                for k, v in reversed(list(s.items()))} for s in as_entered]
+    reordered = {**dict(reversed(list(info.items()))), "PlayerID": str(info["PlayerID"])}
+    assert isinstance(retyped[0]["DistanceStart"], int)
+    assert round_hash(reordered, retyped) == round_hash(info, as_entered)
+
+
+def test_rehash_matches_saved_rounds_and_clears_duplicates(db_path, make_round):
+    info, shots = make_round()
+    save_rounds([(info, shots), make_round(round_date="2025-06-02")], db_path)
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("UPDATE DimRound SET RoundHash = 'old-' || RoundID")
+        # the same round saved a second time under a different old hash
+        conn.execute("INSERT INTO DimRound (PlayerID, CoursePlayed, RoundDate, RoundHash) "
+                     "VALUES (1, 'Test Links', '2025-06-01', 'old-3')")
+        conn.execute("INSERT INTO FactShots (RoundID, PlayerID, Hole, Par, HoleResult, Category, SurfaceStart, "
+                     "DistanceStart, SurfaceEnd, DistanceEnd, ClubUsed, ShotShape, Penalty, StrokesGained) "
+                     "SELECT 3, PlayerID, Hole, Par, HoleResult, Category, SurfaceStart, DistanceStart, "
+                     "SurfaceEnd, DistanceEnd, ClubUsed, ShotShape, Penalty, StrokesGained "
+                     "FROM FactShots WHERE RoundID = 1 ORDER BY ShotID")
+        rehash_rounds(conn)
+    hashes = dict(conn.execute("SELECT RoundID, RoundHash FROM DimRound"))
+    assert hashes[1] == round_hash(info, shots)
+    assert hashes[3] is None
+    assert save_rounds([(info, ShotTable(shots))], db_path) == [(1, False)]
@@ -0,0 +1,92 @@
+import asyncio
+import gzip
+import sqlite3
+import threading
+import time
+import urllib.error
+import urllib.request
+import pytest
+import sync_server
+from conftest import round_record
+from sync_server import SyncServer, post_rounds
+
+
+def start_server(db_path, baseline):
+    server = SyncServer(db_path, baseline)
+    ready, port = threading.Event(), []
+
+    def run():
+        asyncio.run(server.serve("127.0.0.1", 0, ready=lambda p: (port.append(p), ready.set())))
+
+    threading.Thread(target=run, daemon=True).start()
+    assert ready.wait(10)
+    return server, f"http://127.0.0.1:{port[0]}"
+
+
+def test_same_round_from_two_devices_is_stored_once(db_path, baseline, make_round):
+    server, url = start_server(db_path, baseline)
+    batch = [round_record(*make_round(round_date="2025-06-01")),
+             round_record(*make_round(round_date="2025-06-02"))]
+
+    first = post_rounds(url, batch)
+    second = post_rounds(url, batch)
+
+    assert [r["created"] for r in first] == [True, True]
+    assert [r["created"] for r in second] == [False, False]
+    assert [r["round_id"] for r in first] == [r["round_id"] for r in second]
+    assert sqlite3.connect(db_path).execute("SELECT COUNT(*) FROM DimRound").fetchone()[0] == 2
+
+
+def post_raw(url, body):
+    request = urllib.request.Request(url + "/rounds", data=body, method="POST",
+                                     headers={"Content-Encoding": "gzip"})
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def test_decompressed_size_is_bounded(db_path, baseline, monkeypatch):
+    monkeypatch.setattr(sync_server, "MAX_BODY", 10_000)
+    _, url = start_server(db_path, baseline)
+    bomb = gzip.compress(b'{"rounds": [' + b" " * 1_000_000 + b"]}")
+    assert len(bomb) < 10_000
+    assert post_raw(url, bomb) == 413
+    assert post_raw(url, gzip.compress(b'{"rounds": []}')[:-4]) == 400  # truncated
+    assert post_raw(url, gzip.compress(b'{"rounds": []}')) == 200
+
+
+def test_rounds_for_unknown_or_mismatched_players_are_rejected(db_path, baseline, make_round):
+    _, url = start_server(db_path, baseline)
+    unknown = round_record(*make_round(player_id=99))
+    renamed = dict(round_record(*make_round(player_id=2)), PlayerName="Someone Else")
+    named = dict(round_record(*make_round(player_id=2, round_date="2025-06-02")), PlayerName="pat  jones")
+
+    results = post_rounds(url, [unknown, renamed, named])
+
+    assert results[0]["error"].startswith("unknown PlayerID 99")
+    assert results[1]["error"] == "PlayerID 2 is Pat Jones on the server, not Someone Else"
+    assert results[2]["created"]
+    assert sqlite3.connect(db_path).execute("SELECT PlayerID FROM DimRound").fetchall() == [(2,)]
+
+
+def test_a_timed_out_upload_does_not_stop_the_writer(db_path, baseline, make_round, monkeypatch):
+    monkeypatch.setattr(sync_server, "TIMEOUT", 0.3)
+    server, url = start_server(db_path, baseline)
+    write, calls = server._write, []
+
+    def slow_write(uploads):
+        calls.append(len(uploads))
+        if len(calls) == 1:
+            time.sleep(1)  # longer than both the server's and the first client's timeout
+        return write(uploads)
+
+    server._write = slow_write
+    with pytest.raises(OSError):
+        post_rounds(url, [round_record(*make_round(round_date="2025-06-01"))], timeout=0.3)
+
+    results = post_rounds(url, [round_record(*make_round(round_date="2025-06-02"))], timeout=10)
+
+    assert results[0]["created"]
+    assert sqlite3.connect(db_path).execute("SELECT COUNT(*) FROM DimRound").fetchone()[0] == 2
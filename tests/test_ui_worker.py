@@ -0,0 +1,102 @@
+import time
+import pytest
+import metrics
+from ui_worker import BackgroundWorker
+
+
+class FakeRoot:
+    """Just enough of Tk's after() for the worker; poll() runs whatever is scheduled."""
+
+    def __init__(self):
+        self.scheduled = {}
+        self._ids = 0
+
+    def after(self, ms, fn):
+        self._ids += 1
+        self.scheduled[self._ids] = fn
+        return self._ids
+
+    def after_cancel(self, after_id):
+        self.scheduled.pop(after_id, None)
+
+    def poll(self):
+        due, self.scheduled = self.scheduled, {}
+        for fn in due.values():
+            fn()
+
+
+def wait_for(worker, n):
+    deadline = time.monotonic() + 5
+    while worker._results.qsize() < n:
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def fail():
+    raise RuntimeError("disk full")
+
+
+def test_failed_job_without_on_error_keeps_results_flowing(capsys):
+    root = FakeRoot()
+    worker = BackgroundWorker(root)
+    done = []
+    worker.submit(fail)
+    worker.submit(lambda: 42, on_done=done.append)
+    wait_for(worker, 2)
+
+    root.poll()
+
+    assert done == [42]
+    assert "RuntimeError: disk full" in capsys.readouterr().err
+    assert root.scheduled  # still polling
+    worker.stop()
+
+
+def test_raising_callback_still_reschedules():
+    root = FakeRoot()
+    worker = BackgroundWorker(root)
+    done = []
+    worker.submit(lambda: 1, on_done=lambda _: fail())
+    worker.submit(lambda: 2, on_done=done.append)
+    wait_for(worker, 2)
+
+    with pytest.raises(RuntimeError):
+        root.poll()
+    root.poll()
+
+    assert done == [2]
+    worker.stop()
+
+
+def test_timing_stops_before_the_callback(monkeypatch):
+    observed = []
+    monkeypatch.setattr(metrics, "observe", lambda op, seconds: observed.append(op))
+    root = FakeRoot()
+    worker = BackgroundWorker(root)
+    seen_at_callback = []
+    worker.submit(lambda: None, on_done=lambda _: seen_at_callback.extend(observed), timing="ui_save_round")
+    wait_for(worker, 1)
+    root.poll()
+    assert seen_at_callback == ["ui_save_round"]
+    worker.stop()
+
+
+def test_cancelled_key_delivers_nothing():
+    # add_shot while an SG recalculation is debounced and another is already running
+    root = FakeRoot()
+    worker = BackgroundWorker(root)
+    shown = []
+    worker.submit(lambda: "old shot", key="sg", on_done=shown.append)
+    worker.debounce("sg", lambda: "old shot, edited", on_done=shown.append)
+    wait_for(worker, 1)
+
+    worker.cancel("sg")
+    assert not worker.pending("sg")
+    root.poll()  # the form is cleared; nothing may write to it now
+
+    assert shown == []
+    worker.submit(lambda: "next shot", key="sg", on_done=shown.append)
+    wait_for(worker, 1)
+    root.poll()
+    assert shown == ["next shot"]
+    worker.stop()
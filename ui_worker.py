@@ -0,0 +1,129 @@
+"""Background worker for Tk screens.
+
+Baseline loads, SG recalculation and round saves run on one daemon thread, so
+the form stays responsive while SQLite waits on the disk. Results are posted
+back through a queue that the Tk main loop drains with after() polling. Tk
+widgets are only ever touched from the main thread.
+"""
+import queue
+import sys
+import threading
+import time
+import traceback
+import metrics
+
+# --- CONFIG ---
+POLL_MS = 15  # how often the main loop checks for finished jobs
+DEBOUNCE_MS = 150  # quiet time after the last keystroke before recalculating
+
+
+def report_error(exc):
+    """Default on_error: print the job's traceback. Raising on the Tk loop would stop result delivery."""
+    print("❌ Background job failed:", file=sys.stderr)
+    traceback.print_exception(type(exc), exc, exc.__traceback__, file=sys.stderr)
+
+
+class BackgroundWorker:
+    """Runs jobs in submission order on one thread and delivers results on the Tk thread.
+
+    Jobs submitted with a key are "latest wins": a result is dropped if a newer job
+    with the same key was submitted after it, so a slow lookup never overwrites the
+    label with a stale value.
+    """
+
+    def __init__(self, root, poll_ms=POLL_MS):
+        self.root = root
+        self.poll_ms = poll_ms
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._latest = {}  # key -> sequence number of the newest job
+        self._timers = {}  # key -> pending after() id for debounced jobs
+        self._seq = 0
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._poll_id = root.after(poll_ms, self._poll)
+
+    # --- Main-thread API ---
+    def submit(self, fn, *args, on_done=None, on_error=None, key=None, timing=None, started=None):
+        """Queue fn(*args). on_done(result) / on_error(exc) run later on the Tk thread;
+        errors without an on_error go to report_error.
+
+        `timing` names a metrics timer measured from `started` (default: now) to
+        the moment the result reaches the Tk thread, before the callback runs, so
+        a dialog the callback opens is not counted.
+        """
+        self._seq += 1
+        if key is not None:
+            self._latest[key] = self._seq
+        self._jobs.put((self._seq, key, fn, args, on_done, on_error, timing,
+                        started or time.perf_counter()))
+
+    def debounce(self, key, fn, *args, delay_ms=DEBOUNCE_MS, **callbacks):
+        """Submit after `delay_ms` of quiet; each call restarts the wait for its key."""
+        started = time.perf_counter()  # latency counts from this input event
+        if key in self._timers:
+            self.root.after_cancel(self._timers[key])
+
+        def fire():
+            self._timers.pop(key, None)
+            self.submit(fn, *args, key=key, started=started, **callbacks)
+
+        self._timers[key] = self.root.after(delay_ms, fire)
+
+    def pending(self, key):
+        """True while a debounced or submitted job for `key` has not delivered its result."""
+        return key in self._timers or key in self._latest
+
+    def cancel(self, key):
+        """Forget the debounced or submitted job for `key`: its timer never fires and its result is dropped."""
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            self.root.after_cancel(timer)
+        self._latest.pop(key, None)
+
+    def stop(self):
+        self._stopped = True
+        for timer in self._timers.values():
+            self.root.after_cancel(timer)
+        self._timers.clear()
+        try:
+            self.root.after_cancel(self._poll_id)
+        except Exception:
+            pass  # window already destroyed
+        self._jobs.put(None)
+
+    # --- Worker thread ---
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            seq, key, fn, args, *rest = job
+            if key is not None and self._latest.get(key, seq) != seq:
+                continue  # superseded before it started
+            try:
+                self._results.put((seq, key, True, fn(*args), *rest))
+            except Exception as e:
+                self._results.put((seq, key, False, e, *rest))
+
+    def _poll(self):
+        try:
+            while True:
+                try:
+                    seq, key, ok, value, on_done, on_error, timing, started = self._results.get_nowait()
+                except queue.Empty:
+                    break
+                if key is not None:
+                    if self._latest.get(key) != seq:
+                        continue  # a newer job for this key is on its way
+                    del self._latest[key]
+                if timing:
+                    metrics.observe(timing, time.perf_counter() - started)
+                callback = on_done if ok else (on_error or report_error)
+                if callback is not None:
+                    callback(value)
+        finally:
+            # A callback that raises must not stop delivery of later results
+            if not self._stopped:
+                self._poll_id = self.root.after(self.poll_ms, self._poll)